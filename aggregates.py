@@ -0,0 +1,109 @@
+"""
+Pre-aggregated KPI cube for the dashboard's KPI row and Key Insights
+Stores daily counts, sums and status tallies per direct report as running
+totals, so any report/date-range selection is answered with two lookups
+"""
+
+import numpy as np
+import pandas as pd
+
+from derived import DerivedIndex
+
+MEASURES = ['meetings', 'sentiment_sum', 'actions', 'actions_completed', 'blockers', 'blockers_active']
+
+
+def _by_day(df, date_col, **measures):
+    reports = df['direct_report']
+    frame = pd.DataFrame({
+        # Categorical names become plain labels; other keys (e.g. org node ids) are kept as they are
+        'direct_report': reports.astype(str) if isinstance(reports.dtype, pd.CategoricalDtype) else reports,
+        'day': df[date_col].dt.normalize(),
+        **measures,
+    })
+    return frame.groupby(['direct_report', 'day']).sum()
+
+
+def daily_measures(name, df):
+    """Daily KPI measures contributed by rows of table ``name`` (None if it has none)."""
+    if name == 'meetings':
+        return _by_day(df, 'date', meetings=1, sentiment_sum=df['sentiment_score'])
+    if name == 'action_items':
+        return _by_day(df, 'created_date', actions=1,
+                       actions_completed=(df['status'] == 'Completed').astype(int))
+    if name == 'blockers':
+        return _by_day(df, 'first_mentioned', blockers=1,
+                       blockers_active=(df['status'] == 'Active').astype(int))
+    return None
+
+
+def daily_counts(tables):
+    """Per (direct_report, day) KPI measures from the raw tables."""
+    daily = pd.concat(
+        [daily_measures(name, tables[name]) for name in ('meetings', 'action_items', 'blockers')],
+        axis=1).fillna(0)
+    return daily[MEASURES].sort_index()
+
+
+class KpiCube(DerivedIndex):
+    """Running totals of ``MEASURES`` per report and for the whole team, indexed by day."""
+
+    def __init__(self, tables):
+        self.daily = daily_counts(tables)
+        self._refresh()
+
+    @classmethod
+    def from_daily(cls, daily):
+        """Cube over measures already summed per (direct_report, day), e.g. org roll-ups."""
+        cube = cls.__new__(cls)
+        cube.daily = daily.reindex(columns=MEASURES, fill_value=0).sort_index()
+        cube._refresh()
+        return cube
+
+    def _build(self):
+        daily = self.daily
+        reports = daily.index.get_level_values('direct_report')
+        codes, names = pd.factorize(reports)
+        starts = np.flatnonzero(np.diff(codes, prepend=-1))
+        stops = np.append(starts[1:], len(codes))
+        partitions = {name: (start, stop) for name, start, stop in zip(names, starts, stops)}
+        days = daily.index.get_level_values('day').to_numpy()
+        running = daily.groupby(level='direct_report', sort=False).cumsum().to_numpy()
+
+        totals = daily.groupby(level='day').sum()
+        return partitions, days, running, totals.index.to_numpy(), totals.cumsum().to_numpy(), daily
+
+    def update(self, name, rows):
+        """Fold newly appended ``rows`` of table ``name`` into the cube."""
+        delta = daily_measures(name, rows)
+        if delta is None or delta.empty:
+            return
+        delta = delta.reindex(columns=MEASURES, fill_value=0)
+        self.daily = self.daily.add(delta, fill_value=0).sort_index()
+        self._refresh()
+
+    def query(self, report=None, start=None, end=None):
+        """KPI measures summed over the selection, as a dict keyed by measure name."""
+        partitions, days, running, total_days, total_running, _ = self._state
+        if report is None:
+            days, running = total_days, total_running
+        else:
+            lo, hi = partitions.get(report, (0, 0))
+            days, running = days[lo:hi], running[lo:hi]
+
+        lo = 0 if start is None else np.searchsorted(days, np.datetime64(pd.Timestamp(start)), 'left')
+        hi = len(days) if end is None else np.searchsorted(days, np.datetime64(pd.Timestamp(end)), 'right')
+        if hi <= lo:
+            totals = np.zeros(len(MEASURES))
+        else:
+            totals = running[hi - 1] - (running[lo - 1] if lo > 0 else 0)
+        result = dict(zip(MEASURES, totals.tolist()))
+        for measure in MEASURES:
+            if measure != 'sentiment_sum':
+                result[measure] = int(round(result[measure]))
+        return result
+
+    def daily_rows(self, report):
+        """The daily measures of one report, indexed by (direct_report, day)."""
+        partitions, *_, daily = self._state
+        lo, hi = partitions.get(report, (0, 0))
+        return daily.iloc[lo:hi]
@@ -0,0 +1,134 @@
+"""
+Multi-process batch computation of per-report insights
+Tables are sorted by direct report and written once as uncompressed Arrow
+IPC files; each worker memory-maps them and reads only its shard's rows,
+so no DataFrames are pickled between processes. Team-level ("All") results
+are combined from per-shard partial sums.
+"""
+
+import argparse
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+import insights
+import storage
+from aggregates import MEASURES
+from datastore import DataStore
+
+SHARDS_PER_WORKER = 4     # more shards than workers evens out uneven report sizes
+
+
+def write_shards(tables, shard_dir):
+    """Write each table sorted by report as ``<name>.arrow``; returns (reports, offsets).
+
+    ``offsets[name][i]`` is the first row of ``reports[i]`` in that table, with
+    a final entry equal to the row count.
+    """
+    factorized = {name: pd.factorize(df['direct_report']) for name, df in tables.items()}
+    # Shards follow the order DataStore sorts meetings in, so "All" ties break the same way
+    column = tables['meetings']['direct_report']
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        known = list(column.cat.categories)
+    else:
+        known = sorted(column.dropna().unique())
+    others = set().union(*(uniques for _, uniques in factorized.values())).difference(known)
+    reports = pd.Index(known + sorted(others))
+    offsets = {}
+    for name, df in tables.items():
+        codes, uniques = factorized[name]
+        position = reports.get_indexer(uniques)[codes]
+        order = np.argsort(position, kind='stable')
+        offsets[name] = np.searchsorted(position[order], np.arange(len(reports) + 1))
+        table = pa.Table.from_pandas(df.iloc[order], preserve_index=False)
+        with pa.OSFile(os.path.join(shard_dir, f"{name}.arrow"), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    return reports, offsets
+
+
+def plan_shards(offsets, n_shards):
+    """Split the report range into contiguous shards of roughly equal row counts."""
+    weight = np.sum([np.diff(bounds) for bounds in offsets.values()], axis=0)
+    running = np.concatenate([[0], np.cumsum(weight)])
+    cuts = np.searchsorted(running, running[-1] * np.arange(1, n_shards) / n_shards)
+    edges = np.unique(np.concatenate([[0], cuts, [len(weight)]]))
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def read_shard(shard_dir, offsets, first, last):
+    tables = {}
+    for name, bounds in offsets.items():
+        lo, hi = int(bounds[first]), int(bounds[last])
+        with pa.memory_map(os.path.join(shard_dir, f"{name}.arrow")) as source:
+            tables[name] = pa.ipc.open_file(source).read_all().slice(lo, hi - lo).to_pandas()
+    return tables
+
+
+def run_shard(shard_dir, offsets, first, last, start=None, end=None):
+    """Insights for reports ``first:last``, plus the shard's share of the team totals."""
+    store = DataStore(read_shard(shard_dir, offsets, first, last))
+    reports = [insights.report_insights(store, report, start, end) for report in store.reports()]
+    okrs = store.okr_snapshot(None, start, end)
+    team = store.kpis.query(None, start, end)
+    recent = store.latest('meetings', 2, None, start, end)[['date', 'sentiment_score']]
+    return reports, okrs, team, recent
+
+
+def team_insights(partials):
+    """The "All" record from per-shard (team measures, latest meetings), in shard order."""
+    kpis = {measure: sum(team[measure] for team, _ in partials) for measure in MEASURES}
+    # Same tie-break as DataStore.latest: stable date order over report-sorted rows
+    recent = pd.concat([latest for _, latest in partials]).sort_values('date', kind='stable')
+    summary = insights.summary_from(kpis, recent['sentiment_score'].tail(2).mean())
+    return {
+        'direct_report': "All",
+        **summary,
+        'strengths': insights.strengths(summary),
+        'concerns': insights.concerns(summary),
+    }
+
+
+def compute_all(tables, workers=None, start=None, end=None):
+    """Parallel equivalent of ``insights.compute_all`` over raw ``tables``."""
+    workers = workers or os.cpu_count() or 1
+    with tempfile.TemporaryDirectory(prefix="insights-shards-") as shard_dir:
+        _, offsets = write_shards(tables, shard_dir)
+        shards = plan_shards(offsets, workers * SHARDS_PER_WORKER)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_shard, shard_dir, offsets, first, last, start, end)
+                       for first, last in shards]
+            results = [future.result() for future in futures]
+
+    team = team_insights([(kpis, recent) for _, _, kpis, recent in results])
+    records = sorted((record for records, _, _, _ in results for record in records),
+                     key=lambda record: record['direct_report'])
+    reports = pd.DataFrame([team] + records)
+    okrs = pd.concat([okrs for _, okrs, _, _ in results], ignore_index=True)
+    return reports, okrs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute 1:1 insights with a pool of worker processes")
+    parser.add_argument("data_dir", nargs="?", default=".")
+    parser.add_argument("--out-dir", default="insights")
+    parser.add_argument("--format", choices=("json", "parquet"), default="json")
+    parser.add_argument("--workers", type=int, default=None, help="defaults to the number of CPUs")
+    parser.add_argument("--start-date", default=None, help="first day of the window (YYYY-MM-DD)")
+    parser.add_argument("--end-date", default=None, help="last day of the window (YYYY-MM-DD)")
+    args = parser.parse_args(argv)
+
+    tables = storage.load_tables(args.data_dir, columns=insights.COLUMNS)
+    reports, okrs = compute_all(tables, args.workers, args.start_date, args.end_date)
+    paths = insights.write_insights(reports, okrs, args.out_dir, args.format)
+    print(f"[SUCCESS] Computed insights for {len(reports) - 1} direct reports:")
+    for path in paths:
+        print(f"  - {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Benchmark harness for the dashboard pipeline
+Times each stage the dashboard runs (load, index, filter, KPI aggregation,
+OKR figures, topic/action counts, list rendering, trend charts) on synthetic
+datasets at several scales, records wall time and peak memory per stage
+(Python allocations, Arrow buffers and process RSS), and compares the
+results against a stored baseline
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+import charts
+import generate_synthetic_data
+import insights
+import list_views
+import storage
+from datastore import DataStore
+
+# Synthetic org per scale: (managers, reports per manager)
+SCALES = {
+    "10": (2, 5),
+    "1k": (100, 10),
+    "100k": (10000, 10),
+}
+WEEKS = 26
+SAMPLE_REPORTS = 20       # individual reports queried per stage, plus the "All" view
+WINDOW_DAYS = 90          # date filter applied on top of the full range
+REPEAT = 3                # timing is the best of this many runs
+TOLERANCE = 0.2           # allowed slowdown / memory growth over the baseline
+MEMORY_KEYS = ("peak_mb", "arrow_mb", "rss_mb")   # tracemalloc, Arrow memory pool, process RSS
+NOISE_FLOOR = {"seconds": 0.05, "peak_mb": 1.0, "arrow_mb": 1.0, "rss_mb": 5.0}   # smaller differences are never regressions
+SAMPLE_SECONDS = 0.002    # polling interval of the Arrow and RSS samplers
+DATA_DIR = "bench_data"
+BASELINE = os.path.join("benchmarks", "baseline.json")
+
+
+def dataset(scale, data_dir=DATA_DIR, fmt="parquet"):
+    """Directory holding the synthetic dataset for ``scale``, generated on first use."""
+    managers, reports_per_manager = SCALES[scale]
+    out_dir = os.path.join(data_dir, f"{scale}_{fmt}")
+    if not os.path.exists(storage.table_path(out_dir, "meetings", fmt)):
+        generate_synthetic_data.generate_scaled_dataset(
+            out_dir, managers=managers, reports_per_manager=reports_per_manager,
+            weeks=WEEKS, fmt=fmt)
+    return out_dir
+
+
+def _rss_bytes():
+    """Resident set size of this process (Linux ``/proc``; None elsewhere)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+class PeakSampler:
+    """Polls Arrow's allocated bytes and the process RSS in a thread; peaks are above the start values.
+
+    tracemalloc only sees Python's allocator, not Arrow/Parquet buffers or
+    other native memory, so these are sampled alongside it.
+    """
+
+    def __init__(self, interval=SAMPLE_SECONDS):
+        self.interval = interval
+        self.done = threading.Event()
+
+    def _sample(self):
+        self.arrow_peak = max(self.arrow_peak, pa.total_allocated_bytes())
+        rss = _rss_bytes()
+        if rss is not None:
+            self.rss_peak = max(self.rss_peak, rss)
+
+    def _poll(self):
+        while not self.done.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self.arrow_start = self.arrow_peak = pa.total_allocated_bytes()
+        self.rss_start = self.rss_peak = _rss_bytes()
+        self.thread = threading.Thread(target=self._poll, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.done.set()
+        self.thread.join()
+        self._sample()
+
+    def peaks_mb(self):
+        """(Arrow, RSS) peak growth in MB; RSS is NaN where it cannot be read."""
+        rss = float('nan') if self.rss_start is None else (self.rss_peak - self.rss_start) / 2**20
+        return (self.arrow_peak - self.arrow_start) / 2**20, rss
+
+
+def measure(fn, memory=True, repeat=REPEAT):
+    """Run ``fn``; returns (best seconds of ``repeat`` runs, {memory key: peak MB}).
+
+    Timing runs without tracing; peak memory comes from one more run, traced
+    by tracemalloc with Arrow and RSS sampled alongside it.
+    """
+    seconds = float('inf')
+    for _ in range(max(repeat, 1)):
+        started = time.perf_counter()
+        fn()
+        seconds = min(seconds, time.perf_counter() - started)
+    peaks = dict.fromkeys(MEMORY_KEYS, float('nan'))
+    if memory:
+        tracemalloc.start()
+        try:
+            with PeakSampler() as sampler:
+                fn()
+            peaks["peak_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+            peaks["arrow_mb"], peaks["rss_mb"] = sampler.peaks_mb()
+        finally:
+            tracemalloc.stop()
+    return seconds, peaks
+
+
+def stages(data_dir):
+    """The dashboard's stages as (name, callable) pairs; later stages use earlier results."""
+    state = {}
+
+    def load():
+        state['tables'] = storage.load_tables(data_dir, columns=storage.columns_for(*storage.SECTION_COLUMNS))
+
+    def index():
+        store = state['store'] = DataStore(state['tables'])
+        reports = store.reports()
+        rng = np.random.default_rng(0)
+        picked = rng.choice(len(reports), min(SAMPLE_REPORTS, len(reports)), replace=False)
+        end = store.date_range('meetings')[1]
+        state['window'] = (end - pd.Timedelta(days=WINDOW_DAYS), end)
+        state['selections'] = [None] + [reports[i] for i in sorted(picked)]
+
+    def filtering():
+        start, end = state['window']
+        state['views'] = [state['store'].select(report, start, end) for report in state['selections']]
+
+    def kpis():
+        start, end = state['window']
+        for report in state['selections']:
+            insights.summarize(state['store'], report, start, end)
+
+    def okrs():
+        # The first page of report tabs, each with its first page of metrics
+        for view in state['views']:
+            groups = charts.okr_groups(view['metrics'])
+            for report in sorted(groups)[:charts.OKR_REPORTS_PER_PAGE]:
+                charts.okr_figure(groups[report][:charts.OKR_METRICS_PER_PAGE])
+
+    def topics():
+        store, (start, end) = state['store'], state['window']
+        for report in state['selections']:
+            topic_counts = store.counts('topics', 'topic', report, start, end)
+            if len(topic_counts):
+                charts.topics_figure(topic_counts)
+                charts.priority_figure(store.counts('topics', 'priority', report, start, end))
+            status_counts = store.counts('action_items', 'status', report, start, end)
+            if len(status_counts):
+                charts.action_status_figure(status_counts)
+
+    def lists():
+        store, (start, end) = state['store'], state['window']
+        for report in state['selections']:
+            list_views.recent_actions(store.latest('action_items', list_views.RECENT_ACTIONS, report, start, end))
+            list_views.active_blockers(store.active_blockers(0, list_views.LIST_PAGE_SIZE, report, start, end))
+            list_views.development_focus(store.page('growth_areas', 0, list_views.LIST_PAGE_SIZE, report, start, end))
+
+    def trends():
+        store, (start, end) = state['store'], state['window']
+        for report in state['selections']:
+            charts.sentiment_figure(store.trend('meetings', 'sentiment_score', report, start, end))
+            communication = store.trend('communication', 'dr_hedge_words', report, start, end)
+            if len(communication):
+                charts.hedge_words_figure(communication)
+
+    return [
+        ("load", load),
+        ("index", index),
+        ("filter", filtering),
+        ("kpi", kpis),
+        ("okr", okrs),
+        ("topics", topics),
+        ("lists", lists),
+        ("trends", trends),
+    ]
+
+
+def run(scale, data_dir=DATA_DIR, fmt="parquet", memory=True, repeat=REPEAT):
+    """Stage -> {"seconds", "peak_mb", "arrow_mb", "rss_mb"} for one scale."""
+    results = {}
+    for name, fn in stages(dataset(scale, data_dir, fmt)):
+        seconds, peaks = measure(fn, memory, repeat)
+        results[name] = {"seconds": round(seconds, 4), **{key: round(mb, 2) for key, mb in peaks.items()}}
+    return results
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Rows of (scale, stage, {key: (current, baseline)} for seconds and ``MEMORY_KEYS``, regressed)."""
+    rows = []
+    for scale, by_stage in results.items():
+        for stage, current in by_stage.items():
+            before = baseline.get(scale, {}).get(stage, {})
+            values = {key: (current.get(key), before.get(key)) for key in ("seconds", *MEMORY_KEYS)}
+            # Missing or NaN values (memory not measured, or an older baseline) never regress
+            regressed = any(
+                now is not None and then is not None and now - then > max(then * tolerance, NOISE_FLOOR[key])
+                for key, (now, then) in values.items()
+            )
+            rows.append((scale, stage, values, regressed))
+    return rows
+
+
+def _fmt(value, spec):
+    return f"{'-':>9}" if value is None or value != value else format(value, spec)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard stages on synthetic data")
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=list(SCALES))
+    parser.add_argument("--format", choices=("csv", "parquet"), default="parquet")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="where generated datasets are kept")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="timed runs per stage (best is kept)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced peak-memory runs")
+    args = parser.parse_args(argv)
+
+    results = {scale: run(scale, args.data_dir, args.format, not args.no_memory, args.repeat)
+               for scale in args.scales}
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    rows = compare(results, baseline, args.tolerance)
+    headings = {"seconds": "seconds", "peak_mb": "py MB", "arrow_mb": "arrow MB", "rss_mb": "rss MB"}
+    print(f"{'scale':>6} {'stage':<8} " + " ".join(f"{headings[key]:>9} {'baseline':>9}" for key in headings))
+    for scale, stage, values, regressed in rows:
+        cells = [f"{_fmt(now, spec)} {_fmt(then, spec)}" for key, (now, then) in values.items()
+                 for spec in ['9.3f' if key == "seconds" else '9.1f']]
+        print(f"{scale:>6} {stage:<8} " + " ".join(cells) + ("  REGRESSION" if regressed else ""))
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump({**baseline, **results}, f, indent=2)
+        print(f"[SUCCESS] Baseline saved to {args.baseline}")
+    elif any(row[-1] for row in rows):
+        print(f"[FAILED] Stages slower or larger than the baseline by more than {args.tolerance:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Plotly figure builders for the 1:1 dashboard
+Pure functions from (already filtered) tables or their per-value counts
+to figures, so the same charts can be built by the live app and by offline
+jobs. Inputs come from the data store, so each report's rows are already
+in date order.
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+OKR_ROW_HEIGHT = 300         # pixels per metric subplot
+OKR_METRICS_PER_PAGE = 6     # metrics drawn per figure before paginating
+OKR_REPORTS_PER_PAGE = 10    # report tabs shown at once in the "All" view
+SERIES_MAX_POINTS = 1000     # about a chart's pixel width; longer series are downsampled
+WEBGL_THRESHOLD = 2000       # points per figure above which traces render with WebGL
+MAX_LEGEND_SERIES = 50       # above this many reports, series share one gapped WebGL trace
+TOPIC_SHARE_TOPICS = 8       # topics drawn in the time share chart; the rest are summed as "Other"
+
+
+def downsample(df, x, y, group, max_points=SERIES_MAX_POINTS):
+    """Keep the min and max ``y`` of every (group, x-bucket) so each series has <= ``max_points``.
+
+    Buckets split the shared x range into ``max_points // 2`` equal slices,
+    so spikes survive while flat stretches collapse. Row order is preserved.
+    """
+    n_buckets = max(max_points // 2, 1)
+    if len(df) <= n_buckets:
+        return df
+    xs = df[x].to_numpy().astype('int64')
+    span = max(xs.max() - xs.min(), 1)
+    bucket = ((xs - xs.min()) / span * (n_buckets - 1)).astype('int64')
+    codes = pd.factorize(df[group])[0]
+    order = np.lexsort((df[y].to_numpy(), bucket, codes))
+    key = codes[order] * n_buckets + bucket[order]
+    first = np.flatnonzero(np.diff(key, prepend=-1))
+    last = np.append(first[1:] - 1, len(key) - 1)
+    keep = np.unique(np.concatenate([order[first], order[last]]))
+    return df.iloc[keep]
+
+
+def _combined_trace(data, x, y, group, hover):
+    """All series in one WebGL trace, separated by gaps; the report shows up on hover.
+
+    Gaps are a NaN ``y`` (x repeats the previous point), which keeps the
+    arrays typed so the figure serializes as binary rather than per-object JSON.
+    """
+    boundaries = np.flatnonzero(np.diff(pd.factorize(data[group])[0])) + 1
+    xs = data[x].to_numpy()
+    xs = np.insert(xs, boundaries, xs[boundaries - 1])
+    ys = np.insert(data[y].to_numpy(dtype='float64'), boundaries, np.nan)
+    names = np.insert(data[group].astype(str).to_numpy(dtype=object), boundaries, '')
+    return go.Scattergl(x=xs, y=ys, customdata=names, mode='lines+markers', connectgaps=False,
+                        showlegend=False, hovertemplate=hover)
+
+
+def sentiment_figure(meetings):
+    """Sentiment per meeting, one line per direct report."""
+    title = "Sentiment Score Over Time (0=Negative, 1=Positive)"
+    data = downsample(meetings, 'date', 'sentiment_score', 'direct_report')
+    if data['direct_report'].nunique() > MAX_LEGEND_SERIES:
+        fig = go.Figure([_combined_trace(data, 'date', 'sentiment_score', 'direct_report',
+                                         '%{customdata}: %{y:.2f}<extra></extra>')])
+        fig.update_layout(title=title, xaxis_title="date", yaxis_title="sentiment_score")
+    else:
+        # Traces ordered by each report's first meeting, as if the frame were sorted by date
+        first_seen = data.groupby('direct_report', observed=True)['date'].min().sort_values(kind='stable')
+        fig = px.line(
+            data,
+            x='date',
+            y='sentiment_score',
+            color='direct_report',
+            markers=True,
+            category_orders={'direct_report': list(first_seen.index)},
+            render_mode='webgl' if len(data) > WEBGL_THRESHOLD else 'svg',
+            title=title
+        )
+    fig.add_hline(y=0.5, line_dash="dash", line_color="gray",
+                  annotation_text="Neutral")
+    fig.update_layout(height=350)
+    return fig
+
+
+def hedge_words_figure(communication):
+    """Hedge words per meeting, one trace per direct report from a single groupby."""
+    data = downsample(communication, 'meeting_date', 'dr_hedge_words', 'direct_report')
+    if data['direct_report'].nunique() > MAX_LEGEND_SERIES:
+        traces = [_combined_trace(data, 'meeting_date', 'dr_hedge_words', 'direct_report',
+                                  '%{customdata}: %{y} hedge words<extra></extra>')]
+    else:
+        trace = go.Scattergl if len(data) > WEBGL_THRESHOLD else go.Scatter
+        traces = [trace(
+            x=report_data['meeting_date'],
+            y=report_data['dr_hedge_words'],
+            mode='lines+markers',
+            name=report,
+            hovertemplate='%{y} hedge words<extra></extra>'
+        ) for report, report_data in data.groupby('direct_report', sort=False, observed=True)]
+
+    fig = go.Figure(traces)
+    fig.update_layout(
+        title="Hedge Words per Meeting (Lower = More Confident)",
+        xaxis_title="Date",
+        yaxis_title="Hedge Words Count",
+        height=350
+    )
+    return fig
+
+
+def topics_figure(topic_counts):
+    """Most discussed topics as a horizontal bar chart, from rows per topic (see ``DataStore.counts``)."""
+    topic_counts = topic_counts.rename_axis('topic').reset_index(name='frequency')
+    topic_counts = topic_counts.sort_values('frequency', ascending=False)
+
+    fig = px.bar(
+        topic_counts,
+        x='frequency',
+        y='topic',
+        orientation='h',
+        title="Most Discussed Topics",
+        color='frequency',
+        color_continuous_scale='blues'
+    )
+    fig.update_layout(height=400, showlegend=False)
+    return fig
+
+
+def topic_share_figure(shares, max_topics=TOPIC_SHARE_TOPICS):
+    """Stacked share of discussion time per topic over time, from ``TopicCube.rolling_share``."""
+    top = shares.mean().sort_values(ascending=False, kind='stable').index[:max_topics]
+    data = shares[top]
+    if len(top) < shares.shape[1]:
+        data = data.assign(Other=shares.drop(columns=top).sum(axis=1))
+    data = data.rename_axis(columns='topic').stack().rename('share').reset_index()
+    fig = px.area(
+        data,
+        x='date',
+        y='share',
+        color='topic',
+        title="Topic Time Share (rolling 4 weeks)",
+    )
+    fig.update_layout(height=350, yaxis_tickformat='.0%', yaxis_title="Share of discussion time")
+    return fig
+
+
+def priority_figure(priority_counts):
+    """Topic priority distribution, from rows per priority."""
+    priority_dist = priority_counts.sort_values(ascending=False, kind='stable')
+    return px.pie(
+        values=priority_dist.values,
+        names=priority_dist.index,
+        title="Topic Priority Distribution"
+    )
+
+
+def action_status_figure(status_counts):
+    """Action items by status, from rows per status."""
+    status_counts = status_counts.sort_values(ascending=False, kind='stable')
+    return px.pie(
+        values=status_counts.values,
+        names=status_counts.index,
+        title="Action Items by Status",
+        color=status_counts.index,
+        color_discrete_map={
+            'Completed': '#28a745',
+            'In Progress': '#ffc107',
+            'Pending': '#dc3545'
+        }
+    )
+
+
+def blocker_status_figure(status_counts):
+    """Active vs resolved blockers, from rows per status."""
+    blocker_status = status_counts.sort_values(ascending=False, kind='stable')
+    return px.bar(
+        x=blocker_status.index,
+        y=blocker_status.values,
+        title="Blocker Status",
+        labels={'x': 'Status', 'y': 'Count'},
+        color=blocker_status.index,
+        color_discrete_map={'Active': '#dc3545', 'Resolved': '#28a745'}
+    )
+
+
+def burndown_figure(burndown):
+    """Open action items over time with the items opened and closed each week, from ``LifecycleIndex.burndown``."""
+    fig = go.Figure()
+    fig.add_bar(x=burndown.index, y=burndown['opened'], name="Opened", marker_color='#ffc107')
+    fig.add_bar(x=burndown.index, y=-burndown['closed'], name="Completed", marker_color='#28a745',
+                customdata=burndown['closed'], hovertemplate="%{customdata}")
+    fig.add_scatter(x=burndown.index, y=burndown['open'], name="Open", mode='lines+markers',
+                    line=dict(color='#dc3545', width=3))
+    fig.update_layout(title="Action Item Burndown", barmode='relative', height=350,
+                      xaxis_title="Week", yaxis_title="Action items")
+    return fig
+
+
+def blocker_aging_figure(aging):
+    """Open blockers per age bucket over time, from ``LifecycleIndex.aging``."""
+    data = aging.stack().rename('blockers').reset_index()
+    fig = px.bar(
+        data,
+        x='date',
+        y='blockers',
+        color='age',
+        title="Open Blockers by Age",
+        labels={'date': 'Week', 'blockers': 'Open blockers', 'age': 'Open for'},
+        color_discrete_sequence=px.colors.sequential.YlOrRd[2:],
+    )
+    fig.update_layout(height=350)
+    return fig
+
+
+def growth_figure(growth_areas):
+    """Progress per development area; colored by report unless there are too many for a legend."""
+    by_report = growth_areas['direct_report'].nunique() <= MAX_LEGEND_SERIES
+    fig = px.bar(
+        growth_areas,
+        x='progress_level',
+        y='area',
+        color='direct_report' if by_report else None,
+        hover_data=None if by_report else ['direct_report'],
+        orientation='h',
+        title="Development Areas Progress (1=Beginning, 5=Advanced)",
+        labels={'progress_level': 'Progress Level', 'area': 'Growth Area'}
+    )
+    fig.update_layout(height=400)
+    return fig
+
+
+def okr_groups(metrics):
+    """Map direct report -> [(metric, rows)] in first-appearance order, from one groupby pass.
+
+    ``metrics`` comes from the DataStore, so each report's rows are already
+    date-ordered and the groups need no further sorting.
+    """
+    groups = {}
+    for (report, metric), rows in metrics.groupby(['direct_report', 'metric'], sort=False, observed=True):
+        groups.setdefault(report, []).append((metric, rows))
+    return groups
+
+
+def okr_figure(series):
+    """Small multiples of actual vs target, one subplot row per ``(metric, rows)`` pair."""
+    height = OKR_ROW_HEIGHT * len(series)
+    fig = make_subplots(
+        rows=len(series), cols=1,
+        subplot_titles=[metric for metric, _ in series],
+        vertical_spacing=min(0.3, 90 / height) if len(series) > 1 else 0,
+    )
+    for row, (metric, data) in enumerate(series, start=1):
+        fig.add_trace(go.Scatter(
+            x=data['date'],
+            y=data['actual'],
+            mode='lines+markers',
+            name='Actual',
+            legendgroup='actual',
+            showlegend=row == 1,
+            line=dict(color='#1f77b4', width=3)
+        ), row=row, col=1)
+        fig.add_trace(go.Scatter(
+            x=data['date'],
+            y=data['target'],
+            mode='lines',
+            name='Target',
+            legendgroup='target',
+            showlegend=row == 1,
+            line=dict(color='red', dash='dash')
+        ), row=row, col=1)
+        fig.update_yaxes(title_text=f"Value ({data['unit'].iloc[0]})", row=row, col=1)
+
+    fig.update_xaxes(title_text="Date", row=len(series), col=1)
+    fig.update_layout(height=height)
+    return fig
+
+
+def okr_status_label(on_track):
+    """Status shown next to an OKR's latest reading."""
+    return "✓ On Track" if on_track else "⚠ At Risk"
@@ -3,12 +3,40 @@
 Visualizes key insights from conversations with direct reports
 """
 
+import math
+import os
+
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime
 
+import charts
+import figure_cache
+import insights
+import instrumentation
+import list_views
+import orgchart
+import sql_backend
+import storage
+from datastore import DataStore
+from ingest import INCOMING_DIR, IncomingWatcher
+
+DATA_DIR = os.environ.get("DASHBOARD_DATA_DIR", ".")
+BACKEND = os.environ.get("DASHBOARD_BACKEND", "memory")   # memory, sqlite or duckdb
+DATABASE = os.environ.get("DASHBOARD_DATABASE")           # defaults to <DATA_DIR>/dashboard.<backend>
+OKR_METRICS_PER_PAGE = int(os.environ.get("DASHBOARD_OKR_METRICS_PER_PAGE", charts.OKR_METRICS_PER_PAGE))
+OKR_REPORTS_PER_PAGE = int(os.environ.get("DASHBOARD_OKR_REPORTS_PER_PAGE", charts.OKR_REPORTS_PER_PAGE))
+LIST_PAGE_SIZE = int(os.environ.get("DASHBOARD_LIST_PAGE_SIZE", list_views.LIST_PAGE_SIZE))
+SECTION_CACHE_ENTRIES = int(os.environ.get("DASHBOARD_SECTION_CACHE_ENTRIES", 64))
+FIGURE_CACHE_MB = float(os.environ.get("DASHBOARD_FIGURE_CACHE_MB", figure_cache.MAX_BYTES / 2 ** 20))
+FIGURE_CACHE_DIR = os.environ.get("DASHBOARD_FIGURE_CACHE_DIR")   # optional disk store of built figures
+DEBUG = os.environ.get("DASHBOARD_DEBUG", "") not in ("", "0")
+METRICS_FILE = os.environ.get("DASHBOARD_METRICS_FILE")   # Prometheus text, rewritten every run
+PERF_LOG = os.environ.get("DASHBOARD_PERF_LOG")           # JSON-lines timer events
+
+if PERF_LOG:
+    instrumentation.log_to(PERF_LOG)
+
 # Page configuration
 st.set_page_config(
     page_title="1:1 Insights Dashboard",
@@ -17,35 +45,59 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Load data
-@st.cache_data
-def load_data():
-    meetings = pd.read_csv('data_meetings.csv')
-    topics = pd.read_csv('data_topics.csv')
-    action_items = pd.read_csv('data_action_items.csv')
-    metrics = pd.read_csv('data_metrics.csv')
-    blockers = pd.read_csv('data_blockers.csv')
-    growth_areas = pd.read_csv('data_growth_areas.csv')
-    communication = pd.read_csv('data_communication.csv')
-
-    # Convert date columns
-    meetings['date'] = pd.to_datetime(meetings['date'])
-    topics['meeting_date'] = pd.to_datetime(topics['meeting_date'])
-    action_items['created_date'] = pd.to_datetime(action_items['created_date'])
-    metrics['date'] = pd.to_datetime(metrics['date'])
-    communication['meeting_date'] = pd.to_datetime(communication['meeting_date'])
+def page_bounds(total, page_size, key, label):
+    """Row range [start, stop) of the page chosen with a number input (shown only when needed)."""
+    pages = max(1, math.ceil(total / page_size))
+    if pages == 1:
+        return 0, total
+    page = st.number_input(f"{label} (of {pages})", min_value=1, max_value=pages, value=1, key=key)
+    return (page - 1) * page_size, min(page * page_size, total)
 
-    return meetings, topics, action_items, metrics, blockers, growth_areas, communication
+def paginate(items, page_size, key, label):
+    """Slice ``items`` to the page chosen with a number input (shown only when needed)."""
+    start, stop = page_bounds(len(items), page_size, key, label)
+    return items[start:stop]
 
-meetings, topics, action_items, metrics, blockers, growth_areas, communication = load_data()
+# Load data
+@st.cache_resource
+def load_data():
+    # Typed Parquet files when available (dates pre-parsed, categoricals), CSV otherwise;
+    # only the columns used by the dashboard sections are read. The store is shared by
+    # all sessions and indexes every table by direct report once. With a SQL backend
+    # the tables stay in an embedded database and each query is pushed down to it.
+    with instrumentation.timer("load_data"):
+        if BACKEND in sql_backend.ENGINES:
+            return sql_backend.open_store(DATA_DIR, DATABASE, BACKEND)
+        tables = storage.load_tables(DATA_DIR, columns=storage.columns_for(*storage.SECTION_COLUMNS))
+        return DataStore(tables)
+
+@st.cache_resource
+def incoming_watcher():
+    return IncomingWatcher(load_data(), os.path.join(DATA_DIR, INCOMING_DIR))
+
+@st.cache_resource
+def org_tree():
+    # Optional reporting lines (data_org); without them the dashboard shows one manager's team
+    return orgchart.OrgTree.read(DATA_DIR, load_data().reports())
+
+@st.cache_resource(max_entries=1)
+def org_rollup(version):
+    # Every manager's aggregates, rolled up bottom-up once per data version and shared by all sessions
+    with instrumentation.timer("org_rollup"):
+        return orgchart.OrgRollup(org_tree(), load_data())
+
+store = load_data()
+tree = org_tree()
+# Merge any newly dropped record files; only the touched tables change version
+with instrumentation.timer("ingest"):
+    incoming_watcher().poll()
 
 # Sidebar
 st.sidebar.title("📊 Dashboard Filters")
 st.sidebar.markdown("---")
 
 # Date range filter
-min_date = meetings['date'].min()
-max_date = meetings['date'].max()
+min_date, max_date = store.date_range('meetings')
 date_range = st.sidebar.date_input(
     "Date Range",
     value=(min_date, max_date),
@@ -53,35 +105,26 @@ date_range = st.sidebar.date_input(
     max_value=max_date
 )
 
-# Direct report filter
-all_reports = ["All"] + sorted(meetings['direct_report'].unique().tolist())
-selected_report = st.sidebar.selectbox("Direct Report", all_reports)
-
-# Filter data based on selections
-if selected_report != "All":
-    meetings_filtered = meetings[meetings['direct_report'] == selected_report]
-    topics_filtered = topics[topics['direct_report'] == selected_report]
-    action_items_filtered = action_items[action_items['direct_report'] == selected_report]
-    metrics_filtered = metrics[metrics['direct_report'] == selected_report]
-    blockers_filtered = blockers[blockers['direct_report'] == selected_report]
-    growth_filtered = growth_areas[growth_areas['direct_report'] == selected_report]
-    communication_filtered = communication[communication['direct_report'] == selected_report]
+# With an org chart, whole teams and departments can be viewed from their pre-aggregated roll-ups
+view = "Direct reports"
+if tree is not None:
+    view = st.sidebar.radio("View", ["Direct reports", "Org roll-up"], horizontal=True)
+
+# Direct report filter, or the manager whose organisation is rolled up
+selected_report = org_node = None
+if view == "Org roll-up":
+    org_node = st.sidebar.selectbox("Org level", tree.managers(), format_func=tree.label)
 else:
-    meetings_filtered = meetings
-    topics_filtered = topics
-    action_items_filtered = action_items
-    metrics_filtered = metrics
-    blockers_filtered = blockers
-    growth_filtered = growth_areas
-    communication_filtered = communication
-
-# Apply date filter
-if len(date_range) == 2:
-    start_date, end_date = date_range
-    meetings_filtered = meetings_filtered[
-        (meetings_filtered['date'] >= pd.Timestamp(start_date)) &
-        (meetings_filtered['date'] <= pd.Timestamp(end_date))
-    ]
+    all_reports = ["All"] + store.reports()
+    selected_report = st.sidebar.selectbox("Direct Report", all_reports)
+
+# Full-text search of action items, blockers, topics and growth areas, within the filters above
+search_text = st.sidebar.text_input("Search", placeholder="e.g. vendor, onboard")
+
+# Filter data based on selections: per-report slices of the pre-indexed tables, with the
+# date range applied to every dated table by binary search on its sorted date column
+start_date, end_date = date_range if len(date_range) == 2 else (None, None)
+report_key = None if selected_report in ("All", None) else selected_report
 
 st.sidebar.markdown("---")
 st.sidebar.markdown("### About")
@@ -89,362 +132,473 @@ st.sidebar.info(
     "This dashboard provides insights from 1:1 meetings with direct reports. "
     "Use the filters above to focus on specific team members or time periods."
 )
+st.sidebar.caption(f"Data version {store.version}")
+for filename, error in incoming_watcher().errors.items():
+    st.sidebar.warning(f"Skipped {filename}: {error}")
+show_performance = st.sidebar.checkbox("Show performance panel", value=DEBUG)
+
+# Instrumented building blocks: every filter, aggregate query, chart build and chart render is timed
+def rows(name, report, start, end):
+    with instrumentation.timer(f"filter:{name}"):
+        return store.table(name, report, start, end)
+
+def query(name, fetch, *args):
+    with instrumentation.timer(f"query:{name}"):
+        return fetch(*args)
+
+def chart(name, build, *args):
+    with instrumentation.timer(f"chart:{name}"):
+        return build(*args)
+
+def plot(fig, name):
+    with instrumentation.timer(f"render:{name}"):
+        st.plotly_chart(fig, use_container_width=True)
+
+# Section builders: memoized on the selection and the version of the tables they read,
+# so a rerun recomputes only sections whose inputs changed; hits and misses are counted
+section_cache = instrumentation.track_cache(st.cache_data(max_entries=SECTION_CACHE_ENTRIES))
+
+# Figure sections go through one shared LRU of serialized figure JSON, bounded in bytes,
+# so identical selections across sessions (and restarts, with a disk store) are hits
+@st.cache_resource
+def shared_figures():
+    # Keys include the data files as loaded (incoming files too), since data versions restart with the process
+    database = DATABASE or os.path.join(DATA_DIR, sql_backend.DB_FILES.get(BACKEND, ""))
+    incoming = os.path.join(DATA_DIR, INCOMING_DIR)
+    paths = [storage.table_path(DATA_DIR, name, fmt) for name in storage.TABLES for fmt in ("parquet", "csv")]
+    paths += [database] if BACKEND in sql_backend.ENGINES else []
+    paths += [entry.path for entry in os.scandir(incoming)] if os.path.isdir(incoming) else []
+    return figure_cache.FigureCache(int(FIGURE_CACHE_MB * 2 ** 20), FIGURE_CACHE_DIR,
+                                    namespace=figure_cache.data_identity(DATA_DIR, paths))
+
+figure_section = shared_figures().cached
+
+@section_cache
+def kpi_summary(report, start, end, version):
+    # Answered from the pre-aggregated KPI cube instead of scanning the filtered rows
+    return insights.summarize(store, report, start, end)
+
+@figure_section
+def sentiment_figures(report, start, end, version):
+    # Per-date means, downsampled per report and drawn with WebGL once the series get long
+    sentiment = query("sentiment_trend", store.trend, 'meetings', 'sentiment_score', report, start, end)
+    fig_sentiment = chart("sentiment", charts.sentiment_figure, sentiment)
+    communication = query("hedge_word_trend", store.trend, 'communication', 'dr_hedge_words', report, start, end)
+    fig_comm = chart("hedge_words", charts.hedge_words_figure, communication) if len(communication) > 0 else None
+    return fig_sentiment, fig_comm
+
+@section_cache
+def okr_statuses(report, start, end, version):
+    # Read from the materialized OKR status table rather than rescanning the metrics
+    return query("okr_snapshot", store.okr_snapshot, report, start, end)
+
+@section_cache
+def okr_metric_names(report, start, end, version):
+    # Only metric names are kept, figures are built per page
+    statuses = okr_statuses(report, start, end, version)
+    names = {}
+    for name, metric in zip(statuses['direct_report'], statuses['metric']):
+        names.setdefault(name, []).append(metric)
+    return names
+
+@section_cache
+def okr_page(report, metrics, start, end, version):
+    # Small multiples for one report and page of metrics, plus each metric's status row
+    groups = charts.okr_groups(rows('metrics', report, start, end)).get(report, [])
+    series = [(metric, readings) for metric, readings in groups if metric in metrics]
+    statuses = okr_statuses(report, start, end, version).set_index('metric')
+    return chart("okr", charts.okr_figure, series), [statuses.loc[metric] for metric, _ in series]
+
+@figure_section
+def topic_action_figures(report, start, end, version):
+    # Counts per topic, priority and status; only the latest action items are fetched
+    topic_counts = query("topic_counts", store.counts, 'topics', 'topic', report, start, end)
+    status_counts = query("action_status_counts", store.counts, 'action_items', 'status', report, start, end)
+    fig_topics = fig_priority = fig_topic_share = topic_shifts = fig_actions = fig_burndown = recent_actions = None
+
+    if len(topic_counts) > 0:
+        fig_topics = chart("topics", charts.topics_figure, topic_counts)
+        priority_counts = query("priority_counts", store.counts, 'topics', 'priority', report, start, end)
+        fig_priority = chart("priority", charts.priority_figure, priority_counts)
+        # Time shares and shifts are differences of the topic cube's running totals
+        shares = query("topic_share", store.topic_times.rolling_share, report, start, end)
+        if shares.shape[1] > 0:
+            fig_topic_share = chart("topic_share", charts.topic_share_figure, shares)
+        shifts = query("topic_shifts", store.topic_times.shifts, report, end)
+        topic_shifts = list_views.topic_shifts(shifts)
+
+    if len(status_counts) > 0:
+        fig_actions = chart("action_status", charts.action_status_figure, status_counts)
+        latest = query("recent_actions", store.latest, 'action_items', list_views.RECENT_ACTIONS, report, start, end)
+        recent_actions = list_views.recent_actions(latest)
+        # Open items per week are counted from the lifecycle index, not from the current statuses
+        burndown = query("action_burndown", store.lifecycles['action_items'].burndown, report, start, end)
+        fig_burndown = chart("action_burndown", charts.burndown_figure, burndown)
+
+    return fig_topics, fig_priority, fig_topic_share, topic_shifts, fig_actions, fig_burndown, recent_actions
+
+@figure_section
+def blocker_growth_figures(report, start, end, version):
+    blocker_counts = query("blocker_status_counts", store.counts, 'blockers', 'status', report, start, end)
+    growth_areas = rows('growth_areas', report, start, end)
+    fig_blockers = fig_aging = fig_growth = None
+
+    if len(blocker_counts) > 0:
+        fig_blockers = chart("blocker_status", charts.blocker_status_figure, blocker_counts)
+        aging = query("blocker_aging", store.lifecycles['blockers'].aging, report, start, end)
+        fig_aging = chart("blocker_aging", charts.blocker_aging_figure, aging)
+
+    if len(growth_areas) > 0:
+        fig_growth = chart("growth", charts.growth_figure, growth_areas)
+
+    return fig_blockers, fig_aging, fig_growth
+
+@section_cache
+def rollup_summary(node, start, end, version):
+    # The manager's own rows of the rolled-up KPI cube, however many people report below them
+    return query("org_summary", org_rollup(version).summary, node, start, end)
+
+@figure_section
+def rollup_figures(node, start, end, version):
+    # Sentiment per direct report's organisation, and per-value counts of the whole subtree
+    rollup = org_rollup(version)
+    trend = query("org_sentiment_trend", rollup.trend, node, start, end)
+    topic_counts = query("org_topic_counts", rollup.value_counts, 'topics', 'topic', node, start, end)
+    status_counts = query("org_action_status_counts", rollup.value_counts, 'action_items', 'status', node, start, end)
+    blocker_counts = query("org_blocker_status_counts", rollup.value_counts, 'blockers', 'status', node, start, end)
+    fig_sentiment = fig_topics = fig_priority = fig_actions = fig_blockers = None
+
+    if len(trend) > 0:
+        fig_sentiment = chart("org_sentiment", charts.sentiment_figure, trend)
+
+    if len(topic_counts) > 0:
+        fig_topics = chart("topics", charts.topics_figure, topic_counts)
+        priority_counts = query("org_priority_counts", rollup.value_counts, 'topics', 'priority', node, start, end)
+        fig_priority = chart("priority", charts.priority_figure, priority_counts)
+
+    if len(status_counts) > 0:
+        fig_actions = chart("action_status", charts.action_status_figure, status_counts)
+
+    if len(blocker_counts) > 0:
+        fig_blockers = chart("blocker_status", charts.blocker_status_figure, blocker_counts)
+
+    return fig_sentiment, fig_topics, fig_priority, fig_actions, fig_blockers
+
+# Sections: each is a fragment, so a widget inside one (e.g. a page number) reruns only that section
+@st.fragment
+def kpi_section(summary):
+    with instrumentation.timer("section:KPI row"):
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            st.metric("Total Meetings", summary['total_meetings'])
+
+        with col2:
+            st.metric("Action Item Completion", f"{summary['completion_rate']:.0f}%",
+                      f"{summary['completed_actions']}/{summary['total_actions']} completed")
+
+        with col3:
+            active_blockers = summary['active_blockers']
+            st.metric("Active Blockers", active_blockers,
+                      delta=-1 if active_blockers < 3 else 1,
+                      delta_color="inverse")
+
+        with col4:
+            avg_sentiment = summary['avg_sentiment']
+            st.metric("Avg. Meeting Sentiment", f"{avg_sentiment:.2f}",
+                      delta=f"{(avg_sentiment - 0.5):.2f}",
+                      delta_color="normal")
+
+@st.fragment
+def sentiment_section(report, start, end):
+    with instrumentation.timer("section:Sentiment & communication"):
+        fig_sentiment, fig_comm = sentiment_figures(
+            report, start, end, store.version_of('meetings', 'communication'))
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.subheader("📈 Meeting Sentiment Trend")
+            plot(fig_sentiment, "sentiment")
+
+        with col2:
+            st.subheader("💬 Communication Patterns")
+            if fig_comm is not None:
+                plot(fig_comm, "hedge_words")
+            else:
+                st.info("No communication data available for selected filters")
+
+@st.fragment
+def okr_section(report, start, end):
+    with instrumentation.timer("section:OKRs"):
+        st.subheader("🎯 OKR Progress Tracking")
+        version = store.version_of('metrics')
+        okr_by_report = okr_metric_names(report, start, end, version)
+
+        if not okr_by_report:
+            st.info("No metrics data available for selected filters")
+        elif report is None:
+            # Create tabs for each direct report if "All" is selected
+            tab_reports = paginate(sorted(okr_by_report), OKR_REPORTS_PER_PAGE, "okr_report_page", "Report page")
+            tabs = st.tabs(tab_reports)
+
+            for tab, name in zip(tabs, tab_reports):
+                with tab:
+                    metrics = paginate(okr_by_report[name], OKR_METRICS_PER_PAGE,
+                                       f"okr_page_{name}", "Metric page")
+                    fig, _ = okr_page(name, tuple(metrics), start, end, version)
+                    plot(fig, "okr")
+
+            # Org-wide OKRs below the on-track line, one page at a time
+            statuses = okr_statuses(report, start, end, version)
+            at_risk = int((~statuses['on_track'].to_numpy(dtype=bool)).sum())
+            st.markdown(f"**At-Risk OKRs ({at_risk}):**")
+            if at_risk > 0:
+                first, last = page_bounds(at_risk, LIST_PAGE_SIZE, "okr_risk_page", "At-risk page")
+                st.markdown(list_views.at_risk_okrs(statuses, first, last))
+            else:
+                st.success("Every OKR is on track!")
+        else:
+            # Show all metrics for selected report
+            metrics = paginate(okr_by_report.get(report, []), OKR_METRICS_PER_PAGE,
+                               "okr_page", "Metric page")
+            fig, statuses = okr_page(report, tuple(metrics), start, end, version)
 
-# Main dashboard
-st.title("🎯 1:1 Meeting Insights Dashboard")
-st.markdown("**Manager:** Sarah Chen | **Last Updated:** " + datetime.now().strftime("%B %d, %Y"))
-st.markdown("---")
-
-# === ROW 1: KEY METRICS ===
-col1, col2, col3, col4 = st.columns(4)
-
-with col1:
-    total_meetings = len(meetings_filtered)
-    st.metric("Total Meetings", total_meetings)
-
-with col2:
-    total_actions = len(action_items_filtered)
-    completed_actions = len(action_items_filtered[action_items_filtered['status'] == 'Completed'])
-    completion_rate = (completed_actions / total_actions * 100) if total_actions > 0 else 0
-    st.metric("Action Item Completion", f"{completion_rate:.0f}%",
-              f"{completed_actions}/{total_actions} completed")
-
-with col3:
-    active_blockers = len(blockers_filtered[blockers_filtered['status'] == 'Active'])
-    st.metric("Active Blockers", active_blockers,
-              delta=-1 if active_blockers < 3 else 1,
-              delta_color="inverse")
-
-with col4:
-    avg_sentiment = meetings_filtered['sentiment_score'].mean()
-    st.metric("Avg. Meeting Sentiment", f"{avg_sentiment:.2f}",
-              delta=f"{(avg_sentiment - 0.5):.2f}",
-              delta_color="normal")
+            col1, col2 = st.columns([3, 1])
 
-st.markdown("---")
+            with col1:
+                plot(fig, "okr")
 
-# === ROW 2: SENTIMENT & ENGAGEMENT ===
-col1, col2 = st.columns(2)
-
-with col1:
-    st.subheader("📈 Meeting Sentiment Trend")
-    fig_sentiment = px.line(
-        meetings_filtered.sort_values('date'),
-        x='date',
-        y='sentiment_score',
-        color='direct_report',
-        markers=True,
-        title="Sentiment Score Over Time (0=Negative, 1=Positive)"
-    )
-    fig_sentiment.add_hline(y=0.5, line_dash="dash", line_color="gray",
-                            annotation_text="Neutral")
-    fig_sentiment.update_layout(height=350)
-    st.plotly_chart(fig_sentiment, use_container_width=True)
-
-with col2:
-    st.subheader("💬 Communication Patterns")
-    if len(communication_filtered) > 0:
-        fig_comm = go.Figure()
-
-        for report in communication_filtered['direct_report'].unique():
-            report_data = communication_filtered[communication_filtered['direct_report'] == report].sort_values('meeting_date')
-            fig_comm.add_trace(go.Scatter(
-                x=report_data['meeting_date'],
-                y=report_data['dr_hedge_words'],
-                mode='lines+markers',
-                name=report,
-                hovertemplate='%{y} hedge words<extra></extra>'
-            ))
-
-        fig_comm.update_layout(
-            title="Hedge Words per Meeting (Lower = More Confident)",
-            xaxis_title="Date",
-            yaxis_title="Hedge Words Count",
-            height=350
-        )
-        st.plotly_chart(fig_comm, use_container_width=True)
-    else:
-        st.info("No communication data available for selected filters")
+            with col2:
+                for status in statuses:
+                    st.metric(
+                        f"{status.name} (latest)",
+                        f"{status['actual']}{status['unit']}",
+                        f"{status['gap']:+.1f} vs target"
+                    )
+                    st.markdown(f"**Status:** {charts.okr_status_label(status['on_track'])}")
+                    if pd.notna(status['slope_per_day']):
+                        reach = (f" · target by {status['projected_date']:%b %d, %Y}"
+                                 if status['gap'] < 0 and pd.notna(status['projected_date']) else "")
+                        st.caption(f"Trend: {status['slope_per_day'] * 7:+.1f}{status['unit']}/week{reach}")
+
+@st.fragment
+def topics_actions_section(report, start, end):
+    with instrumentation.timer("section:Topics & actions"):
+        (fig_topics, fig_priority, fig_topic_share, topic_shifts,
+         fig_actions, fig_burndown, recent_actions) = topic_action_figures(
+            report, start, end, store.version_of('topics', 'action_items'))
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.subheader("📝 Discussion Topics")
+
+            if fig_topics is not None:
+                plot(fig_topics, "topics")
+                plot(fig_priority, "priority")
+                if fig_topic_share is not None:
+                    plot(fig_topic_share, "topic_share")
+
+                # Topics whose share of time moved most between the last two 4-week windows
+                st.markdown("**Emerging & Fading Topics:**")
+                if topic_shifts:
+                    st.markdown(topic_shifts)
+                else:
+                    st.info("No topic's share of discussion time shifted notably")
+            else:
+                st.info("No topic data available")
+
+        with col2:
+            st.subheader("✅ Action Items Status")
+
+            if fig_actions is not None:
+                plot(fig_actions, "action_status")
+                plot(fig_burndown, "action_burndown")
+
+                # Recent action items
+                st.markdown("**Recent Action Items:**")
+                st.markdown(recent_actions)
+            else:
+                st.info("No action items available")
+
+@st.fragment
+def blockers_growth_section(report, start, end, active_blockers):
+    with instrumentation.timer("section:Blockers & growth"):
+        fig_blockers, fig_aging, fig_growth = blocker_growth_figures(
+            report, start, end, store.version_of('blockers', 'growth_areas'))
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.subheader("🚧 Blockers & Challenges")
+
+            if fig_blockers is not None:
+                plot(fig_blockers, "blocker_status")
+                plot(fig_aging, "blocker_aging")
+
+                # List active blockers, one page at a time
+                st.markdown("**Active Blockers:**")
+
+                if active_blockers > 0:
+                    first, last = page_bounds(active_blockers, LIST_PAGE_SIZE, "blocker_page", "Blocker page")
+                    blockers = query("active_blockers", store.active_blockers, first, last, report, start, end)
+                    st.markdown(list_views.active_blockers(blockers))
+                else:
+                    st.success("No active blockers!")
+            else:
+                st.info("No blocker data available")
+
+        with col2:
+            st.subheader("🌱 Growth & Development")
+
+            if fig_growth is not None:
+                plot(fig_growth, "growth")
+
+                # Growth details
+                st.markdown("**Development Focus:**")
+                total = query("growth_count", store.count, 'growth_areas', report, start, end)
+                first, last = page_bounds(total, LIST_PAGE_SIZE, "growth_page", "Growth page")
+                growth_areas = query("growth_page", store.page, 'growth_areas', first, last, report, start, end)
+                st.markdown(list_views.development_focus(growth_areas))
+            else:
+                st.info("No growth data available")
+
+@st.fragment
+def rollup_section(node, start, end):
+    with instrumentation.timer("section:Org roll-up"):
+        fig_sentiment, fig_topics, fig_priority, fig_actions, fig_blockers = rollup_figures(
+            node, start, end, store.version_of(*orgchart.ROLLUP_TABLES))
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.subheader("📈 Sentiment by Team")
+            if fig_sentiment is not None:
+                plot(fig_sentiment, "org_sentiment")
+            else:
+                st.info("No meetings in this organisation for selected filters")
+
+        with col2:
+            st.subheader("🚧 Blockers & Challenges")
+            if fig_blockers is not None:
+                plot(fig_blockers, "blocker_status")
+            else:
+                st.info("No blocker data available")
+
+        st.markdown("---")
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.subheader("📝 Discussion Topics")
+            if fig_topics is not None:
+                plot(fig_topics, "topics")
+                plot(fig_priority, "priority")
+            else:
+                st.info("No topic data available")
+
+        with col2:
+            st.subheader("✅ Action Items Status")
+            if fig_actions is not None:
+                plot(fig_actions, "action_status")
+            else:
+                st.info("No action items available")
+
+@st.fragment
+def insights_section(summary):
+    with instrumentation.timer("section:Key insights"):
+        st.markdown("### 💡 Key Insights")
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown("**Strengths:**")
+            strengths = insights.strengths(summary)
+            for strength in strengths:
+                st.success(f"• {strength}")
+            if not strengths:
+                st.info("Check individual metrics for specific strengths")
+
+        with col2:
+            st.markdown("**Areas for Attention:**")
+            concerns = insights.concerns(summary)
+            for concern in concerns:
+                st.warning(f"• {concern}")
+            if not concerns:
+                st.success("No major concerns detected!")
+
+@st.fragment
+def search_section(text, report, start, end):
+    with instrumentation.timer("section:Search"):
+        results, counts = query("search", store.search.search, text, report, start, end)
+        st.subheader(f"🔍 Search: {text}")
+
+        total = int(counts.sum())
+        if total == 0:
+            st.info("No matching action items, blockers, topics or growth areas")
+            return
+        found = ", ".join(f"{count} × {list_views.TABLE_LABELS[name]}" for name, count in counts.items() if count)
+        newest = f" (newest {len(results)} listed)" if total > len(results) else ""
+        st.caption(f"{total} matches: {found}{newest}")
+        st.markdown(list_views.search_results(paginate(results, LIST_PAGE_SIZE, "search_page", "Search page")))
 
+# Main dashboard
+st.title("🎯 1:1 Meeting Insights Dashboard")
+manager = org_node or (tree.root if tree is not None else "Sarah Chen")
+st.markdown(f"**Manager:** {manager} | **Last Updated:** " + datetime.now().strftime("%B %d, %Y"))
 st.markdown("---")
 
-# === ROW 3: OKRS & METRICS ===
-st.subheader("🎯 OKR Progress Tracking")
-
-if len(metrics_filtered) > 0:
-    unique_metrics = metrics_filtered['metric'].unique()
-
-    # Create tabs for each direct report if "All" is selected
-    if selected_report == "All":
-        tabs = st.tabs(sorted(metrics_filtered['direct_report'].unique()))
-
-        for i, report in enumerate(sorted(metrics_filtered['direct_report'].unique())):
-            with tabs[i]:
-                report_metrics = metrics_filtered[metrics_filtered['direct_report'] == report]
-
-                for metric_name in report_metrics['metric'].unique():
-                    metric_data = report_metrics[report_metrics['metric'] == metric_name].sort_values('date')
-
-                    fig = go.Figure()
-                    fig.add_trace(go.Scatter(
-                        x=metric_data['date'],
-                        y=metric_data['actual'],
-                        mode='lines+markers',
-                        name='Actual',
-                        line=dict(color='#1f77b4', width=3)
-                    ))
-                    fig.add_trace(go.Scatter(
-                        x=metric_data['date'],
-                        y=metric_data['target'],
-                        mode='lines',
-                        name='Target',
-                        line=dict(color='red', dash='dash')
-                    ))
-
-                    fig.update_layout(
-                        title=f"{metric_name}",
-                        xaxis_title="Date",
-                        yaxis_title=f"Value ({metric_data.iloc[0]['unit']})",
-                        height=300
-                    )
+if search_text.strip():
+    search_section(search_text, report_key, start_date, end_date)
+    st.markdown("---")
 
-                    st.plotly_chart(fig, use_container_width=True)
-    else:
-        # Show all metrics for selected report
-        for metric_name in unique_metrics:
-            metric_data = metrics_filtered[metrics_filtered['metric'] == metric_name].sort_values('date')
+if org_node is not None:
+    summary = rollup_summary(org_node, start_date, end_date, store.version_of(*orgchart.ROLLUP_TABLES))
 
-            col1, col2 = st.columns([3, 1])
-
-            with col1:
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=metric_data['date'],
-                    y=metric_data['actual'],
-                    mode='lines+markers',
-                    name='Actual',
-                    line=dict(color='#1f77b4', width=3)
-                ))
-                fig.add_trace(go.Scatter(
-                    x=metric_data['date'],
-                    y=metric_data['target'],
-                    mode='lines',
-                    name='Target',
-                    line=dict(color='red', dash='dash')
-                ))
-
-                fig.update_layout(
-                    title=f"{metric_name}",
-                    xaxis_title="Date",
-                    yaxis_title=f"Value ({metric_data.iloc[0]['unit']})",
-                    height=300
-                )
-
-                st.plotly_chart(fig, use_container_width=True)
+    # === ROW 1: KEY METRICS OF THE WHOLE ORGANISATION ===
+    kpi_section(summary)
+    st.markdown("---")
 
-            with col2:
-                latest = metric_data.iloc[-1]
-                gap = latest['actual'] - latest['target']
-                on_track = "✓ On Track" if gap >= 0 or latest['actual'] / latest['target'] >= 0.9 else "⚠ At Risk"
-
-                st.metric(
-                    "Latest",
-                    f"{latest['actual']}{latest['unit']}",
-                    f"{gap:+.1f} vs target"
-                )
-                st.markdown(f"**Status:** {on_track}")
+    # === ROWS 2-3: SENTIMENT, BLOCKERS, TOPICS & ACTION ITEMS ===
+    rollup_section(org_node, start_date, end_date)
+    st.markdown("---")
 else:
-    st.info("No metrics data available for selected filters")
+    summary = kpi_summary(report_key, start_date, end_date, store.version_of('meetings', 'action_items', 'blockers'))
 
-st.markdown("---")
+    # === ROW 1: KEY METRICS ===
+    kpi_section(summary)
+    st.markdown("---")
 
-# === ROW 4: TOPICS & ACTION ITEMS ===
-col1, col2 = st.columns(2)
-
-with col1:
-    st.subheader("📝 Discussion Topics")
-
-    if len(topics_filtered) > 0:
-        # Topic frequency
-        topic_counts = topics_filtered.groupby('topic').size().reset_index(name='frequency')
-        topic_counts = topic_counts.sort_values('frequency', ascending=False)
-
-        fig_topics = px.bar(
-            topic_counts,
-            x='frequency',
-            y='topic',
-            orientation='h',
-            title="Most Discussed Topics",
-            color='frequency',
-            color_continuous_scale='blues'
-        )
-        fig_topics.update_layout(height=400, showlegend=False)
-        st.plotly_chart(fig_topics, use_container_width=True)
-
-        # Topic priority distribution
-        priority_dist = topics_filtered['priority'].value_counts()
-        fig_priority = px.pie(
-            values=priority_dist.values,
-            names=priority_dist.index,
-            title="Topic Priority Distribution"
-        )
-        st.plotly_chart(fig_priority, use_container_width=True)
-    else:
-        st.info("No topic data available")
-
-with col2:
-    st.subheader("✅ Action Items Status")
-
-    if len(action_items_filtered) > 0:
-        # Action items by status
-        status_counts = action_items_filtered['status'].value_counts()
-
-        fig_actions = px.pie(
-            values=status_counts.values,
-            names=status_counts.index,
-            title="Action Items by Status",
-            color=status_counts.index,
-            color_discrete_map={
-                'Completed': '#28a745',
-                'In Progress': '#ffc107',
-                'Pending': '#dc3545'
-            }
-        )
-        st.plotly_chart(fig_actions, use_container_width=True)
-
-        # Recent action items
-        st.markdown("**Recent Action Items:**")
-        recent_actions = action_items_filtered.sort_values('created_date', ascending=False).head(5)
-
-        for _, action in recent_actions.iterrows():
-            status_emoji = {"Completed": "✅", "In Progress": "🔄", "Pending": "⏳"}
-            st.markdown(
-                f"{status_emoji.get(action['status'], '•')} **{action['action']}**  \n"
-                f"   Owner: {action['owner']} | Created: {action['created_date'].strftime('%b %d')}"
-            )
-    else:
-        st.info("No action items available")
+    # === ROW 2: SENTIMENT & ENGAGEMENT ===
+    sentiment_section(report_key, start_date, end_date)
+    st.markdown("---")
 
-st.markdown("---")
+    # === ROW 3: OKRS & METRICS ===
+    okr_section(report_key, start_date, end_date)
+    st.markdown("---")
 
-# === ROW 5: BLOCKERS & GROWTH ===
-col1, col2 = st.columns(2)
-
-with col1:
-    st.subheader("🚧 Blockers & Challenges")
-
-    if len(blockers_filtered) > 0:
-        # Active vs Resolved
-        blocker_status = blockers_filtered['status'].value_counts()
-
-        fig_blockers = px.bar(
-            x=blocker_status.index,
-            y=blocker_status.values,
-            title="Blocker Status",
-            labels={'x': 'Status', 'y': 'Count'},
-            color=blocker_status.index,
-            color_discrete_map={'Active': '#dc3545', 'Resolved': '#28a745'}
-        )
-        st.plotly_chart(fig_blockers, use_container_width=True)
-
-        # List active blockers
-        st.markdown("**Active Blockers:**")
-        active = blockers_filtered[blockers_filtered['status'] == 'Active'].sort_values('severity', ascending=False)
-
-        if len(active) > 0:
-            for _, blocker in active.iterrows():
-                severity_color = {'High': '🔴', 'Medium': '🟡', 'Low': '🟢'}
-                st.markdown(
-                    f"{severity_color.get(blocker['severity'], '•')} **{blocker['blocker']}**  \n"
-                    f"   {blocker['direct_report']} | Since: {blocker['first_mentioned']}"
-                )
-        else:
-            st.success("No active blockers!")
-    else:
-        st.info("No blocker data available")
-
-with col2:
-    st.subheader("🌱 Growth & Development")
-
-    if len(growth_filtered) > 0:
-        # Growth areas by person
-        fig_growth = px.bar(
-            growth_filtered,
-            x='progress_level',
-            y='area',
-            color='direct_report',
-            orientation='h',
-            title="Development Areas Progress (1=Beginning, 5=Advanced)",
-            labels={'progress_level': 'Progress Level', 'area': 'Growth Area'}
-        )
-        fig_growth.update_layout(height=400)
-        st.plotly_chart(fig_growth, use_container_width=True)
-
-        # Growth details
-        st.markdown("**Development Focus:**")
-        for _, growth in growth_filtered.iterrows():
-            progress_bar = "▓" * growth['progress_level'] + "░" * (5 - growth['progress_level'])
-            st.markdown(
-                f"**{growth['area']}** ({growth['direct_report']})  \n"
-                f"   {progress_bar} | {growth['activities']}"
-            )
-    else:
-        st.info("No growth data available")
+    # === ROW 4: TOPICS & ACTION ITEMS ===
+    topics_actions_section(report_key, start_date, end_date)
+    st.markdown("---")
 
-st.markdown("---")
+    # === ROW 5: BLOCKERS & GROWTH ===
+    blockers_growth_section(report_key, start_date, end_date, summary['active_blockers'])
+    st.markdown("---")
 
 # === FOOTER ===
-st.markdown("### 💡 Key Insights")
-
-col1, col2 = st.columns(2)
-
-with col1:
-    st.markdown("**Strengths:**")
-    strengths_found = False
-
-    if avg_sentiment > 0.55:
-        st.success("• Positive overall team morale and engagement")
-        strengths_found = True
-    if completion_rate >= 50:
-        st.success(f"• Good action item follow-through ({completion_rate:.0f}%)")
-        strengths_found = True
-    if active_blockers <= 3:
-        st.success("• Manageable number of active blockers")
-        strengths_found = True
-
-    # Check for improving trends
-    if len(meetings_filtered) >= 2:
-        recent_sentiment = meetings_filtered.sort_values('date').tail(2)['sentiment_score'].mean()
-        if recent_sentiment > avg_sentiment:
-            st.success("• Recent meetings show improving sentiment")
-            strengths_found = True
-
-    if not strengths_found:
-        st.info("Check individual metrics for specific strengths")
-
-with col2:
-    st.markdown("**Areas for Attention:**")
-    concerns_found = False
-
-    if avg_sentiment < 0.45:
-        st.warning("• Meeting sentiment below neutral - investigate concerns")
-        concerns_found = True
-    if completion_rate < 50:
-        st.warning(f"• Low action item completion rate ({completion_rate:.0f}%)")
-        concerns_found = True
-    if active_blockers > 5:
-        st.warning(f"• High number of active blockers ({active_blockers}) may impact progress")
-        concerns_found = True
-
-    # Check for declining trends
-    if len(meetings_filtered) >= 2:
-        recent_sentiment = meetings_filtered.sort_values('date').tail(2)['sentiment_score'].mean()
-        if recent_sentiment < avg_sentiment - 0.1:
-            st.warning("• Recent meetings show declining sentiment")
-            concerns_found = True
-
-    if not concerns_found:
-        st.success("No major concerns detected!")
+insights_section(summary)
+
+# Process-wide timings and cache counters (fragment-only reruns show up on the next full run)
+if show_performance:
+    with st.sidebar.expander("Performance", expanded=True):
+        timers = pd.DataFrame(instrumentation.REGISTRY.timer_rows(),
+                              columns=["step", "runs", "last ms", "mean ms", "max ms"]).set_index("step")
+        st.dataframe(timers.round(1), use_container_width=True)
+        caches = pd.DataFrame(instrumentation.REGISTRY.cache_rows(),
+                              columns=["cache", "calls", "hits", "misses"]).set_index("cache")
+        st.dataframe(caches, use_container_width=True)
+        figures = shared_figures().stats()
+        st.caption(f"Figure cache: {figures['hit_rate']:.0%} hits ({figures['disk_hits']} from disk), "
+                   f"{figures['entries']} entries, {figures['bytes'] / 2 ** 20:.1f} MB, "
+                   f"{figures['evictions']} evicted")
+
+if METRICS_FILE:
+    instrumentation.write_prometheus(METRICS_FILE)
 
 st.markdown("---")
 st.caption("POC Dashboard | ComChord Data Internship Technical Test")
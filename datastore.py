@@ -0,0 +1,329 @@
+"""
+In-memory data access layer for the dashboard tables
+Partitions every table by direct report once at load time, so selecting a
+report is a dictionary lookup that returns a row slice (a view, not a copy),
+and answers date-range queries with binary search on sorted date columns
+"""
+
+import threading
+
+import pandas as pd
+import numpy as np
+
+from aggregates import KpiCube
+from lifecycles import LIFECYCLES, LifecycleIndex
+from okr import OkrSnapshot
+from search import SEARCH_COLUMNS, SearchIndex, index_columns
+from topic_analytics import TopicCube
+
+if int(pd.__version__.split('.')[0]) < 3:
+    # Copy-on-Write (always on from pandas 3) keeps the shared store read-only:
+    # modifying a returned slice gives the caller its own copy
+    pd.set_option('mode.copy_on_write', True)
+
+# Column used for date-range filtering of each table (growth areas are undated)
+DATE_COLUMNS = {
+    'meetings': 'date',
+    'topics': 'meeting_date',
+    'action_items': 'created_date',
+    'metrics': 'date',
+    'blockers': 'first_mentioned',
+    'communication': 'meeting_date',
+}
+# Blocker severities from least to most urgent; active blockers are listed most urgent first
+SEVERITY_RANK = {'Low': 0, 'Medium': 1, 'High': 2}
+
+
+def _bound(value):
+    return None if value is None else np.datetime64(pd.Timestamp(value))
+
+
+def _window(dates, start, end):
+    lo = 0 if start is None else np.searchsorted(dates, start, side='left')
+    hi = len(dates) if end is None else np.searchsorted(dates, end, side='right')
+    return lo, max(lo, hi)
+
+
+def _frozen(array):
+    if array is not None:
+        array.flags.writeable = False
+    return array
+
+
+def _partitions(df):
+    codes, reports = pd.factorize(df['direct_report'])
+    starts = np.flatnonzero(np.diff(codes, prepend=-1))
+    stops = np.append(starts[1:], len(codes))
+    return {report: (start, stop) for report, start, stop in zip(reports, starts, stops)}
+
+
+def _align_categories(df, rows):
+    """Give ``rows`` the categorical dtypes of ``df`` (extended with any new values)."""
+    rows = rows[list(df.columns)].copy()
+    for column in df.columns:
+        dtype = df[column].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            known = dtype.categories
+            new = pd.Index(rows[column].dropna().unique()).difference(known)
+            dtype = pd.CategoricalDtype(known.append(new))
+            df[column] = df[column].cat.set_categories(dtype.categories)
+        rows[column] = rows[column].astype(dtype)
+    return df, rows
+
+
+class TableIndex:
+    """One table with its per-report offsets and, for dated tables, sorted date arrays.
+
+    Rows are grouped by ``direct_report`` and date-ordered within each group.
+    ``date_order`` is the permutation that sorts the whole table by date and
+    ``sorted_dates`` the dates in that order. Instances are never mutated and
+    their arrays are read-only; appends build a new index so concurrent
+    readers always see one version.
+    """
+
+    def __init__(self, df, date_col, partitions, date_order=None, sorted_dates=None):
+        self.df = df
+        self.date_col = date_col
+        self.partitions = partitions
+        self.dates = _frozen(df[date_col].to_numpy()) if date_col else None
+        self.date_order = _frozen(date_order)
+        self.sorted_dates = _frozen(sorted_dates)
+
+    @classmethod
+    def build(cls, df, date_col):
+        # Stable sort keeps same-day rows of a report in their original order
+        df = df.sort_values(['direct_report'] + ([date_col] if date_col else []), kind='stable')
+        date_order = sorted_dates = None
+        if date_col:
+            dates = df[date_col].to_numpy()
+            date_order = np.argsort(dates, kind='stable')
+            sorted_dates = dates[date_order]
+        return cls(df, date_col, _partitions(df), date_order, sorted_dates)
+
+    def appended(self, rows):
+        """A new index with ``rows`` merged in, without re-sorting the existing rows.
+
+        Rows of known reports are inserted into their report's slice at the
+        position found by binary search on its dates; new reports go at the
+        end. The global date permutation is merged the same way.
+        """
+        df, rows = _align_categories(self.df.copy(deep=False), rows)
+        keys = ['direct_report'] + ([self.date_col] if self.date_col else [])
+        rows = rows.sort_values(keys, kind='stable')
+        n = len(df)
+
+        positions = np.full(len(rows), n)
+        unknown = np.ones(len(rows), dtype=bool)
+        report_values = rows['direct_report'].to_numpy()
+        for report in pd.unique(report_values):
+            if report not in self.partitions:
+                continue
+            mask = report_values == report
+            unknown[mask] = False
+            lo, hi = self.partitions[report]
+            if self.date_col:
+                dates = rows[self.date_col].to_numpy()[mask]
+                positions[mask] = lo + np.searchsorted(self.dates[lo:hi], dates, side='right')
+            else:
+                positions[mask] = hi
+        # At equal positions (the end of the table) known reports come before new ones
+        order = np.lexsort((unknown, positions))
+        rows, positions = rows.iloc[order], positions[order]
+
+        take = np.insert(np.arange(n), positions, np.arange(n, n + len(rows)))
+        merged = pd.concat([df, rows]).iloc[take]
+        if not self.date_col:
+            return TableIndex(merged, None, _partitions(merged))
+
+        # Old row p moved to moved[p]; new rows landed at new_positions (in row order)
+        moved = np.flatnonzero(take < n)
+        new_positions = np.flatnonzero(take >= n)
+        new_dates = rows[self.date_col].to_numpy()
+        by_date = np.argsort(new_dates, kind='stable')
+        at = np.searchsorted(self.sorted_dates, new_dates[by_date], side='right')
+        sorted_dates = np.insert(self.sorted_dates, at, new_dates[by_date])
+        date_order = np.insert(moved[self.date_order], at, new_positions[by_date])
+        return TableIndex(merged, self.date_col, _partitions(merged), date_order, sorted_dates)
+
+    def select(self, report=None, start=None, end=None):
+        df = self.df
+        windowed = self.date_col is not None and (start is not None or end is not None)
+
+        if report is not None:
+            lo, hi = self.partitions.get(report, (0, 0))
+            if windowed:
+                first, last = _window(self.dates[lo:hi], start, end)
+                lo, hi = lo + first, lo + last
+            return df.iloc[lo:hi]
+
+        if not windowed:
+            return df
+        lo, hi = _window(self.sorted_dates, start, end)
+        if lo == 0 and hi == len(df):
+            return df
+        # Back to (report, date) order so callers see the same layout as the full table
+        return df.iloc[np.sort(self.date_order[lo:hi])]
+
+    def latest(self, n, report=None, start=None, end=None):
+        if report is not None:
+            lo, hi = self.partitions.get(report, (0, 0))
+            first, last = _window(self.dates[lo:hi], start, end)
+            return self.df.iloc[max(lo + first, lo + last - n):lo + last]
+        lo, hi = _window(self.sorted_dates, start, end)
+        return self.df.iloc[self.date_order[max(lo, hi - n):hi]]
+
+
+class DataStore:
+    """The seven dashboard tables, indexed by direct report and date.
+
+    Within a report's slice rows are in date order, so a date window is two
+    ``searchsorted`` calls. For the "All" view each dated table also keeps
+    its dates in global order plus the permutation that sorts them.
+    ``kpis`` holds the pre-aggregated KPI cube built from the same tables,
+    ``okrs`` the materialized OKR status table, ``topic_times`` the
+    running topic time totals (when ``time_spent_mins`` was loaded) and
+    ``lifecycles`` the interval indexes of action items and blockers (when
+    their end dates were loaded) and ``search`` the full-text index of the
+    tables whose text columns were loaded, keyed by row label.
+
+    New rows are merged in with ``append``, which bumps the version of the
+    touched table so cached views depending on it can be invalidated.
+    """
+
+    def __init__(self, tables):
+        self.indexes = {
+            name: TableIndex.build(df, DATE_COLUMNS.get(name)) for name, df in tables.items()
+        }
+        self.kpis = KpiCube(self.tables)
+        self.okrs = OkrSnapshot(self.indexes['metrics'].df)
+        # Topic time analytics need time_spent_mins, which the insights jobs do not load
+        topics = self.indexes['topics'].df
+        self.topic_times = TopicCube.from_rows([topics]) if 'time_spent_mins' in topics else None
+        self.lifecycles = {
+            name: LifecycleIndex(self.indexes[name].df, start, end)
+            for name, (start, end) in LIFECYCLES.items() if end in self.indexes[name].df
+        }
+        self.search = SearchIndex({
+            name: self.indexes[name].df for name in SEARCH_COLUMNS
+            if set(index_columns(name)) <= set(self.indexes[name].df.columns)
+        })
+        self.versions = {name: 0 for name in self.indexes}
+        self.lock = threading.RLock()
+
+    @property
+    def tables(self):
+        return {name: index.df for name, index in self.indexes.items()}
+
+    @property
+    def version(self):
+        """Overall data version; increases with every append."""
+        return sum(self.versions.values())
+
+    def version_of(self, *names):
+        """Version stamp of the given tables, for use in cache keys."""
+        return tuple(self.versions[name] for name in names)
+
+    def reports(self):
+        """Sorted direct reports that have at least one meeting."""
+        return sorted(self.indexes['meetings'].partitions)
+
+    def columns(self, name):
+        return list(self.indexes[name].df.columns)
+
+    def date_range(self, name):
+        """(first, last) date of dated table ``name``; NaT when it is empty."""
+        dates = self.indexes[name].sorted_dates
+        if len(dates) == 0:
+            return pd.NaT, pd.NaT
+        return pd.Timestamp(dates[0]), pd.Timestamp(dates[-1])
+
+    def table(self, name, report=None, start=None, end=None):
+        """Rows of table ``name`` for ``report`` dated within [``start``, ``end``].
+
+        ``None`` means no restriction. Per-report results are slices of the
+        stored table; an "All" query over a partial window copies only the
+        rows inside the window. Undated tables ignore the window.
+        """
+        return self.indexes[name].select(report, _bound(start), _bound(end))
+
+    def latest(self, name, n, report=None, start=None, end=None):
+        """The ``n`` most recent rows of dated table ``name`` in the selection, oldest first."""
+        return self.indexes[name].latest(n, report, _bound(start), _bound(end))
+
+    def select(self, report=None, start=None, end=None):
+        """All tables restricted to ``report`` and the date window, keyed by table name."""
+        return {name: self.table(name, report, start, end) for name in self.indexes}
+
+    def count(self, name, report=None, start=None, end=None):
+        """Number of rows of table ``name`` in the selection."""
+        return len(self.table(name, report, start, end))
+
+    def page(self, name, first, last, report=None, start=None, end=None):
+        """Rows [``first``, ``last``) of the selection of table ``name``, in table order."""
+        return self.table(name, report, start, end).iloc[first:last]
+
+    def active_blockers(self, first, last, report=None, start=None, end=None):
+        """Rows [``first``, ``last``) of the active blockers in the selection, by severity then most recent."""
+        blockers = self.table('blockers', report, start, end)
+        active = blockers[(blockers['status'] == 'Active').to_numpy()]
+        ranked = active.assign(_rank=active['severity'].astype(str).map(SEVERITY_RANK).fillna(-1))
+        return ranked.nlargest(last, ['_rank', 'first_mentioned']).iloc[first:last].drop(columns='_rank')
+
+    def chunks(self, name, columns=None):
+        """Every row of table ``name`` in (report, date) order, as a sequence of frames."""
+        df = self.indexes[name].df
+        return [df if columns is None else df[columns]]
+
+    def counts(self, name, column, report=None, start=None, end=None):
+        """Rows per value of ``column`` in the selection, indexed by value in sorted order."""
+        counts = self.table(name, report, start, end)[column].value_counts(sort=False)
+        counts = counts[counts > 0]
+        counts.index = counts.index.astype(str)
+        return counts.sort_index()
+
+    def trend(self, name, column, report=None, start=None, end=None):
+        """Mean ``column`` per (direct_report, date) of dated table ``name``, by report then date."""
+        rows = self.table(name, report, start, end)
+        grouped = rows.groupby(['direct_report', DATE_COLUMNS[name]], sort=False, observed=True)
+        return grouped[column].mean().reset_index()
+
+    def okr_snapshot(self, report=None, start=None, end=None):
+        """OKR status of every (direct_report, metric) in the selection (see ``okr.COLUMNS``).
+
+        Read from the materialized table unless the date window cuts into the
+        readings it was computed from; then it is computed from the window.
+        """
+        snapshot = self.okrs.select(report, _bound(start), _bound(end))
+        if snapshot is None:
+            snapshot = OkrSnapshot(self.table('metrics', report, start, end), self.okrs.points).table
+        return snapshot
+
+    def ingested(self):
+        """Names of the incoming files already appended: none, as appended rows live in memory only."""
+        return set()
+
+    def append(self, name, rows, source=None):
+        """Merge new ``rows`` into table ``name`` and the derived aggregates.
+
+        ``source`` (the incoming file the rows came from) is only recorded by
+        stores that persist appended rows.
+        """
+        if len(rows) == 0:
+            return
+        with self.lock:
+            index = self.indexes[name]
+            rows = rows.set_axis(pd.RangeIndex(len(rows)) + self._next_label(index.df))
+            self.indexes[name] = index.appended(rows)
+            self.kpis.update(name, rows)
+            if name == 'metrics':
+                self.okrs.update(rows)
+            if name == 'topics' and self.topic_times is not None:
+                self.topic_times.update(rows)
+            if name in self.lifecycles:
+                self.lifecycles[name].update(rows)
+            self.search.update(name, rows, rows.index)
+            self.versions[name] += 1
+
+    @staticmethod
+    def _next_label(df):
+        return int(df.index.max()) + 1 if len(df) else 0
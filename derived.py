@@ -0,0 +1,37 @@
+"""
+Common base of the in-memory indexes derived from the tables
+The KPI cube, topic cube, lifecycle indexes and search index answer
+queries from arrays built out of the rows they are derived from.
+Appends rebuild (or merge into) those arrays while other sessions query, so
+the arrays are published together as one immutable snapshot
+"""
+
+import pandas as pd
+
+
+def concat_chunks(parts):
+    """One frame of ``parts`` (e.g. one per ``store.chunks`` chunk), without copying a single part."""
+    return pd.concat(parts) if len(parts) > 1 else parts[0]
+
+
+class DerivedIndex:
+    """Index whose query arrays are swapped in as one tuple, ``_state``.
+
+    Subclasses return every array a query reads from ``_build`` and call
+    ``_refresh`` after changing the rows it reads, or, when they merge new
+    rows into the current arrays, assign the merged tuple to ``_state``
+    themselves. The tuple is replaced with
+    a single attribute assignment and every query reads ``self._state`` once
+    and unpacks it, so a query running while another thread appends sees
+    either the old or the new version of the whole index, never a mix of
+    the two, without taking the appender's lock.
+    """
+
+    _state = None
+
+    def _build(self):
+        """The query arrays of the current rows, as one tuple."""
+        raise NotImplementedError
+
+    def _refresh(self):
+        self._state = self._build()
@@ -0,0 +1,194 @@
+"""
+Shared LRU cache of built dashboard figures
+Section builders' results are stored as serialized Plotly JSON, keyed by
+(data files, section, selected report, date range, data version), in one size-bounded
+LRU shared by every session of the process and optionally mirrored to a
+local directory so a restarted server starts warm. Hits and misses are
+counted per section in the instrumentation registry
+"""
+
+import functools
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import plotly.graph_objects as go
+import plotly.io
+
+from instrumentation import REGISTRY, timer
+
+MAX_BYTES = 64 * 2 ** 20        # serialized figures kept in memory
+MAX_DISK_BYTES = 512 * 2 ** 20  # ...and in the optional disk store
+
+
+def cache_key(section, *args):
+    """Stable key of a section and its arguments (report, dates, data version, ...)."""
+    spec = json.dumps([section, *args], default=str, separators=(",", ":"))
+    return hashlib.sha256(spec.encode()).hexdigest()
+
+
+def data_identity(directory, paths):
+    """The resolved ``directory`` and the (path, modification time, size) of each existing file in ``paths``.
+
+    Data versions restart at zero with the process, so keys that outlive it
+    (the disk store) also need this to tell one dataset from another.
+    """
+    files = []
+    for path in sorted(paths):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        files.append((os.path.relpath(os.path.realpath(path), os.path.realpath(directory)), stat.st_mtime_ns,
+                      stat.st_size))
+    return os.path.realpath(directory), files
+
+
+def dumps(result):
+    """JSON document of a builder's result: figures, plain values, or a tuple of them."""
+    items = result if isinstance(result, tuple) else (result,)
+    encoded = []
+    for item in items:
+        if isinstance(item, go.Figure):
+            encoded.append({"figure": plotly.io.to_json(item, validate=False)})
+        elif item is None or isinstance(item, (str, int, float, bool)):
+            encoded.append({"value": item})
+        else:
+            raise TypeError(f"cannot cache a {type(item).__name__} as JSON")
+    return json.dumps({"tuple": isinstance(result, tuple), "items": encoded})
+
+
+def loads(document):
+    """A builder's result from ``dumps``; figures come back as plain dicts, which ``st.plotly_chart`` takes."""
+    stored = json.loads(document)
+    items = tuple(json.loads(item["figure"]) if "figure" in item else item["value"] for item in stored["items"])
+    return items if stored["tuple"] else items[0]
+
+
+class FigureCache:
+    """Thread-safe LRU of serialized results, bounded by their total size in bytes.
+
+    With ``directory``, every entry is also written there and entries missing
+    from memory are looked up on disk before they are rebuilt; the directory
+    is trimmed to ``max_disk_bytes``, oldest files first. ``namespace`` (e.g.
+    ``data_identity``) is part of every key, so entries of other data are
+    never served.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES, directory=None, max_disk_bytes=MAX_DISK_BYTES,
+                 registry=REGISTRY, namespace=None):
+        self.max_bytes = max_bytes
+        self.namespace = namespace
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.registry = registry
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()   # key -> JSON document, least recently used first
+        self.bytes = 0
+        self.counts = {"calls": 0, "hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self.disk = OrderedDict()      # key -> file size, oldest first
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            files = [entry for entry in os.scandir(directory) if entry.name.endswith(".json")]
+            for entry in sorted(files, key=lambda entry: entry.stat().st_mtime):
+                self.disk[entry.name[:-len(".json")]] = entry.stat().st_size
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _remember(self, key, document):
+        # Caller holds the lock
+        if key in self.entries:
+            self.bytes -= len(self.entries.pop(key))
+        if len(document) > self.max_bytes:
+            return
+        self.entries[key] = document
+        self.bytes += len(document)
+        while self.bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= len(evicted)
+            self.counts["evictions"] += 1
+
+    def get(self, key):
+        """The cached document of ``key`` (memory first, then disk), or None."""
+        with self.lock:
+            document = self.entries.get(key)
+            if document is not None:
+                self.entries.move_to_end(key)
+                return document
+            on_disk = key in self.disk
+        if not on_disk:
+            return None
+        try:
+            with open(self._path(key)) as f:
+                document = f.read()
+        except OSError:
+            return None
+        with self.lock:
+            self.counts["disk_hits"] += 1
+            self._remember(key, document)
+        return document
+
+    def put(self, key, document):
+        with self.lock:
+            self._remember(key, document)
+        if not self.directory:
+            return
+        path = self._path(key)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(document)
+        os.replace(tmp, path)
+        with self.lock:
+            self.disk.pop(key, None)
+            self.disk[key] = len(document)
+            stale = []
+            total = sum(self.disk.values())
+            while total > self.max_disk_bytes and len(self.disk) > 1:
+                old, size = self.disk.popitem(last=False)
+                stale.append(old)
+                total -= size
+        for old in stale:
+            try:
+                os.remove(self._path(old))
+            except OSError:
+                pass
+
+    def cached(self, fn):
+        """Decorate a section builder so its result is cached under its name and arguments.
+
+        Misses are counted and timed as ``build:<name>`` like the other section
+        caches. Concurrent misses of one key may both build; the last one is kept.
+        """
+        label = fn.__name__
+
+        @functools.wraps(fn)
+        def call(*args):
+            key = cache_key(label, self.namespace, *args)
+            self.registry.increment("cache_calls", label)
+            document = self.get(key)
+            with self.lock:
+                self.counts["calls"] += 1
+                self.counts["hits" if document is not None else "misses"] += 1
+            if document is None:
+                self.registry.increment("cache_misses", label)
+                with timer(f"build:{label}", self.registry):
+                    document = dumps(fn(*args))
+                self.put(key, document)
+            return loads(document)
+
+        return call
+
+    def stats(self):
+        """Calls, hits (memory and disk), misses, evictions, entries and bytes held."""
+        with self.lock:
+            stats = dict(self.counts, entries=len(self.entries), bytes=self.bytes)
+        stats["hit_rate"] = stats["hits"] / stats["calls"] if stats["calls"] else 0.0
+        return stats
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
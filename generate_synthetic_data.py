@@ -1,13 +1,21 @@
 """
 Generate synthetic dataset for 1:1 conversation dashboard POC
 Based on insights from Sarah's meetings with Alex and Javier
+
+Run with ``--scale`` to stream a large, seeded dataset (N managers, thousands
+of direct reports, years of weekly meetings) for load testing the dashboard.
 """
 
+import argparse
+import os
+
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import json
 
+import storage
+
 # Set random seed for reproducibility
 np.random.seed(42)
 
@@ -173,30 +181,434 @@ communication = [
     {"meeting_date": "2025-10-07", "direct_report": "Javier Morales", "manager_questions": 13, "dr_questions": 3, "dr_hedge_words": 28, "dr_avg_response_length": 58},
 ]
 
-# Convert to DataFrames and save as CSV
-df_meetings = pd.DataFrame(meetings)
-df_topics = pd.DataFrame(topics)
-df_action_items = pd.DataFrame(action_items)
-df_metrics = pd.DataFrame(metrics)
-df_blockers = pd.DataFrame(blockers)
-df_growth_areas = pd.DataFrame(growth_areas)
-df_communication = pd.DataFrame(communication)
-
-# Save to CSV
-df_meetings.to_csv('data_meetings.csv', index=False)
-df_topics.to_csv('data_topics.csv', index=False)
-df_action_items.to_csv('data_action_items.csv', index=False)
-df_metrics.to_csv('data_metrics.csv', index=False)
-df_blockers.to_csv('data_blockers.csv', index=False)
-df_growth_areas.to_csv('data_growth_areas.csv', index=False)
-df_communication.to_csv('data_communication.csv', index=False)
-
-print("[SUCCESS] Synthetic dataset generated successfully!")
-print("\nDatasets created:")
-print(f"  - data_meetings.csv ({len(df_meetings)} rows)")
-print(f"  - data_topics.csv ({len(df_topics)} rows)")
-print(f"  - data_action_items.csv ({len(df_action_items)} rows)")
-print(f"  - data_metrics.csv ({len(df_metrics)} rows)")
-print(f"  - data_blockers.csv ({len(df_blockers)} rows)")
-print(f"  - data_growth_areas.csv ({len(df_growth_areas)} rows)")
-print(f"  - data_communication.csv ({len(df_communication)} rows)")
+
+# ===== 8. ORG CHART =====
+org = [
+    {"person": "Sarah Chen", "manager": None},
+    {"person": "Alex Rodriguez", "manager": "Sarah Chen"},
+    {"person": "Javier Morales", "manager": "Sarah Chen"},
+]
+
+
+# ===== 9. SCALED DATASET (load testing) =====
+# Catalogs used to synthesise realistic rows for N managers x M direct reports.
+# Each role carries its own topics, action items, blockers and OKRs so the
+# generated tables stay consistent with each other.
+FIRST_NAMES = [
+    "Alex", "Javier", "Priya", "Mei", "Omar", "Sofia", "Liam", "Aisha",
+    "Noah", "Elena", "Kenji", "Fatima", "Lucas", "Chloe", "Mateo", "Hana",
+    "Ethan", "Amara", "Diego", "Ingrid", "Ravi", "Zoe", "Tariq", "Lena",
+    "Marco", "Yara", "Felix", "Nadia", "Hugo", "Ines", "Samuel", "Leila",
+    "Daniel", "Maya", "Arjun", "Clara", "Jonas", "Aaliyah", "Tomas", "Erin",
+    "Kwame", "Rosa", "Viktor", "Naomi", "Pablo", "Sana", "Oscar", "Julia",
+]
+LAST_NAMES = [
+    "Rodriguez", "Morales", "Chen", "Patel", "Nguyen", "Kim", "Okafor", "Silva",
+    "Novak", "Haddad", "Tanaka", "Johansson", "Garcia", "Muller", "Rossi", "Khan",
+    "Dubois", "Mensah", "Kowalski", "Ivanova", "Larsen", "Costa", "Fischer", "Sato",
+    "Adeyemi", "Moreau", "Schmidt", "Lopez", "Andersen", "Hassan", "Park", "Romero",
+    "Yilmaz", "Bauer", "Oliveira", "Nakamura", "Bianchi", "Eriksen", "Singh", "Walsh",
+    "Petrov", "Alvarez", "Lindqvist", "Mwangi", "Fernandez", "Weber", "Ito", "Brennan",
+]
+
+ROLE_PROFILES = {
+    "Product Manager": {
+        "topics": ["Mobile Redesign", "Feature Prioritization", "OKR Progress", "API Integration",
+                   "Career Development", "Search Feature Adoption", "Stakeholder Management",
+                   "Q4 Planning", "Performance Issues", "Roadmap Review"],
+        "actions": ["Create prioritization scoring model", "Follow up with API vendor",
+                    "Design UI mockups for search filters", "A/B test search feature variations",
+                    "Draft Q4 OKRs", "Present Q4 plan to leadership", "Finalize Q4 presentation deck",
+                    "Run customer discovery interviews", "Update product roadmap"],
+        "blockers": ["Feature request overload", "API vendor unresponsive", "Data science team capacity",
+                     "Search feature plateau", "Android performance issues", "Unclear executive priorities"],
+        "metrics": [("User Engagement Increase", 15.0, "%"), ("Search Feature Adoption", 25.0, "%"),
+                    ("Customer Satisfaction", 90.0, "%"), ("Weekly Active Users", 50.0, "k users")],
+    },
+    "QA Lead": {
+        "topics": ["Test Automation", "Quality Metrics", "Bug Analysis", "Hiring", "Career Development",
+                   "Flaky Tests", "Tooling Evaluation", "Release Readiness", "Regression Strategy"],
+        "actions": ["Send automation roadmap Confluence link", "Send certification proposal",
+                    "Add checkout bug to regression suite", "Complete final interviews for QA hire",
+                    "Reduce flaky test count by 30%", "Evaluate Playwright vs Cypress",
+                    "Finalize QA hire offer", "Document shift-left testing strategy"],
+        "blockers": ["Automation timeline unclear", "Frontend technical debt", "Checkout bug edge case",
+                     "Flaky tests undermining CI/CD", "Tooling evaluation paralysis", "Test environment instability"],
+        "metrics": [("Code Coverage", 85.0, "%"), ("P0 User Flow Coverage", 95.0, "%"),
+                    ("API Test Suite Size", 200.0, "tests"), ("Automated Regression Share", 70.0, "%")],
+    },
+    "Software Engineer": {
+        "topics": ["Code Review Backlog", "Technical Debt", "On-call Load", "System Design",
+                   "Career Development", "Incident Follow-up", "Migration Plan", "Pairing",
+                   "Performance Issues"],
+        "actions": ["Write design doc for service split", "Pair with new hire on onboarding tasks",
+                    "Fix top three on-call alerts", "Prepare incident postmortem",
+                    "Upgrade framework dependencies", "Add tracing to checkout service",
+                    "Benchmark database migration"],
+        "blockers": ["Waiting on infra approval", "Unclear service ownership", "Slow CI pipeline",
+                     "Legacy code without tests", "Pager fatigue"],
+        "metrics": [("Deploy Frequency", 10.0, "deploys/wk"), ("PR Review Turnaround", 90.0, "%"),
+                    ("Service Uptime", 99.0, "%")],
+    },
+    "Data Analyst": {
+        "topics": ["Dashboard Requests", "Data Quality", "Experiment Analysis", "Stakeholder Management",
+                   "Career Development", "SQL Performance", "Metric Definitions", "Tooling Evaluation"],
+        "actions": ["Publish experiment readout", "Document metric definitions",
+                    "Automate weekly KPI report", "Audit event tracking", "Optimise slow dashboard queries",
+                    "Present churn analysis to leadership"],
+        "blockers": ["Missing tracking events", "Warehouse cost limits", "Conflicting metric definitions",
+                     "Ad-hoc request overload"],
+        "metrics": [("Report Automation Coverage", 80.0, "%"), ("Data Quality Score", 95.0, "%"),
+                    ("Experiments Analysed", 12.0, "experiments")],
+    },
+    "Designer": {
+        "topics": ["Design System", "User Research", "Mobile Redesign", "Accessibility",
+                   "Career Development", "Stakeholder Management", "Prototype Review"],
+        "actions": ["Run usability test on onboarding flow", "Publish design system tokens",
+                    "Audit colour contrast issues", "Share research synthesis", "Prepare design critique deck"],
+        "blockers": ["Research participant recruiting", "Engineering capacity for polish",
+                     "Inconsistent component library", "Late stakeholder feedback"],
+        "metrics": [("Design System Adoption", 75.0, "%"), ("Accessibility Compliance", 95.0, "%"),
+                    ("Task Success Rate", 85.0, "%")],
+    },
+}
+
+GROWTH_CATALOG = [
+    ("Strategic Thinking", "Q4 planning ownership, competitive analysis"),
+    ("Stakeholder Management", "Prioritization framework, 'Crucial Conversations' book"),
+    ("Saying No", "Coaching from manager, scoring model"),
+    ("Executive Communication", "Leadership presentation upcoming"),
+    ("Cloud Security Certification", "Researching programs"),
+    ("Performance Engineering", "K6 evaluation, load testing"),
+    ("Outcome-focused Communication", "Manager coaching on metrics"),
+    ("Mentoring", "Onboarding buddy for new hire"),
+    ("Technical Leadership", "Leading design reviews"),
+    ("Public Speaking", "Internal tech talk proposal"),
+]
+
+PRIORITIES = np.array(["High", "Medium", "Low"], dtype=object)
+PRIORITY_WEIGHTS = [0.45, 0.40, 0.15]
+SEVERITY_WEIGHTS = [0.40, 0.45, 0.15]
+MEETING_ATTENDANCE = 0.9  # share of weekly 1:1 slots that actually happen
+
+ROLE_NAMES = np.array(list(ROLE_PROFILES), dtype=object)
+
+
+def _person_name(i):
+    """Deterministic unique full name for person index ``i``."""
+    n_first, n_last = len(FIRST_NAMES), len(LAST_NAMES)
+    block, generation = i % (n_first * n_last), i // (n_first * n_last)
+    first = FIRST_NAMES[block % n_first]
+    last = LAST_NAMES[(block // n_first + block) % n_last]
+    return f"{first} {last}" + (f" {generation + 1}" if generation else "")
+
+
+def _pool(key):
+    """Flatten a per-role catalog into (values, offsets, sizes) lookup arrays."""
+    lists = [ROLE_PROFILES[role][key] for role in ROLE_NAMES]
+    sizes = np.array([len(items) for items in lists])
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    values = np.empty(sizes.sum(), dtype=object)
+    values[:] = [item for items in lists for item in items]
+    return values, offsets, sizes
+
+
+def _pick(rng, pool, role_idx):
+    """Pick one catalog entry per row, restricted to that row's role."""
+    values, offsets, sizes = pool
+    draws = rng.integers(0, 1 << 30, len(role_idx)) % sizes[role_idx]
+    return values[offsets[role_idx] + draws]
+
+
+def _choose_without_replacement(rng, n_rows, pool_sizes, counts):
+    """For each row pick ``counts[i]`` distinct slots out of ``pool_sizes[i]``."""
+    keys = rng.random((n_rows, pool_sizes.max()))
+    keys[np.arange(pool_sizes.max()) >= pool_sizes[:, None]] = np.inf
+    order = np.argsort(keys, axis=1)
+    counts = np.minimum(counts, pool_sizes)
+    rows = np.repeat(np.arange(n_rows), counts)
+    cols = order[rows, np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)]
+    return rows, cols
+
+
+def _resolution(rng, start_dates, as_of, scale_days):
+    """Decide which lifecycles have closed by ``as_of`` and when."""
+    age = (as_of - start_dates).astype(int)
+    closed = rng.random(len(start_dates)) < 1 - np.exp(-age / scale_days)
+    lag = rng.integers(1, int(scale_days) + 1, len(start_dates))
+    closed_date = np.minimum(start_dates + lag, as_of).astype('datetime64[ns]')
+    closed_date[~closed] = np.datetime64('NaT')
+    return closed, closed_date
+
+
+TOPIC_POOL = _pool("topics")
+ACTION_POOL = _pool("actions")
+BLOCKER_POOL = _pool("blockers")
+METRIC_POOL = _pool("metrics")
+
+
+def generate_chunk(rng, first_report, n_reports, n_reports_total, reports_per_manager, weeks, start):
+    """Generate all seven tables for direct reports ``first_report .. first_report + n_reports``."""
+    start = np.datetime64(start, 'D')
+    as_of = start + weeks * 7
+    report_ids = np.arange(first_report, first_report + n_reports)
+    names = np.array([_person_name(i) for i in report_ids], dtype=object)
+    first_names = np.array([name.split()[0] for name in names], dtype=object)
+    manager_first = np.array(
+        [_person_name(n_reports_total + i // reports_per_manager).split()[0] for i in report_ids],
+        dtype=object)
+    roles = rng.integers(0, len(ROLE_NAMES), n_reports)
+
+    # Meetings: weekly slots, some skipped, sentiment as a per-report random walk
+    held = rng.random((n_reports, weeks)) < MEETING_ATTENDANCE
+    m_report, m_week = np.nonzero(held)
+    m_dates = start + m_week * 7 + rng.integers(0, 5, len(m_week))
+    walk = (np.cumsum(rng.normal(0, 0.04, (n_reports, weeks)), axis=1)
+            + rng.normal(0.55, 0.1, (n_reports, 1)))
+    sentiment = np.clip(walk[m_report, m_week], 0.05, 0.95).round(2)
+    m_role = roles[m_report]
+    n_meetings = len(m_report)
+
+    meetings = pd.DataFrame({
+        "date": m_dates.astype('datetime64[ns]'),
+        "direct_report": names[m_report],
+        "role": ROLE_NAMES[m_role],
+        "duration_mins": rng.integers(30, 66, n_meetings),
+        "sentiment_score": sentiment,
+    })
+
+    # Topics: 2-5 per meeting drawn from the role's catalog
+    t_meet = np.repeat(np.arange(n_meetings), rng.integers(2, 6, n_meetings))
+    topics = pd.DataFrame({
+        "meeting_date": meetings["date"].values[t_meet],
+        "direct_report": names[m_report[t_meet]],
+        "topic": _pick(rng, TOPIC_POOL, m_role[t_meet]),
+        "time_spent_mins": rng.integers(5, 26, len(t_meet)),
+        "priority": rng.choice(PRIORITIES, len(t_meet), p=PRIORITY_WEIGHTS),
+    }).drop_duplicates(["meeting_date", "direct_report", "topic"])
+
+    # Action items: completion probability grows with age
+    a_meet = np.repeat(np.arange(n_meetings), rng.poisson(1.5, n_meetings))
+    a_created = m_dates[a_meet]
+    a_done, a_completed = _resolution(rng, a_created, as_of, 21)
+    a_status = np.where(a_done, "Completed",
+                        np.where(rng.random(len(a_meet)) < 0.5, "In Progress", "Pending"))
+    a_owner = np.where(rng.random(len(a_meet)) < 0.85,
+                       first_names[m_report[a_meet]], manager_first[m_report[a_meet]])
+    action_items = pd.DataFrame({
+        "created_date": a_created.astype('datetime64[ns]'),
+        "direct_report": names[m_report[a_meet]],
+        "action": _pick(rng, ACTION_POOL, m_role[a_meet]),
+        "owner": a_owner,
+        "status": a_status,
+        "completed_date": a_completed,
+    })
+
+    # Metrics: 2-4 OKRs per report, one reading per meeting trending towards target
+    metric_values, metric_offsets, metric_sizes = METRIC_POOL
+    p_report, p_slot = _choose_without_replacement(
+        rng, n_reports, metric_sizes[roles], rng.integers(2, 5, n_reports))
+    p_entry = metric_values[metric_offsets[roles[p_report]] + p_slot]
+    pairs = pd.DataFrame({
+        "report": p_report,
+        "pair": np.arange(len(p_report)),
+    }).merge(pd.DataFrame({"report": m_report, "meeting": np.arange(n_meetings)}), on="report")
+    pair_idx, meet_idx = pairs["pair"].values, pairs["meeting"].values
+    targets = np.array([entry[1] for entry in p_entry])
+    start_ratio = rng.uniform(0.5, 0.95, len(p_entry))
+    end_ratio = rng.uniform(0.85, 1.15, len(p_entry))
+    progress = m_week[meet_idx] / max(weeks - 1, 1)
+    ratio = start_ratio[pair_idx] + (end_ratio[pair_idx] - start_ratio[pair_idx]) * progress
+    actual = targets[pair_idx] * (ratio + rng.normal(0, 0.015, len(pair_idx)))
+    metrics = pd.DataFrame({
+        "date": meetings["date"].values[meet_idx],
+        "direct_report": names[m_report[meet_idx]],
+        "metric": np.array([entry[0] for entry in p_entry], dtype=object)[pair_idx],
+        "target": targets[pair_idx],
+        "actual": actual.round(1),
+        "unit": np.array([entry[2] for entry in p_entry], dtype=object)[pair_idx],
+    })
+
+    # Blockers: occasional, resolved more slowly than action items
+    b_meet = np.repeat(np.arange(n_meetings), rng.poisson(0.35, n_meetings))
+    b_first = m_dates[b_meet]
+    b_resolved, b_resolved_date = _resolution(rng, b_first, as_of, 28)
+    blockers = pd.DataFrame({
+        "first_mentioned": b_first.astype('datetime64[ns]'),
+        "direct_report": names[m_report[b_meet]],
+        "blocker": _pick(rng, BLOCKER_POOL, m_role[b_meet]),
+        "severity": rng.choice(PRIORITIES, len(b_meet), p=SEVERITY_WEIGHTS),
+        "status": np.where(b_resolved, "Resolved", "Active"),
+        "resolved_date": b_resolved_date,
+    })
+
+    # Growth areas: 2-4 static development areas per report
+    g_report, g_slot = _choose_without_replacement(
+        rng, n_reports, np.full(n_reports, len(GROWTH_CATALOG)), rng.integers(2, 5, n_reports))
+    growth_areas = pd.DataFrame({
+        "direct_report": names[g_report],
+        "area": np.array([area for area, _ in GROWTH_CATALOG], dtype=object)[g_slot],
+        "progress_level": rng.choice(np.arange(1, 6), len(g_report), p=[0.3, 0.3, 0.2, 0.15, 0.05]),
+        "activities": np.array([activity for _, activity in GROWTH_CATALOG], dtype=object)[g_slot],
+    })
+
+    # Communication: hedge words track (inverse) sentiment
+    hedge = np.clip((1 - sentiment) * 40 + rng.normal(0, 4, n_meetings), 0, None).round()
+    communication = pd.DataFrame({
+        "meeting_date": meetings["date"].values,
+        "direct_report": names[m_report],
+        "manager_questions": rng.integers(6, 17, n_meetings),
+        "dr_questions": rng.integers(0, 9, n_meetings),
+        "dr_hedge_words": hedge.astype(int),
+        "dr_avg_response_length": rng.integers(35, 71, n_meetings),
+    })
+
+    return {
+        "meetings": meetings,
+        "topics": topics,
+        "action_items": action_items,
+        "metrics": metrics,
+        "blockers": blockers,
+        "growth_areas": growth_areas,
+        "communication": communication,
+    }
+
+
+class CsvChunkWriter:
+    """Append generated chunks to the ``data_<table>.csv`` files without holding them in memory."""
+
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        self.rows = {}
+        os.makedirs(out_dir, exist_ok=True)
+
+    def write(self, name, df):
+        path = os.path.join(self.out_dir, f"data_{name}.csv")
+        first = name not in self.rows
+        df.to_csv(path, mode='w' if first else 'a', header=first, index=False, date_format='%Y-%m-%d')
+        self.rows[name] = self.rows.get(name, 0) + len(df)
+
+    def close(self):
+        return self.rows
+
+
+def org_chart(managers, reports_per_manager, managers_per_department=10):
+    """Reporting lines of the scaled org: reports -> managers -> department heads -> one head of org.
+
+    People are numbered reports first, then managers, department heads and
+    the head of the org, matching the names used in ``generate_chunk``.
+    """
+    n_reports = managers * reports_per_manager
+    n_departments = -(-managers // managers_per_department)
+    head = n_reports + managers + n_departments
+    people = np.arange(head + 1)
+    bosses = np.concatenate([
+        n_reports + np.arange(n_reports) // reports_per_manager,
+        n_reports + managers + np.arange(managers) // managers_per_department,
+        np.full(n_departments, head),
+    ])
+    return pd.DataFrame({
+        "person": [_person_name(i) for i in people],
+        "manager": [_person_name(i) for i in bosses] + [None],
+    })
+
+
+def generate_scaled_dataset(out_dir, managers=10, reports_per_manager=8, weeks=52,
+                            start_date="2024-01-01", seed=42, chunk_size=500, fmt="csv",
+                            managers_per_department=10):
+    """Stream a synthetic org (``managers`` x ``reports_per_manager``) to disk chunk by chunk.
+
+    Only ``chunk_size`` direct reports are held in memory at a time and the
+    output is fully determined by ``seed``. The org chart groups managers
+    into departments of ``managers_per_department``.
+    """
+    rng = np.random.default_rng(seed)
+    n_reports = managers * reports_per_manager
+    writer = storage.ParquetChunkWriter(out_dir) if fmt == "parquet" else CsvChunkWriter(out_dir)
+    for first in range(0, n_reports, chunk_size):
+        chunk = generate_chunk(rng, first, min(chunk_size, n_reports - first), n_reports,
+                               reports_per_manager, weeks, start_date)
+        for name, df in chunk.items():
+            writer.write(name, df)
+    writer.write("org", org_chart(managers, reports_per_manager, managers_per_department))
+    return writer.close()
+
+
+def write_poc_dataset(out_dir=".", fmt="csv"):
+    """Write the hand-authored POC dataset (Sarah's meetings with Alex and Javier)."""
+    os.makedirs(out_dir, exist_ok=True)
+    # Convert to DataFrames and save as CSV
+    df_meetings = pd.DataFrame(meetings)
+    df_topics = pd.DataFrame(topics)
+    df_action_items = pd.DataFrame(action_items)
+    df_metrics = pd.DataFrame(metrics)
+    df_blockers = pd.DataFrame(blockers)
+    df_growth_areas = pd.DataFrame(growth_areas)
+    df_communication = pd.DataFrame(communication)
+    df_org = pd.DataFrame(org)
+
+    if fmt == "parquet":
+        frames = {
+            "meetings": df_meetings, "topics": df_topics, "action_items": df_action_items,
+            "metrics": df_metrics, "blockers": df_blockers, "growth_areas": df_growth_areas,
+            "communication": df_communication, "org": df_org,
+        }
+        for name, df in frames.items():
+            storage.write_table(df, name, out_dir)
+        return {name: len(df) for name, df in frames.items()}
+
+    # Save to CSV
+    df_meetings.to_csv(os.path.join(out_dir, 'data_meetings.csv'), index=False)
+    df_topics.to_csv(os.path.join(out_dir, 'data_topics.csv'), index=False)
+    df_action_items.to_csv(os.path.join(out_dir, 'data_action_items.csv'), index=False)
+    df_metrics.to_csv(os.path.join(out_dir, 'data_metrics.csv'), index=False)
+    df_blockers.to_csv(os.path.join(out_dir, 'data_blockers.csv'), index=False)
+    df_growth_areas.to_csv(os.path.join(out_dir, 'data_growth_areas.csv'), index=False)
+    df_communication.to_csv(os.path.join(out_dir, 'data_communication.csv'), index=False)
+    df_org.to_csv(os.path.join(out_dir, 'data_org.csv'), index=False)
+
+    return {
+        "meetings": len(df_meetings),
+        "topics": len(df_topics),
+        "action_items": len(df_action_items),
+        "metrics": len(df_metrics),
+        "blockers": len(df_blockers),
+        "growth_areas": len(df_growth_areas),
+        "communication": len(df_communication),
+        "org": len(df_org),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the synthetic 1:1 dashboard dataset")
+    parser.add_argument("--scale", action="store_true",
+                        help="generate a large parameterized dataset instead of the POC one")
+    parser.add_argument("--managers", type=int, default=10)
+    parser.add_argument("--reports-per-manager", type=int, default=8)
+    parser.add_argument("--managers-per-department", type=int, default=10,
+                        help="managers grouped under each department head in the org chart")
+    parser.add_argument("--weeks", type=int, default=52, help="weeks of weekly 1:1 history")
+    parser.add_argument("--start-date", default="2024-01-01")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=500,
+                        help="direct reports generated and written per chunk")
+    parser.add_argument("--out-dir", default=".")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv",
+                        help="write CSV files or typed Parquet files (requires pyarrow)")
+    args = parser.parse_args(argv)
+
+    if args.scale:
+        rows = generate_scaled_dataset(args.out_dir, args.managers, args.reports_per_manager,
+                                       args.weeks, args.start_date, args.seed, args.chunk_size,
+                                       args.format, args.managers_per_department)
+    else:
+        rows = write_poc_dataset(args.out_dir, args.format)
+
+    print("[SUCCESS] Synthetic dataset generated successfully!")
+    print("\nDatasets created:")
+    for name, count in rows.items():
+        print(f"  - data_{name}.{args.format} ({count} rows)")
+
+
+if __name__ == "__main__":
+    main()
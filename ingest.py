@@ -0,0 +1,80 @@
+"""
+Incremental ingestion of new 1:1 records
+CSV or JSONL files dropped into the incoming directory are typed with the
+storage schema and merged into the live DataStore without reloading it
+"""
+
+import os
+
+import pandas as pd
+
+import storage
+
+INCOMING_DIR = "incoming"
+EXTENSIONS = (".csv", ".jsonl")
+
+
+def table_for(filename):
+    """Table a dropped file belongs to, from its name (e.g. ``action_items_2025-10-14.csv``)."""
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    if stem.startswith("data_"):
+        stem = stem[len("data_"):]
+    for name in sorted(storage.TABLE_NAMES, key=len, reverse=True):
+        if stem == name or (stem.startswith(name) and stem[len(name)] in "_-."):
+            return name
+    return None
+
+
+def read_records(path, name):
+    """Parse one dropped file into a frame typed like table ``name``."""
+    if path.endswith(".jsonl"):
+        df = pd.read_json(path, lines=True, dtype=False, precise_float=True)
+    else:
+        df = pd.read_csv(path)
+    missing = [column for column in storage.TABLES[name] if column not in df.columns]
+    if missing:
+        raise ValueError(f"{os.path.basename(path)} is missing columns: {', '.join(missing)}")
+    return storage.coerce(df, name)
+
+
+class IncomingWatcher:
+    """Merges files that appear in ``directory`` into ``store``, each file exactly once.
+
+    Files are treated as immutable: write them under a temporary name
+    starting with ``.`` and rename when complete. Files the store has
+    already persisted (``store.ingested()``) are skipped after a restart.
+    """
+
+    def __init__(self, store, directory):
+        self.store = store
+        self.directory = directory
+        self.seen = store.ingested()
+        self.errors = {}
+
+    def pending(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            entry.name for entry in os.scandir(self.directory)
+            if entry.is_file() and not entry.name.startswith(".")
+            and entry.name.endswith(EXTENSIONS) and entry.name not in self.seen
+        )
+
+    def poll(self):
+        """Ingest new files; returns the number of rows appended per table."""
+        appended = {}
+        with self.store.lock:
+            for filename in self.pending():
+                self.seen.add(filename)
+                name = table_for(filename)
+                if name is None:
+                    self.errors[filename] = "file name does not start with a table name"
+                    continue
+                try:
+                    rows = read_records(os.path.join(self.directory, filename), name)
+                except (ValueError, OSError) as exc:
+                    self.errors[filename] = str(exc)
+                    continue
+                self.store.append(name, rows[self.store.columns(name)], source=filename)
+                appended[name] = appended.get(name, 0) + len(rows)
+        return appended
@@ -0,0 +1,140 @@
+"""
+Headless insights engine for 1:1 data
+Pure functions that turn the dashboard tables into KPI summaries, OKR
+statuses and strengths/concerns, plus a CLI that precomputes them for the
+whole team and every direct report in one process
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+import storage
+from datastore import DATE_COLUMNS, DataStore
+
+# Tables the insights don't use are read as just their index columns
+COLUMNS = {
+    **{name: [c for c in storage.TABLES[name] if c in ("direct_report", DATE_COLUMNS.get(name))]
+       for name in storage.TABLE_NAMES},
+    **storage.columns_for("kpi", "okr"),
+}
+
+
+def completion_rate(total_actions, completed_actions):
+    """Completed action items as a percentage (0 when there are none)."""
+    return (completed_actions / total_actions * 100) if total_actions > 0 else 0
+
+
+def average_sentiment(sentiment_sum, meetings):
+    return sentiment_sum / meetings if meetings else float('nan')
+
+
+def summarize(store, report=None, start=None, end=None):
+    """KPI summary of the selection; ``report=None`` is the whole team."""
+    kpis = store.kpis.query(report, start, end)
+    # Mean sentiment of the two most recent meetings, read from the date-sorted store
+    recent = store.latest('meetings', 2, report, start, end)['sentiment_score'].mean()
+    return summary_from(kpis, recent)
+
+
+def summary_from(kpis, recent):
+    """KPI summary from cube measures (see ``KpiCube.query``) and the recent mean sentiment."""
+    total_meetings = kpis['meetings']
+    return {
+        'total_meetings': total_meetings,
+        'total_actions': kpis['actions'],
+        'completed_actions': kpis['actions_completed'],
+        'completion_rate': completion_rate(kpis['actions'], kpis['actions_completed']),
+        'active_blockers': kpis['blockers_active'],
+        'avg_sentiment': average_sentiment(kpis['sentiment_sum'], total_meetings),
+        'recent_sentiment': recent,
+    }
+
+
+def strengths(summary):
+    """Strength statements supported by ``summary``."""
+    found = []
+    if summary['avg_sentiment'] > 0.55:
+        found.append("Positive overall team morale and engagement")
+    if summary['completion_rate'] >= 50:
+        found.append(f"Good action item follow-through ({summary['completion_rate']:.0f}%)")
+    if summary['active_blockers'] <= 3:
+        found.append("Manageable number of active blockers")
+    # Check for improving trends
+    if summary['total_meetings'] >= 2 and summary['recent_sentiment'] > summary['avg_sentiment']:
+        found.append("Recent meetings show improving sentiment")
+    return found
+
+
+def concerns(summary):
+    """Areas for attention raised by ``summary``."""
+    found = []
+    if summary['avg_sentiment'] < 0.45:
+        found.append("Meeting sentiment below neutral - investigate concerns")
+    if summary['completion_rate'] < 50:
+        found.append(f"Low action item completion rate ({summary['completion_rate']:.0f}%)")
+    if summary['active_blockers'] > 5:
+        found.append(f"High number of active blockers ({summary['active_blockers']}) may impact progress")
+    # Check for declining trends
+    if summary['total_meetings'] >= 2 and summary['recent_sentiment'] < summary['avg_sentiment'] - 0.1:
+        found.append("Recent meetings show declining sentiment")
+    return found
+
+
+def report_insights(store, report=None, start=None, end=None):
+    """Summary, strengths and concerns of one selection as a flat record."""
+    summary = summarize(store, report, start, end)
+    return {
+        'direct_report': "All" if report is None else report,
+        **summary,
+        'strengths': strengths(summary),
+        'concerns': concerns(summary),
+    }
+
+
+def compute_all(store, start=None, end=None):
+    """Insights for the whole team and each direct report, plus every OKR status.
+
+    Returns ``(reports, okrs)`` frames; the first row of ``reports`` is the team ("All").
+    """
+    reports = pd.DataFrame([report_insights(store, report, start, end)
+                            for report in [None] + store.reports()])
+    okrs = store.okr_snapshot(None, start, end)
+    return reports, okrs
+
+
+def write_insights(reports, okrs, out_dir, fmt="json"):
+    """Write both frames as ``insights_reports`` / ``insights_okrs`` files; returns the paths."""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for name, df in (("reports", reports), ("okrs", okrs)):
+        path = os.path.join(out_dir, f"insights_{name}.{fmt}")
+        if fmt == "parquet":
+            df.to_parquet(path, index=False)
+        else:
+            df.replace({np.nan: None}).to_json(path, orient="records", date_format="iso", indent=2)
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute 1:1 insights for the team and every direct report")
+    parser.add_argument("data_dir", nargs="?", default=".")
+    parser.add_argument("--out-dir", default="insights")
+    parser.add_argument("--format", choices=("json", "parquet"), default="json")
+    parser.add_argument("--start-date", default=None, help="first day of the window (YYYY-MM-DD)")
+    parser.add_argument("--end-date", default=None, help="last day of the window (YYYY-MM-DD)")
+    args = parser.parse_args(argv)
+
+    store = DataStore(storage.load_tables(args.data_dir, columns=COLUMNS))
+    reports, okrs = compute_all(store, args.start_date, args.end_date)
+    paths = write_insights(reports, okrs, args.out_dir, args.format)
+    print(f"[SUCCESS] Computed insights for {len(reports) - 1} direct reports:")
+    for path in paths:
+        print(f"  - {path}")
+
+
+if __name__ == "__main__":
+    main()
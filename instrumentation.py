@@ -0,0 +1,164 @@
+"""
+Lightweight hot-path instrumentation for the dashboard
+Process-wide timers and counters with no Streamlit dependency: named timers
+(count, total, last and max seconds), cache call/miss counters, JSON-lines
+event logging and a Prometheus text-format export
+"""
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+LOGGER = logging.getLogger("dashboard.perf")
+PREFIX = "dashboard"
+
+
+class Registry:
+    """Thread-safe timer statistics and counters, shared by every session in the process."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.timers = {}      # name -> [count, total, last, max] in seconds
+        self.counters = {}    # (metric, label) -> count
+
+    def observe(self, name, seconds):
+        with self.lock:
+            stats = self.timers.setdefault(name, [0, 0.0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = seconds
+            stats[3] = max(stats[3], seconds)
+
+    def increment(self, metric, label, n=1):
+        with self.lock:
+            self.counters[(metric, label)] = self.counters.get((metric, label), 0) + n
+
+    def timer_stats(self):
+        """Sorted (name, count, total s, last s, max s) per timer."""
+        with self.lock:
+            return sorted((name, *stats) for name, stats in self.timers.items())
+
+    def timer_rows(self):
+        """(name, count, last ms, mean ms, max ms) per timer, sorted by name."""
+        return [(name, count, last * 1000, total / count * 1000, peak * 1000)
+                for name, count, total, last, peak in self.timer_stats()]
+
+    def cache_rows(self):
+        """(function, calls, hits, misses) per tracked cache, sorted by function."""
+        with self.lock:
+            counters = dict(self.counters)
+        names = sorted({label for metric, label in counters if metric == "cache_calls"})
+        rows = []
+        for name in names:
+            calls = counters.get(("cache_calls", name), 0)
+            misses = counters.get(("cache_misses", name), 0)
+            rows.append((name, calls, max(calls - misses, 0), misses))
+        return rows
+
+    def prometheus(self, prefix=PREFIX):
+        """All metrics in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {prefix}_timer_seconds Wall time of instrumented dashboard steps.",
+            f"# TYPE {prefix}_timer_seconds summary",
+        ]
+        timers = self.timer_stats()
+        for name, count, total, _, _ in timers:
+            label = _label(name=name)
+            lines.append(f"{prefix}_timer_seconds_count{label} {count}")
+            lines.append(f"{prefix}_timer_seconds_sum{label} {total:.6f}")
+        lines += [
+            f"# HELP {prefix}_timer_seconds_max Slowest observation of each step.",
+            f"# TYPE {prefix}_timer_seconds_max gauge",
+        ]
+        for name, _, _, _, peak in timers:
+            lines.append(f"{prefix}_timer_seconds_max{_label(name=name)} {peak:.6f}")
+        lines += [
+            f"# HELP {prefix}_cache_requests_total Cached function calls by result.",
+            f"# TYPE {prefix}_cache_requests_total counter",
+        ]
+        for name, _, hits, misses in self.cache_rows():
+            lines.append(f"{prefix}_cache_requests_total{_label(function=name, result='hit')} {hits}")
+            lines.append(f"{prefix}_cache_requests_total{_label(function=name, result='miss')} {misses}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self.lock:
+            self.timers.clear()
+            self.counters.clear()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label(**labels):
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+REGISTRY = Registry()
+
+
+@contextmanager
+def timer(name, registry=REGISTRY):
+    """Time the enclosed block under ``name`` and log it as a JSON event."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        registry.observe(name, seconds)
+        if LOGGER.isEnabledFor(logging.INFO):
+            LOGGER.info(json.dumps({"event": "timer", "name": name, "ms": round(seconds * 1000, 3),
+                                    "ts": round(time.time(), 3)}))
+
+
+def track_cache(cache, name=None, registry=REGISTRY):
+    """Wrap a caching decorator (e.g. ``st.cache_data(...)``) to count calls and misses.
+
+    The function body only runs on a miss, so misses are counted (and timed
+    as ``build:<name>``) inside it; hits are calls minus misses.
+    """
+    def decorate(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def compute(*args, **kwargs):
+            registry.increment("cache_misses", label)
+            with timer(f"build:{label}", registry):
+                return fn(*args, **kwargs)
+
+        cached = cache(compute)
+
+        @functools.wraps(fn)
+        def call(*args, **kwargs):
+            registry.increment("cache_calls", label)
+            return cached(*args, **kwargs)
+
+        call.clear = getattr(cached, "clear", None)
+        return call
+
+    return decorate
+
+
+def log_to(path):
+    """Append timer events as JSON lines to ``path`` (idempotent per path)."""
+    path = os.path.abspath(path)
+    if any(getattr(handler, "baseFilename", None) == path for handler in LOGGER.handlers):
+        return
+    handler = logging.FileHandler(path)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    LOGGER.addHandler(handler)
+    LOGGER.setLevel(logging.INFO)
+    LOGGER.propagate = False
+
+
+def write_prometheus(path, registry=REGISTRY):
+    """Write the current metrics to ``path`` atomically (for a node-exporter textfile collector)."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(registry.prometheus())
+    os.replace(tmp, path)
@@ -0,0 +1,254 @@
+"""
+Interval index over action item and blocker lifecycles
+Each item is open from its start date (created / first mentioned) until its
+end date (completed / resolved; open-ended when missing). Start and end
+dates are kept as sorted arrays per direct report and for the whole team,
+so how many items were open at a date or during a window, and how old the
+open ones were, are a few binary searches however long the history is.
+Appended items are merged into the sorted arrays by binary search
+"""
+
+import numpy as np
+import pandas as pd
+
+from derived import DerivedIndex
+
+# (start, end) columns of each table's lifecycle
+LIFECYCLES = {
+    'action_items': ('created_date', 'completed_date'),
+    'blockers': ('first_mentioned', 'resolved_date'),
+}
+AGE_EDGES_DAYS = [7, 14, 30, 60, 90]   # lower bounds (in days open) of the age buckets after the first
+AGE_LABELS = ["< 1 week", "1-2 weeks", "2-4 weeks", "1-2 months", "2-3 months", "3+ months"]
+STEP_DAYS = 7                          # spacing of the burndown and aging points
+DAY = np.timedelta64(1, 'D')
+TEAM = None                            # key of the whole team's arrays
+EMPTY = np.empty(0, dtype='int64')
+
+
+def _instants(values):
+    return np.asarray(values, dtype='datetime64[ns]').astype('int64')
+
+
+def _nanoseconds(days):
+    return int(days * DAY / np.timedelta64(1, 'ns'))
+
+
+class Counts:
+    """Sorted instants, each standing for one item or ``weights`` items; counts those up to given instants."""
+
+    def __init__(self, values, weights=None):
+        self.values = values
+        self.running = None if weights is None else np.concatenate([[0], np.cumsum(weights)])
+
+    def count(self, instants, side='right'):
+        """Items at or before (``side='right'``) or strictly before (``'left'``) each instant."""
+        found = np.searchsorted(self.values, instants, side)
+        return found if self.running is None else self.running[found]
+
+
+class SortedPoints:
+    """Sorted instants per direct report and for the team."""
+
+    def __init__(self, by_report, team):
+        self.by_report = by_report
+        self.team = team
+
+    @classmethod
+    def build(cls, reports, values):
+        """Points of ``values``, the instants of items of ``reports`` (one name per value)."""
+        codes, names = pd.factorize(reports)
+        order = np.lexsort((values, codes))
+        bounds = np.searchsorted(codes[order], np.arange(len(names) + 1))
+        ordered = values[order]
+        by_report = {str(name): ordered[bounds[i]:bounds[i + 1]] for i, name in enumerate(names)}
+        return cls(by_report, np.sort(values))
+
+    def inserted(self, reports, values):
+        """New points with ``values`` merged in by binary search, leaving the existing arrays as they are."""
+        if len(values) == 0:
+            return self
+        added = SortedPoints.build(reports, values)
+        by_report = dict(self.by_report)
+        for name, new in added.by_report.items():
+            old = by_report.get(name, EMPTY)
+            by_report[name] = np.insert(old, np.searchsorted(old, new), new)
+        team = np.insert(self.team, np.searchsorted(self.team, added.team), added.team)
+        return SortedPoints(by_report, team)
+
+    def of(self, report):
+        """``Counts`` of one report's instants (``TEAM``: everyone's)."""
+        return Counts(self.team if report is TEAM else self.by_report.get(report, EMPTY))
+
+
+def _point_sets(chunks, start_col, end_col):
+    """(reports, instants) of the starts, the ends and, per age edge, the shifted starts and the ends
+    of the items open that long, over rows given as frames; and the (first start, last event) span.
+    """
+    parts = [([(np.empty(0, dtype=object), EMPTY)] * (2 + 2 * len(AGE_EDGES_DAYS)), None)]
+    for rows in chunks:
+        rows = rows[rows[start_col].notna().to_numpy()]
+        reports = rows['direct_report'].astype(str).to_numpy(dtype=object)
+        starts = _instants(rows[start_col])
+        ends = rows[end_col].to_numpy(dtype='datetime64[ns]')
+        closed = ~np.isnat(ends)
+        # An end before the start closes the item the day it opened
+        ends = np.maximum(ends.astype('int64'), starts)
+        lifetimes = np.where(closed, ends - starts, np.iinfo('int64').max)
+        sets = [(reports, starts), (reports[closed], ends[closed])]
+        for edge in AGE_EDGES_DAYS:
+            span = _nanoseconds(edge)
+            old = lifetimes > span
+            sets += [(reports[old], starts[old] + span), (reports[old & closed], ends[old & closed])]
+        last = max(starts.max(), ends[closed].max(initial=starts.max())) if len(starts) else None
+        parts.append((sets, (int(starts.min()), int(last)) if len(starts) else None))
+    sets = [(np.concatenate([part[0][i][0] for part in parts]), np.concatenate([part[0][i][1] for part in parts]))
+            for i in range(2 + 2 * len(AGE_EDGES_DAYS))]
+    return sets, _merge_spans(*(part[1] for part in parts))
+
+
+def _merge_spans(*spans):
+    spans = [span for span in spans if span is not None]
+    return (min(first for first, _ in spans), max(last for _, last in spans)) if spans else None
+
+
+def grouped_lifecycle(starts, ends, first=None, last=None):
+    """What ``LifecycleQueries._lifecycle`` returns, from items counted per start and per end instant.
+
+    ``starts`` and ``ends`` are frames sorted by the instant ``at`` with the
+    number of ``items`` and, for every ``AGE_EDGES_DAYS`` edge ``e``, how many
+    of them stayed open more than ``e`` days (``over_<e>``). Ends before the
+    start count at the start. ``first`` and ``last`` are the team's span.
+    """
+    start_at, end_at = _instants(pd.to_datetime(starts['at'])), _instants(pd.to_datetime(ends['at']))
+    shifted = [(Counts(start_at + _nanoseconds(edge), starts[f'over_{edge}'].to_numpy(dtype='int64')),
+                Counts(end_at, ends[f'over_{edge}'].to_numpy(dtype='int64')))
+               for edge in AGE_EDGES_DAYS]
+    span = (int(_instants(pd.Timestamp(first))), int(_instants(pd.Timestamp(last)))) \
+        if first is not None and not pd.isna(first) else None
+    return (Counts(start_at, starts['items'].to_numpy(dtype='int64')),
+            Counts(end_at, ends['items'].to_numpy(dtype='int64')), shifted, span)
+
+
+class LifecycleQueries:
+    """Point-in-time counts over the lifecycles that ``_lifecycle(report)`` describes.
+
+    ``_lifecycle`` returns the ``Counts`` of the report's (``TEAM``: everyone's)
+    starts and ends, for every ``AGE_EDGES_DAYS`` edge the ``Counts`` of the
+    shifted starts and ends of the items that stayed open that long (see
+    ``LifecycleIndex``), and the team's (first start, last event) span (None
+    when there are no items). Every query reads it once.
+    """
+
+    def _lifecycle(self, report):
+        raise NotImplementedError
+
+    @staticmethod
+    def _points(span, start, end, step):
+        """Instants every ``step`` days back from ``end`` (defaults: the first start and last event)."""
+        first, last = span or (0, 0)
+        first = _instants(pd.Timestamp(start)) if start is not None else first
+        last = _instants(pd.Timestamp(end)) if end is not None else last
+        step = _nanoseconds(step)
+        return np.arange(last, first - 1, -step)[::-1]
+
+    @staticmethod
+    def _open(lifecycle, at):
+        starts, ends, *_ = lifecycle
+        return starts.count(at) - ends.count(at)
+
+    @staticmethod
+    def _changes(lifecycle, lows, highs):
+        starts, ends, *_ = lifecycle
+        return starts.count(highs) - starts.count(lows), ends.count(highs) - ends.count(lows)
+
+    @staticmethod
+    def _ages(lifecycle, at):
+        starts, ends, shifted, _ = lifecycle
+        at_least = [starts.count(at) - ends.count(at)]
+        for starts_after, ends_after in shifted:
+            at_least.append(starts_after.count(at) - ends_after.count(at))
+        at_least = np.stack(at_least + [np.zeros_like(at_least[0])], axis=-1)
+        return at_least[..., :-1] - at_least[..., 1:]
+
+    def open_at(self, report=TEAM, instants=None):
+        """Items open at each instant (an array, or a single date)."""
+        return self._open(self._lifecycle(report), _instants(instants))
+
+    def open_during(self, report=TEAM, start=None, end=None):
+        """Items open at any time in [``start``, ``end``] (defaults: the first start and last event)."""
+        starts, ends, _, span = self._lifecycle(report)
+        first, last = span or (0, 0)
+        start = _instants(pd.Timestamp(start)) if start is not None else first
+        end = _instants(pd.Timestamp(end)) if end is not None else last
+        # Open then unless started after the window or ended by its start
+        return int(starts.count(end) - ends.count(start))
+
+    def changes(self, report=TEAM, lows=None, highs=None):
+        """(opened, closed) items within each window (lows, highs]."""
+        return self._changes(self._lifecycle(report), _instants(lows), _instants(highs))
+
+    def ages(self, report=TEAM, instants=None):
+        """Open items per age bucket at each instant, shaped (instants, ``AGE_LABELS``)."""
+        return self._ages(self._lifecycle(report), _instants(instants))
+
+    def burndown(self, report=TEAM, start=None, end=None, step=STEP_DAYS):
+        """Open items at every ``step``-day point, with the items opened and closed since the previous one."""
+        lifecycle = self._lifecycle(report)
+        points = self._points(lifecycle[3], start, end, step)
+        opened, closed = self._changes(lifecycle, points - _nanoseconds(step), points)
+        index = pd.Index(points.astype('datetime64[ns]'), name='date')
+        return pd.DataFrame({'open': self._open(lifecycle, points), 'opened': opened, 'closed': closed}, index=index)
+
+    def aging(self, report=TEAM, start=None, end=None, step=STEP_DAYS):
+        """Open items per age bucket at every ``step``-day point; rows are dates, columns ``AGE_LABELS``."""
+        lifecycle = self._lifecycle(report)
+        points = self._points(lifecycle[3], start, end, step)
+        return pd.DataFrame(self._ages(lifecycle, points), columns=pd.Index(AGE_LABELS, name='age'),
+                            index=pd.Index(points.astype('datetime64[ns]'), name='date'))
+
+
+class LifecycleIndex(LifecycleQueries, DerivedIndex):
+    """Open intervals [start, end) of a table's items, indexed for point-in-time counts.
+
+    An item counts as open at ``t`` when it started on or before ``t`` and
+    had not ended by then. For every age bucket edge ``e`` the index also
+    keeps the starts shifted by ``e`` of the items that stayed open that
+    long, since an item is open and at least ``e`` old at ``t`` exactly when
+    ``t`` lies in [start + e, end). Only these sorted instants are kept, not
+    the rows.
+    """
+
+    def __init__(self, rows, start_col, end_col):
+        self._load([rows], start_col, end_col)
+
+    @classmethod
+    def from_rows(cls, chunks, start_col, end_col):
+        """Index over rows given as an iterable of frames (e.g. ``store.chunks``)."""
+        index = cls.__new__(cls)
+        index._load(chunks, start_col, end_col)
+        return index
+
+    def _load(self, chunks, start_col, end_col):
+        self.start_col, self.end_col = start_col, end_col
+        sets, self.span = _point_sets(chunks, start_col, end_col)
+        self.points = [SortedPoints.build(reports, values) for reports, values in sets]
+        self._refresh()
+
+    def _build(self):
+        starts, ends, *shifted = self.points
+        return starts, ends, list(zip(shifted[::2], shifted[1::2])), self.span
+
+    def update(self, rows):
+        """Merge the lifecycles of newly appended ``rows`` into the sorted arrays."""
+        if len(rows) == 0:
+            return
+        sets, span = _point_sets([rows], self.start_col, self.end_col)
+        self.points = [points.inserted(reports, values) for points, (reports, values) in zip(self.points, sets)]
+        self.span = _merge_spans(self.span, span)
+        self._refresh()
+
+    def _lifecycle(self, report):
+        starts, ends, shifted, span = self._state
+        return (starts.of(report), ends.of(report),
+                [(starts_after.of(report), ends_after.of(report)) for starts_after, ends_after in shifted], span)
@@ -0,0 +1,95 @@
+"""
+Markdown builders for the dashboard's item lists
+Each list is assembled with vectorized string operations into one markdown
+block, from only the rows of the requested page (the stores select and rank
+them, e.g. ``store.active_blockers``) so the cost does not grow with the
+size of the selection
+"""
+
+import numpy as np
+
+import okr
+from search import TABLE_LABELS
+
+LIST_PAGE_SIZE = 10       # list items shown per page
+RECENT_ACTIONS = 5        # most recent action items listed
+TOPIC_SHIFTS = 5          # biggest emerging and fading topics listed
+
+STATUS_EMOJI = {"Completed": "✅", "In Progress": "🔄", "Pending": "⏳"}
+SEVERITY_COLOR = {'High': '🔴', 'Medium': '🟡', 'Low': '🟢'}
+PROGRESS_BARS = np.array(["▓" * level + "░" * (5 - level) for level in range(6)], dtype=object)
+
+
+def _text(series):
+    return series.astype(str).to_numpy(dtype=object)
+
+
+def _icons(series, icons):
+    return series.astype(str).map(icons).fillna('•').to_numpy(dtype=object)
+
+
+def _join(items):
+    return "\n\n".join(items)
+
+
+def recent_actions(action_items, n=RECENT_ACTIONS):
+    """The ``n`` most recently created action items, newest first."""
+    top = action_items.nlargest(n, 'created_date')
+    return _join(
+        _icons(top['status'], STATUS_EMOJI) + " **" + _text(top['action']) + "**  \n"
+        "   Owner: " + _text(top['owner']) + " | Created: " + _text(top['created_date'].dt.strftime('%b %d'))
+    )
+
+
+def active_blockers(top):
+    """A page of active blockers (``store.active_blockers``), in the given order."""
+    return _join(
+        _icons(top['severity'], SEVERITY_COLOR) + " **" + _text(top['blocker']) + "**  \n"
+        "   " + _text(top['direct_report']) + " | Since: " + _text(top['first_mentioned'].dt.strftime('%Y-%m-%d'))
+    )
+
+
+def development_focus(page):
+    """A page of growth areas, each with a five-step progress bar."""
+    bars = PROGRESS_BARS[np.clip(page['progress_level'].to_numpy(dtype='int64'), 0, 5)]
+    return _join(
+        "**" + _text(page['area']) + "** (" + _text(page['direct_report']) + ")  \n"
+        "   " + bars + " | " + _text(page['activities'])
+    )
+
+
+def topic_shifts(shifts, n=TOPIC_SHIFTS):
+    """The ``n`` biggest emerging and fading topics of ``TopicCube.shifts``, as share changes."""
+    moving = shifts[(shifts['trend'] != 'steady').to_numpy()].head(n)
+    icons = np.where(moving['trend'].to_numpy() == 'emerging', "📈", "📉").astype(object)
+    return _join(
+        icons + " **" + moving.index.astype(str).to_numpy(dtype=object) + "** " + _text(moving['trend'])
+        + "  \n   " + _text((moving['prior_share'] * 100).round().astype(int)) + "% → "
+        + _text((moving['recent_share'] * 100).round().astype(int)) + "% of discussion time"
+    )
+
+
+def at_risk_okrs(okrs, start=0, stop=LIST_PAGE_SIZE):
+    """OKRs of a status table (``okr.COLUMNS``) that are at risk, furthest below target first,
+    for rows [``start``, ``stop``)."""
+    page = okr.at_risk(okrs).iloc[start:stop]
+    unit = _text(page['unit'])
+    slope = page['slope_per_day'] * 7
+    # OKRs with too few readings for a slope have no trend, rather than a "+nan" one
+    weekly = np.where(slope.notna().to_numpy(), _text(slope.map("{:+.1f}".format)) + unit + "/week", "n/a")
+    reach = page['projected_date'].dt.strftime('%Y-%m-%d').fillna("not at this pace")
+    return _join(
+        "⚠ **" + _text(page['metric']) + "** (" + _text(page['direct_report']) + ")  \n"
+        "   " + _text(page['actual']) + unit + " of " + _text(page['target']) + unit
+        + " | Trend: " + weekly + " | Target by: " + _text(reach)
+    )
+
+
+def search_results(results):
+    """Search matches with their table, direct report and date, in the given order."""
+    dates = results['date'].dt.strftime('%Y-%m-%d').fillna("no date")
+    return _join(
+        "**" + _text(results['text']) + "**  \n"
+        "   " + _text(results['table'].map(TABLE_LABELS)) + " | " + _text(results['direct_report'])
+        + " | " + _text(dates)
+    )
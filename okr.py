@@ -0,0 +1,153 @@
+"""
+Materialized OKR status table
+One row per (direct_report, metric) with the latest reading, its gap to
+target and on-track flag, and a trend fitted over the last few readings
+(slope and projected date to reach the target). It is built once from the
+metrics table and updated incrementally as new metrics rows arrive, so
+status views never rescan the history
+"""
+
+import numpy as np
+import pandas as pd
+
+ON_TRACK_RATIO = 0.9       # an OKR below target is still on track at >= 90% of it
+TREND_POINTS = 4           # latest readings the trend slope is fitted over
+MAX_PROJECTION_DAYS = 3650 # projections further out than this are left empty
+KEYS = ['direct_report', 'metric']
+READING_COLUMNS = KEYS + ['date', 'actual', 'target', 'unit']
+COLUMNS = KEYS + ['date', 'actual', 'target', 'unit', 'gap', 'on_track',
+                  'slope_per_day', 'projected_date', 'trend_from', 'first_date']
+
+
+def on_track(actual, target):
+    """The OKR rule: at or above target, or within ``ON_TRACK_RATIO`` of it. Works on arrays."""
+    return (actual - target >= 0) | (actual / target >= ON_TRACK_RATIO)
+
+
+def _readings(metrics):
+    """Plain-typed metrics readings, each carrying its own date as ``first_date``."""
+    readings = pd.DataFrame({
+        column: metrics[column].astype(str).to_numpy() if column in ('direct_report', 'metric', 'unit')
+        else metrics[column].to_numpy()
+        for column in READING_COLUMNS
+    })
+    readings['first_date'] = readings['date']
+    return readings
+
+
+def _tail(readings, points):
+    """The last ``points`` readings of every key, date-ordered (stable) within each key.
+
+    Keys are grouped in order of their first reading within the report.
+    """
+    readings = readings.sort_values(['direct_report', 'date'], kind='stable', ignore_index=True)
+    groups = readings.groupby(KEYS, sort=False)
+    readings['first_date'] = groups['first_date'].transform('min')
+    readings = readings.iloc[np.argsort(groups.ngroup().to_numpy(), kind='stable')]
+    return readings.groupby(KEYS, sort=False).tail(points).reset_index(drop=True)
+
+
+def _summarize(tail):
+    """One status row per key of ``tail`` (rows grouped by key, date-ordered within it)."""
+    columns = {column: [] for column in COLUMNS}
+    if tail.empty:
+        return pd.DataFrame(columns)
+    key = tail.groupby(KEYS, sort=False).ngroup().to_numpy()
+    first = np.flatnonzero(np.diff(key, prepend=-1))
+    last = np.append(first[1:], len(key)) - 1
+    latest = tail.iloc[last].reset_index(drop=True)
+    dates = latest['date'].to_numpy()
+
+    # Least-squares slope of actual over days, with days counted back from the latest reading
+    x = (tail['date'].to_numpy() - dates[key]) / np.timedelta64(1, 'D')
+    y = tail['actual'].to_numpy(dtype='float64')
+    n = np.bincount(key).astype('float64')
+    sx, sy = np.bincount(key, weights=x), np.bincount(key, weights=y)
+    sxx, sxy = np.bincount(key, weights=x * x), np.bincount(key, weights=x * y)
+    spread = n * sxx - sx ** 2
+    slope = np.divide(n * sxy - sx * sy, spread, out=np.full(len(n), np.nan), where=spread > 0)
+
+    actual, target = latest['actual'].to_numpy(), latest['target'].to_numpy()
+    gap = actual - target
+    # Reached targets project to the latest reading; otherwise only an upward trend gets there
+    with np.errstate(divide='ignore', invalid='ignore'):
+        days_left = np.where(gap >= 0, 0.0, np.where(slope > 0, np.ceil(-gap / slope), np.nan))
+    days_left[days_left > MAX_PROJECTION_DAYS] = np.nan
+    projected = pd.Series(dates) + pd.to_timedelta(days_left, unit='D')
+
+    return latest.assign(
+        gap=gap,
+        on_track=on_track(actual, target),
+        slope_per_day=slope,
+        projected_date=projected.to_numpy(),
+        trend_from=tail['date'].to_numpy()[first],
+    )[COLUMNS]
+
+
+def _ordered(table, rank):
+    # By report, then by each metric's first reading; ties keep their ``rank``
+    keys = pd.DataFrame({'report': table['direct_report'].to_numpy(),
+                         'first': table['first_date'].to_numpy(), 'rank': rank})
+    order = keys.sort_values(['report', 'first', 'rank'], kind='stable').index.to_numpy()
+    return table.iloc[order].reset_index(drop=True)
+
+
+def at_risk(table):
+    """Rows of a status table that are not on track, furthest below target first."""
+    risky = table[~table['on_track'].to_numpy(dtype=bool)]
+    return risky.iloc[np.argsort((risky['actual'] / risky['target']).to_numpy(), kind='stable')]
+
+
+class OkrSnapshot:
+    """Status table of every (direct_report, metric), kept current as metrics rows arrive.
+
+    ``table`` has the ``COLUMNS`` above, ordered by report and then by each
+    metric's first reading. Only the last ``points`` readings of each key are
+    retained, which is all the trend needs, so ``update`` costs the new rows
+    plus the keys they touch rather than a rescan.
+    """
+
+    def __init__(self, metrics, points=TREND_POINTS):
+        self.points = points
+        self.tail = _tail(_readings(metrics), points)
+        table = _summarize(self.tail)
+        self.table = _ordered(table, np.arange(len(table)))
+
+    def update(self, rows):
+        """Fold new metrics ``rows`` (any order) into the snapshot."""
+        if len(rows) == 0:
+            return
+        new = _readings(rows)
+        touched = pd.MultiIndex.from_frame(new[KEYS])
+        stale = pd.MultiIndex.from_frame(self.tail[KEYS]).isin(touched)
+        tail = _tail(pd.concat([self.tail[stale], new], ignore_index=True), self.points)
+        summary = _summarize(tail)
+        # Updated keys keep their place among metrics first read on the same day
+        positions = pd.MultiIndex.from_frame(self.table[KEYS]).get_indexer(
+            pd.MultiIndex.from_frame(summary[KEYS]))
+        positions = np.where(positions >= 0, positions, len(self.table) + np.arange(len(summary)))
+        kept = np.setdiff1d(np.arange(len(self.table)), positions)
+        table = pd.concat([self.table.iloc[kept], summary], ignore_index=True)
+        # Readers only look at ``table``, which is swapped in last
+        self.tail = pd.concat([self.tail[~stale], tail], ignore_index=True)
+        self.table = _ordered(table, np.concatenate([kept, positions]))
+
+    def select(self, report=None, start=None, end=None):
+        """Status rows of ``report`` (all when None), or None if the date window changes them.
+
+        The table reflects the latest readings overall, so it answers a window
+        only when every reading its rows were computed from lies inside it.
+        """
+        table = self.table
+        if report is not None:
+            table = table[table['direct_report'].to_numpy() == report]
+        if start is not None and (table['trend_from'] < pd.Timestamp(start)).any():
+            return None
+        if end is not None and (table['date'] > pd.Timestamp(end)).any():
+            return None
+        return table
+
+
+def snapshot(metrics, points=TREND_POINTS):
+    """Status table of ``metrics`` computed from scratch."""
+    return OkrSnapshot(metrics, points).table
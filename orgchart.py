@@ -0,0 +1,247 @@
+"""
+Reporting hierarchy and bottom-up roll-ups for org-wide views
+Reads the optional ``org`` table (each person's manager) and pre-aggregates
+the KPI measures and the topic, priority and status counts of every
+manager's subtree once, level by level from the deepest managers up, so a
+team, department or whole-org view reads its own small aggregate instead of
+rescanning the rows of every report below it
+"""
+
+import numpy as np
+import pandas as pd
+
+import insights
+import storage
+from aggregates import KpiCube, daily_measures
+from datastore import DATE_COLUMNS
+
+ORG_ROOT = "Organization"    # top node added when the org chart has several roots
+# Per-value counts rolled up for the roll-up charts, as (table, column)
+COUNT_COLUMNS = [('topics', 'topic'), ('topics', 'priority'), ('action_items', 'status'), ('blockers', 'status')]
+ROLLUP_COLUMNS = storage.columns_for("kpi", "topics")
+ROLLUP_TABLES = list(ROLLUP_COLUMNS)
+
+
+class OrgTree:
+    """Reporting lines: each person's manager (``parent``), children and depth below the top.
+
+    People in ``reports`` without a line in the org chart are placed directly
+    under the top, so roll-ups always account for every row.
+    """
+
+    def __init__(self, edges, reports=()):
+        parent = {}
+        for person, manager in zip(edges['person'], edges['manager']):
+            parent[str(person)] = None if pd.isna(manager) or manager == "" else str(manager)
+        for manager in set(parent.values()) - set(parent) - {None}:
+            parent[manager] = None
+        roots = sorted(person for person, manager in parent.items() if manager is None)
+        if len(roots) == 1:
+            root = roots[0]
+        else:
+            root = ORG_ROOT
+            parent.update({person: ORG_ROOT for person in roots})
+            parent[ORG_ROOT] = None
+        for report in reports:
+            parent.setdefault(str(report), root)
+
+        children = {person: [] for person in parent}
+        for person, manager in parent.items():
+            if manager is not None:
+                children[manager].append(person)
+        # Depth-first from the top; whoever is never reached sits on a reporting cycle
+        order, depth, stack = [], {root: 0}, [root]
+        while stack:
+            person = stack.pop()
+            order.append(person)
+            for child in sorted(children[person], reverse=True):
+                depth[child] = depth[person] + 1
+                stack.append(child)
+        if len(order) != len(parent):
+            cycle = sorted(set(parent) - set(order))
+            raise ValueError(f"org chart has a reporting cycle through {', '.join(cycle[:5])}")
+
+        size = dict.fromkeys(order, 0)
+        for person in reversed(order):
+            if parent[person] is not None:
+                size[parent[person]] += size[person] + 1
+        self.parent, self.root, self.order = parent, root, order
+        self.children = {person: sorted(people) for person, people in children.items()}
+        self.depth, self.size = depth, size
+        # Roll-ups work on integer node ids (positions in ``order``; the top is 0)
+        self.ids = {person: i for i, person in enumerate(order)}
+        self.parent_ids = np.array([self.ids.get(parent[person], -1) for person in order], dtype='int64')
+        self.depths = np.array([depth[person] for person in order], dtype='int64')
+
+    @classmethod
+    def read(cls, data_dir=".", reports=()):
+        """The org chart stored in ``data_dir``, or None when there is none."""
+        if not storage.table_exists(data_dir, storage.ORG_TABLE):
+            return None
+        return cls(storage.read_table(storage.ORG_TABLE, data_dir), reports)
+
+    def managers(self):
+        """People with reports, top-down in depth-first order."""
+        return [person for person in self.order if self.children[person]]
+
+    def label(self, person):
+        """Indented name with the size of the person's organisation, for pickers."""
+        return f"{'· ' * self.depth[person]}{person} ({self.size[person]} people)"
+
+    def node_ids(self, people):
+        """Node id of each name in ``people``; rows of people missing from the chart count towards the top."""
+        codes, names = pd.factorize(people)
+        lookup = np.array([self.ids.get(str(name), 0) for name in names] + [0], dtype='int64')
+        return lookup[codes]
+
+    def roll_up(self, leaf):
+        """Rows of every person and manager from per-person ``leaf`` rows.
+
+        ``leaf`` is indexed by node id first (any further levels, e.g. day,
+        are kept). Managers are summed from their children one level at a
+        time, deepest first, so each level aggregates the smaller level below
+        it rather than every leaf row. People with rows of their own who also
+        manage others get their own rows plus their organisation's.
+        """
+        frame = leaf.to_frame() if isinstance(leaf, pd.Series) else leaf
+        # The levels after the node become one mixed-radix code, so each row has a single integer key
+        rest, width, labels = 0, 1, []
+        for level in range(1, leaf.index.nlevels):
+            codes, uniques = pd.factorize(leaf.index.get_level_values(level), sort=True)
+            rest, width = rest * len(uniques) + codes, width * len(uniques)
+            labels.append(uniques)
+        width = max(width, 1)
+        nodes = leaf.index.get_level_values(0).to_numpy()
+        values = frame.to_numpy(dtype='float64')
+        depths = self.depths[nodes]
+        keys, sums = [nodes * width + rest], [values]
+        carried_keys, carried = keys[0][:0], values[:0]
+        for level in range(depths.max(initial=0), 0, -1):
+            at_level = depths == level
+            child_keys = np.concatenate([keys[0][at_level], carried_keys])
+            parent_keys = self.parent_ids[child_keys // width] * width + child_keys % width
+            carried_keys, carried = _sum_by(parent_keys, np.concatenate([values[at_level], carried]))
+            keys.append(carried_keys)
+            sums.append(carried)
+        keys, sums = _sum_by(np.concatenate(keys), np.concatenate(sums))
+        order = np.argsort(keys, kind='stable')
+        keys, sums = keys[order], sums[order]
+
+        levels, rest = [], keys % width
+        for uniques in reversed(labels):
+            levels.insert(0, uniques.take(rest % len(uniques)))
+            rest = rest // len(uniques)
+        index = pd.MultiIndex.from_arrays([keys // width] + levels, names=leaf.index.names)
+        # Sums are taken in float64 (exact for counts); integer measures are handed back as int64
+        rolled = pd.DataFrame(sums, index=index, columns=frame.columns).astype(
+            {column: 'int64' for column, dtype in frame.dtypes.items() if pd.api.types.is_integer_dtype(dtype)})
+        return rolled.iloc[:, 0] if isinstance(leaf, pd.Series) else rolled
+
+
+def _sum_by(keys, values):
+    """Distinct ``keys`` and the column sums of ``values`` rows sharing each."""
+    codes, distinct = pd.factorize(keys)
+    sums = [np.bincount(codes, weights=column, minlength=len(distinct)) for column in values.T]
+    return distinct, np.column_stack(sums)
+
+
+def _day_counts(df, ids, date_col, column):
+    """Rows per (node id, day, value of ``column``)."""
+    keep = df[column].notna().to_numpy()
+    frame = pd.DataFrame({
+        'direct_report': ids[keep],
+        'day': df[date_col].dt.normalize().to_numpy()[keep],
+        'value': df[column].array[keep],
+    })
+    return frame.groupby(['direct_report', 'day', 'value'], observed=True).size().rename('count')
+
+
+class DayCounts:
+    """Per-day value counts of every node, answering window totals from one node's rows."""
+
+    def __init__(self, counts):
+        counts = counts.sort_index()
+        codes, nodes = pd.factorize(counts.index.get_level_values('direct_report'))
+        starts = np.flatnonzero(np.diff(codes, prepend=-1))
+        stops = np.append(starts[1:], len(codes))
+        self.partitions = {node: (start, stop) for node, start, stop in zip(nodes, starts, stops)}
+        self.days = counts.index.get_level_values('day').to_numpy()
+        values = counts.index.get_level_values('value').astype(object)
+        self.codes, self.values = pd.factorize(values, sort=True)
+        self.counts = counts.to_numpy()
+
+    def query(self, node, start=None, end=None):
+        """Rows per value under ``node`` in the window, indexed by value in sorted order."""
+        lo, hi = self.partitions.get(node, (0, 0))
+        days = self.days[lo:hi]
+        first = 0 if start is None else np.searchsorted(days, np.datetime64(pd.Timestamp(start)), 'left')
+        last = len(days) if end is None else np.searchsorted(days, np.datetime64(pd.Timestamp(end)), 'right')
+        totals = np.bincount(self.codes[lo + first:lo + max(first, last)],
+                             weights=self.counts[lo + first:lo + max(first, last)], minlength=len(self.values))
+        counts = pd.Series(totals.astype('int64'), index=pd.Index(self.values, name='value'), name='count')
+        return counts[counts > 0]
+
+
+class OrgRollup:
+    """Dashboard aggregates of every node of ``tree``, rolled up once from a store's rows.
+
+    ``kpis`` is a KPI cube over people and managers alike, so the KPI row of a
+    department costs the same as that of one report; ``counts`` holds the
+    per-day value counts of ``COUNT_COLUMNS``. Rows are read from the store in
+    chunks, so SQL-backed stores are never loaded whole.
+    """
+
+    def __init__(self, tree, store):
+        self.tree = tree
+        measures, counts = [], {key: [] for key in COUNT_COLUMNS}
+        for name, columns in ROLLUP_COLUMNS.items():
+            for chunk in store.chunks(name, columns):
+                ids = tree.node_ids(chunk['direct_report'])
+                daily = daily_measures(name, chunk.assign(direct_report=ids))
+                if daily is not None:
+                    measures.append(daily)
+                for table, column in COUNT_COLUMNS:
+                    if table == name:
+                        counts[(table, column)].append(_day_counts(chunk, ids, DATE_COLUMNS[name], column))
+
+        # Rows of one (report, day) split across chunks or tables are summed by the roll-up
+        self.kpis = KpiCube.from_daily(tree.roll_up(pd.concat(measures).fillna(0)))
+        self.counts = {key: DayCounts(tree.roll_up(pd.concat(parts))) for key, parts in counts.items()}
+
+    def _days(self, node, start=None, end=None):
+        """Daily measures of ``node`` within the window, on days with meetings."""
+        rows = self.kpis.daily_rows(self.tree.ids.get(node, -1))
+        days = rows.index.get_level_values('day')
+        keep = rows['meetings'].to_numpy() > 0
+        if start is not None:
+            keep &= days >= pd.Timestamp(start)
+        if end is not None:
+            keep &= days <= pd.Timestamp(end)
+        return rows[keep]
+
+    def summary(self, node, start=None, end=None):
+        """KPI summary of everyone under ``node``, as ``insights.summarize`` returns it.
+
+        Recent sentiment is the mean over the node's two most recent meeting days.
+        """
+        recent = self._days(node, start, end).tail(2)
+        recent_sentiment = insights.average_sentiment(recent['sentiment_sum'].sum(), recent['meetings'].sum())
+        return insights.summary_from(self.kpis.query(self.tree.ids.get(node, -1), start, end), recent_sentiment)
+
+    def trend(self, node, start=None, end=None):
+        """Mean sentiment per meeting day of each of ``node``'s direct reports' organisations."""
+        frames = []
+        for child in self.tree.children.get(node, []):
+            rows = self._days(child, start, end)
+            frames.append(pd.DataFrame({
+                'direct_report': child,
+                'date': rows.index.get_level_values('day'),
+                'sentiment_score': (rows['sentiment_sum'] / rows['meetings']).to_numpy(),
+            }))
+        if not frames:
+            return pd.DataFrame(columns=['direct_report', 'date', 'sentiment_score'])
+        return pd.concat(frames, ignore_index=True)
+
+    def value_counts(self, name, column, node, start=None, end=None):
+        """Rows per value of ``column`` of table ``name`` under ``node``, like ``DataStore.counts``."""
+        return self.counts[(name, column)].query(self.tree.ids.get(node, -1), start, end).rename_axis(column)
@@ -0,0 +1,365 @@
+"""
+Static pre-render of the dashboard views
+Renders a self-contained HTML page for the team, every direct report and,
+with an org chart, every manager's roll-up, over one date range: the KPI
+row, the Plotly charts, the item lists and the insights text. All pages
+load one shared ``plotly.min.js`` instead of embedding it per figure, and
+report pages are rendered by a pool of worker processes over the same
+report shards as ``batch.py``, so weekly snapshots can be served as static
+files
+"""
+
+import argparse
+import hashlib
+import html
+import os
+import re
+import tempfile
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+import plotly.offline
+
+import batch
+import charts
+import insights
+import list_views
+import orgchart
+import storage
+from datastore import DataStore
+
+PLOTLY_JS = "plotly.min.js"
+TITLE = "🎯 1:1 Meeting Insights Dashboard"
+PAGE_COLUMNS = storage.columns_for(*storage.SECTION_COLUMNS)
+
+STYLE = """
+body { font-family: system-ui, -apple-system, "Segoe UI", sans-serif; margin: 2rem auto; max-width: 1400px;
+       padding: 0 1rem; color: #262730; }
+nav a { margin-right: 1rem; }
+.row { display: grid; grid-template-columns: repeat(auto-fit, minmax(420px, 1fr)); gap: 1.5rem;
+       border-bottom: 1px solid #e6e6e6; padding: 1rem 0; }
+.kpis { grid-template-columns: repeat(4, 1fr); }
+.kpi { background: #f7f8fa; border-radius: 0.5rem; padding: 0.75rem 1rem; }
+.kpi .value { font-size: 2rem; }
+.kpi .delta, .muted { color: #808495; font-size: 0.9rem; }
+.success, .info, .warning { border-radius: 0.5rem; padding: 0.5rem 1rem; margin: 0.25rem 0; }
+.success { background: #dff5e3; } .info { background: #e3eefc; } .warning { background: #fdf3d8; }
+table { border-collapse: collapse; } td, th { padding: 0.25rem 0.75rem; border-bottom: 1px solid #e6e6e6; }
+"""
+
+
+def slug(name):
+    """File-name-safe form of a person's name, unique per name.
+
+    Accents are dropped and other characters outside a-z0-9 become dashes, so
+    the readable part alone can be shared (or empty, e.g. for non-Latin
+    names); a short hash of the full name tells them apart.
+    """
+    ascii_name = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode()
+    readable = re.sub(r"[^a-z0-9]+", "-", ascii_name.lower()).strip("-")
+    digest = hashlib.sha1(str(name).encode("utf-8")).hexdigest()[:8]
+    return f"{readable}-{digest}" if readable else digest
+
+
+def report_file(report):
+    return f"report-{slug(report)}.html"
+
+
+def manager_file(manager):
+    return f"manager-{slug(manager)}.html"
+
+
+def markdown_html(text):
+    """HTML of the small markdown subset ``list_views`` emits: paragraphs, line breaks and bold."""
+    paragraphs = []
+    for paragraph in text.split("\n\n"):
+        paragraph = html.escape(paragraph).replace("  \n", "<br>")
+        paragraphs.append("<p>" + re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", paragraph) + "</p>")
+    return "\n".join(paragraphs)
+
+
+def figure_html(fig):
+    # The page loads plotly.js once; each figure is only its div and data
+    return fig.to_html(full_html=False, include_plotlyjs=False, config={"displaylogo": False})
+
+
+def _note(kind, text):
+    return f'<div class="{kind}">{html.escape(text)}</div>'
+
+
+def kpi_row(summary):
+    """The dashboard's four KPI cards."""
+    avg_sentiment = summary['avg_sentiment']
+    cards = [
+        ("Total Meetings", summary['total_meetings'], ""),
+        ("Action Item Completion", f"{summary['completion_rate']:.0f}%",
+         f"{summary['completed_actions']}/{summary['total_actions']} completed"),
+        ("Active Blockers", summary['active_blockers'], ""),
+        ("Avg. Meeting Sentiment", f"{avg_sentiment:.2f}", f"{avg_sentiment - 0.5:+.2f} vs neutral"),
+    ]
+    return '<div class="row kpis">' + "".join(
+        f'<div class="kpi"><div class="muted">{label}</div><div class="value">{value}</div>'
+        f'<div class="delta">{delta}</div></div>' for label, value, delta in cards) + "</div>"
+
+
+def insights_row(summary):
+    strengths = insights.strengths(summary)
+    concerns = insights.concerns(summary)
+    return [
+        ("Strengths", [_note("success", f"• {item}") for item in strengths]
+         or [_note("info", "Check individual metrics for specific strengths")]),
+        ("Areas for Attention", [_note("warning", f"• {item}") for item in concerns]
+         or [_note("success", "No major concerns detected!")]),
+    ]
+
+
+def _counts_column(title, counts, build, empty, extra=()):
+    if len(counts) == 0:
+        return title, [_note("info", empty)]
+    return title, [figure_html(build(counts)), *extra]
+
+
+def view_rows(store, report=None, start=None, end=None):
+    """Rows of (heading, HTML blocks) columns for the dashboard view of ``report`` (None: team)."""
+    sentiment = store.trend('meetings', 'sentiment_score', report, start, end)
+    communication = store.trend('communication', 'dr_hedge_words', report, start, end)
+    rows = [[
+        ("📈 Meeting Sentiment Trend", [figure_html(charts.sentiment_figure(sentiment))]),
+        ("💬 Communication Patterns", [figure_html(charts.hedge_words_figure(communication))]
+         if len(communication) > 0 else [_note("info", "No communication data available for selected filters")]),
+    ]]
+
+    statuses = store.okr_snapshot(report, start, end)
+    if report is None:
+        at_risk = int((~statuses['on_track'].to_numpy(dtype=bool)).sum())
+        okrs = [f"<p><strong>At-Risk OKRs ({at_risk}):</strong></p>",
+                markdown_html(list_views.at_risk_okrs(statuses)) if at_risk else _note("success", "Every OKR is on track!")]
+    else:
+        groups = charts.okr_groups(store.table('metrics', report, start, end)).get(report, [])
+        okrs = [figure_html(charts.okr_figure(groups)), okr_table(statuses)] if groups else \
+            [_note("info", "No metrics data available for selected filters")]
+    rows.append([("🎯 OKR Progress Tracking", okrs)])
+
+    topics = store.counts('topics', 'topic', report, start, end)
+    priority = store.counts('topics', 'priority', report, start, end) if len(topics) > 0 else topics
+    shares = store.topic_times.rolling_share(report, start, end)
+    shifts = list_views.topic_shifts(store.topic_times.shifts(report, end))
+    actions = store.counts('action_items', 'status', report, start, end)
+    recent = store.latest('action_items', list_views.RECENT_ACTIONS, report, start, end)
+    burndown = store.lifecycles['action_items'].burndown(report, start, end)
+    rows.append([
+        ("📝 Discussion Topics", [figure_html(charts.topics_figure(topics)),
+                                 figure_html(charts.priority_figure(priority)),
+                                 *([figure_html(charts.topic_share_figure(shares))] if shares.shape[1] > 0 else []),
+                                 "<p><strong>Emerging & Fading Topics:</strong></p>",
+                                 markdown_html(shifts) if shifts
+                                 else _note("info", "No topic's share of discussion time shifted notably")]
+         if len(topics) > 0 else [_note("info", "No topic data available")]),
+        _counts_column("✅ Action Items Status", actions, charts.action_status_figure, "No action items available",
+                       [figure_html(charts.burndown_figure(burndown)),
+                        "<p><strong>Recent Action Items:</strong></p>",
+                        markdown_html(list_views.recent_actions(recent))]),
+    ])
+
+    active = store.active_blockers(0, list_views.LIST_PAGE_SIZE, report, start, end)
+    growth_areas = store.table('growth_areas', report, start, end)
+    aging = store.lifecycles['blockers'].aging(report, start, end)
+    rows.append([
+        _counts_column("🚧 Blockers & Challenges", store.counts('blockers', 'status', report, start, end),
+                       charts.blocker_status_figure, "No blocker data available",
+                       [figure_html(charts.blocker_aging_figure(aging)),
+                        "<p><strong>Active Blockers:</strong></p>",
+                        markdown_html(list_views.active_blockers(active)) if len(active)
+                        else _note("success", "No active blockers!")]),
+        ("🌱 Growth & Development", [figure_html(charts.growth_figure(growth_areas)),
+                                    "<p><strong>Development Focus:</strong></p>",
+                                    markdown_html(list_views.development_focus(
+                                        growth_areas.iloc[:list_views.LIST_PAGE_SIZE]))]
+         if len(growth_areas) > 0 else [_note("info", "No growth data available")]),
+    ])
+    return rows
+
+
+def okr_table(statuses):
+    """Latest reading, gap and status of each of a report's OKRs."""
+    cells = []
+    for status in statuses.itertuples(index=False):
+        cells.append(
+            f"<tr><td>{html.escape(str(status.metric))}</td><td>{status.actual}{html.escape(str(status.unit))}</td>"
+            f"<td>{status.gap:+.1f}</td><td>{charts.okr_status_label(status.on_track)}</td></tr>")
+    return ("<table><tr><th>Metric</th><th>Latest</th><th>vs target</th><th>Status</th></tr>"
+            + "".join(cells) + "</table>")
+
+
+def rollup_inputs(rollup, node, start=None, end=None):
+    """Everything a manager's roll-up page is drawn from, small enough to send to a worker."""
+    return {
+        'summary': rollup.summary(node, start, end),
+        'trend': rollup.trend(node, start, end),
+        'counts': {key: rollup.value_counts(*key, node, start, end) for key in orgchart.COUNT_COLUMNS},
+    }
+
+
+def rollup_rows(inputs):
+    """Rows of (heading, HTML blocks) columns for a manager's whole organisation."""
+    counts = inputs['counts']
+    topics = counts[('topics', 'topic')]
+    return [
+        [("📈 Sentiment by Team", [figure_html(charts.sentiment_figure(inputs['trend']))]
+          if len(inputs['trend']) > 0 else [_note("info", "No meetings in this organisation for selected filters")]),
+         _counts_column("🚧 Blockers & Challenges", counts[('blockers', 'status')],
+                        charts.blocker_status_figure, "No blocker data available")],
+        [("📝 Discussion Topics", [figure_html(charts.topics_figure(topics)),
+                                  figure_html(charts.priority_figure(counts[('topics', 'priority')]))]
+          if len(topics) > 0 else [_note("info", "No topic data available")]),
+         _counts_column("✅ Action Items Status", counts[('action_items', 'status')],
+                        charts.action_status_figure, "No action items available")],
+    ]
+
+
+def page(title, subtitle, summary, rows):
+    """A complete HTML page: header, KPI row, section rows and the insights."""
+    body = [kpi_row(summary)]
+    for row in rows + [insights_row(summary)]:
+        body.append('<div class="row">' + "".join(
+            f"<section><h3>{heading}</h3>{''.join(blocks)}</section>" for heading, blocks in row) + "</div>")
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(title)} · 1:1 Insights</title>
+<script src="{PLOTLY_JS}"></script>
+<style>{STYLE}</style>
+</head>
+<body>
+<nav><a href="index.html">All pages</a></nav>
+<h1>{TITLE}</h1>
+<p>{subtitle}</p>
+{''.join(body)}
+<p class="muted">POC Dashboard | ComChord Data Internship Technical Test</p>
+</body>
+</html>
+"""
+
+
+def _subtitle(label, name, start, end, generated):
+    period = f"{pd.Timestamp(start):%b %d, %Y} – {pd.Timestamp(end):%b %d, %Y}"
+    return f"<strong>{label}:</strong> {html.escape(name)} | <strong>Period:</strong> {period} | " \
+           f"<strong>Generated:</strong> {generated}"
+
+
+def write_page(out_dir, filename, content):
+    with open(os.path.join(out_dir, filename), "w", encoding="utf-8") as f:
+        f.write(content)
+    return filename
+
+
+def check_file_names(reports, managers):
+    """Raise ValueError if two pages would be written to the same file."""
+    files = {}
+    for name, filename in [*((report, report_file(report)) for report in reports),
+                           *((manager, manager_file(manager)) for manager in managers)]:
+        if files.setdefault(filename, name) != name:
+            raise ValueError(f"{files[filename]!r} and {name!r} would both be written to {filename}")
+
+
+def render_report_shard(shard_dir, offsets, first, last, out_dir, start, end, generated):
+    """Write the pages of reports ``first:last``; returns (report, file, summary) per page."""
+    store = DataStore(batch.read_shard(shard_dir, offsets, first, last))
+    pages = []
+    for report in store.reports():
+        summary = insights.summarize(store, report, start, end)
+        content = page(report, _subtitle("Direct Report", report, start, end, generated), summary,
+                       view_rows(store, report, start, end))
+        pages.append((report, write_page(out_dir, report_file(report), content), summary))
+    return pages
+
+
+def render_manager(manager, inputs, out_dir, start, end, generated):
+    """Write one manager's roll-up page; returns (manager, file, summary)."""
+    content = page(manager, _subtitle("Manager", manager, start, end, generated), inputs['summary'],
+                   rollup_rows(inputs))
+    return manager, write_page(out_dir, manager_file(manager), content), inputs['summary']
+
+
+def index_page(team, managers, reports, tree, generated):
+    """Links to every page with its headline KPIs."""
+    def table(rows, label=str):
+        cells = "".join(
+            f'<tr><td><a href="{filename}">{html.escape(label(name))}</a></td>'
+            f"<td>{summary['total_meetings']}</td><td>{summary['completion_rate']:.0f}%</td>"
+            f"<td>{summary['active_blockers']}</td><td>{summary['avg_sentiment']:.2f}</td></tr>"
+            for name, filename, summary in rows)
+        return ("<table><tr><th></th><th>Meetings</th><th>Completion</th><th>Active blockers</th>"
+                "<th>Sentiment</th></tr>" + cells + "</table>")
+
+    sections = [("Team", table([team]))]
+    if managers:
+        sections.append(("Managers", table(managers, tree.label)))
+    sections.append(("Direct Reports", table(reports)))
+    body = "".join(f"<h2>{heading}</h2>{content}" for heading, content in sections)
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>1:1 Insights</title><style>{STYLE}</style></head>
+<body>
+<h1>{TITLE}</h1>
+<p class="muted">Generated {generated}</p>
+{body}
+</body>
+</html>
+"""
+
+
+def prerender(tables, out_dir, start=None, end=None, workers=None, data_dir=None):
+    """Render every page into ``out_dir``; returns the number of pages written (index included)."""
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(out_dir, exist_ok=True)
+    generated = datetime.now().strftime("%B %d, %Y")
+    store = DataStore(tables)
+    lo, hi = store.date_range('meetings')
+    start, end = start or lo, end or hi
+    tree = orgchart.OrgTree.read(data_dir, store.reports()) if data_dir is not None else None
+    check_file_names(store.reports(), tree.managers() if tree is not None else [])
+
+    with tempfile.TemporaryDirectory(prefix="prerender-shards-") as shard_dir, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        _, offsets = batch.write_shards(tables, shard_dir)
+        futures = [pool.submit(render_report_shard, shard_dir, offsets, first, last, out_dir, start, end, generated)
+                   for first, last in batch.plan_shards(offsets, workers * batch.SHARDS_PER_WORKER)]
+        # Manager pages are drawn in the pool from their roll-ups, the team page here meanwhile
+        manager_futures = []
+        if tree is not None:
+            rollup = orgchart.OrgRollup(tree, store)
+            manager_futures = [pool.submit(render_manager, manager, rollup_inputs(rollup, manager, start, end),
+                                           out_dir, start, end, generated) for manager in tree.managers()]
+        summary = insights.summarize(store, None, start, end)
+        manager = tree.root if tree is not None else "Sarah Chen"
+        team = ("All", write_page(out_dir, "team.html", page("Team", _subtitle("Manager", manager, start, end, generated),
+                                                              summary, view_rows(store, None, start, end))), summary)
+        reports = sorted((entry for future in futures for entry in future.result()), key=lambda entry: entry[0])
+        managers = [future.result() for future in manager_futures]
+
+    with open(os.path.join(out_dir, PLOTLY_JS), "w", encoding="utf-8") as f:
+        f.write(plotly.offline.get_plotlyjs())
+    write_page(out_dir, "index.html", index_page(team, managers, reports, tree, generated))
+    return len(reports) + len(managers) + 2
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render static HTML dashboards for the team and every report")
+    parser.add_argument("data_dir", nargs="?", default=".")
+    parser.add_argument("--out-dir", default="static")
+    parser.add_argument("--workers", type=int, default=None, help="defaults to the number of CPUs")
+    parser.add_argument("--start-date", default=None, help="first day of the window (YYYY-MM-DD)")
+    parser.add_argument("--end-date", default=None, help="last day of the window (YYYY-MM-DD)")
+    args = parser.parse_args(argv)
+
+    tables = storage.load_tables(args.data_dir, columns=PAGE_COLUMNS)
+    pages = prerender(tables, args.out_dir, args.start_date, args.end_date, args.workers, args.data_dir)
+    print(f"[SUCCESS] Rendered {pages} pages to {args.out_dir}/ (open index.html)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Inverted full-text index over the dashboard's free-text columns
+Action items, blockers, topics and growth areas are tokenized once per
+distinct text into lowercase words, and every word keeps the sorted ids of
+the rows containing it. A query word matches every indexed word it is a
+prefix of, found by binary search in the sorted vocabulary, so a search is
+a few postings unions and intersections however many rows there are.
+Appended rows are tokenized and merged into the postings as they arrive
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from derived import DerivedIndex
+
+# (date column, searchable text columns) of each table
+SEARCH_COLUMNS = {
+    'action_items': ('created_date', ['action']),
+    'blockers': ('first_mentioned', ['blocker']),
+    'topics': ('meeting_date', ['topic']),
+    'growth_areas': (None, ['area', 'activities']),
+}
+RESULT_COLUMNS = ['table', 'row', 'direct_report', 'date', 'text']
+TABLE_LABELS = {'action_items': "Action item", 'blockers': "Blocker", 'topics': "Topic", 'growth_areas': "Growth area"}
+SEARCH_RESULTS = 50       # matching rows returned per search, newest first
+ROW_BITS = 40             # postings are (word id << ROW_BITS | row id) keys
+ROW_MASK = (1 << ROW_BITS) - 1
+TOKEN = re.compile(r"[^\W_]+")
+LAST_CHAR = chr(0x10FFFF)
+EMPTY = np.empty(0, dtype='int64')
+
+
+def tokens(text):
+    """Distinct lowercase words of ``text``, in order of appearance."""
+    return list(dict.fromkeys(TOKEN.findall(str(text).lower())))
+
+
+def index_columns(name):
+    """Columns of table ``name`` the index reads."""
+    date_col, columns = SEARCH_COLUMNS[name]
+    return ['direct_report', *([date_col] if date_col else []), *columns]
+
+
+def _encode(values, vocabulary):
+    """Codes of ``values`` in ``vocabulary``, which is extended with the new ones."""
+    return np.array([vocabulary.setdefault(value, len(vocabulary)) for value in values], dtype='int64')
+
+
+class TableSearch(DerivedIndex):
+    """Postings of one table's ``SEARCH_COLUMNS``, with the report, date and texts of each row.
+
+    Rows get ids in the order they are added; ``labels`` maps them back to
+    the caller's row labels (``DataStore`` index labels) when given. Postings
+    are one sorted array of (word id, row id) keys, so a word's rows are a
+    contiguous, sorted run of it.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.date_col, self.columns = SEARCH_COLUMNS[name]
+        self.words = {}                                          # word -> word id
+        self.texts = {column: {} for column in self.columns}     # text -> text code
+        self.text_words = {column: [] for column in self.columns}   # word ids per text code
+        self.reports = {}                                        # direct report -> report code
+        # Postings keys, then the row label, report code, date and text codes per row id
+        self.keys = self.labels = self.report_codes = self.dates = EMPTY
+        self.text_codes = {column: EMPTY for column in self.columns}
+        self._refresh()
+
+    def _build(self):
+        words = np.array(list(self.words), dtype=object)
+        order = np.argsort(words, kind='stable') if len(words) else EMPTY
+        word_starts = np.searchsorted(self.keys, np.arange(len(words) + 1, dtype='int64') << ROW_BITS)
+        # Values by code, where code -1 (a missing value) picks the trailing ""
+        names = {column: np.array([*texts, ""], dtype=object) for column, texts in self.texts.items()}
+        names['direct_report'] = np.array([*self.reports, ""], dtype=object)
+        return (self.keys, word_starts, words[order], order, self.labels, self.report_codes, self.dates,
+                self.text_codes, names)
+
+    def _postings(self, column, values, ids):
+        """(word id, row id) keys of ``values`` of rows ``ids``, and their text codes."""
+        batch_codes, uniques = pd.factorize(values)
+        uniques = [str(value) for value in uniques]
+        codes = _encode(uniques, self.texts[column])
+        text_words = self.text_words[column]
+        # Only texts not seen before are tokenized
+        for text in uniques:
+            if self.texts[column][text] == len(text_words):
+                text_words.append(_encode(tokens(text), self.words))
+        batch_words = [text_words[code] for code in codes]
+        counts = np.array([len(words) for words in batch_words], dtype='int64')
+        offsets = np.cumsum(counts) - counts
+        flat = np.concatenate(batch_words) if batch_words else EMPTY
+
+        valid = batch_codes >= 0
+        per_row = counts[batch_codes[valid]]
+        within = np.arange(per_row.sum()) - np.repeat(np.cumsum(per_row) - per_row, per_row)
+        word_ids = flat[np.repeat(offsets[batch_codes[valid]], per_row) + within]
+        return word_ids << ROW_BITS | np.repeat(ids[valid], per_row), np.append(codes, -1)[batch_codes]
+
+    def update(self, rows, labels=None):
+        """Index newly added ``rows``; ``labels`` are their row labels (default: their ids)."""
+        if len(rows) == 0:
+            return
+        ids = np.arange(len(self.report_codes), len(self.report_codes) + len(rows), dtype='int64')
+        new_keys, new_codes = [], {}
+        for column in self.columns:
+            postings, new_codes[column] = self._postings(column, rows[column], ids)
+            new_keys.append(postings)
+        # A word in two columns of a row is posted once; new row ids sort after every existing one
+        new_keys = np.sort(np.concatenate(new_keys))
+        new_keys = new_keys[np.append(True, new_keys[1:] != new_keys[:-1])]
+        keys = np.insert(self.keys, np.searchsorted(self.keys, new_keys), new_keys)
+
+        batch_codes, uniques = pd.factorize(rows['direct_report'])
+        new_reports = np.append(_encode([str(name) for name in uniques], self.reports), -1)[batch_codes]
+        new_dates = (rows[self.date_col].to_numpy(dtype='datetime64[ns]').astype('int64') if self.date_col
+                     else np.zeros(len(rows), dtype='int64'))
+        new_labels = ids if labels is None else np.asarray(labels, dtype='int64')
+        self.keys = keys
+        self.labels = np.concatenate([self.labels, new_labels])
+        self.report_codes = np.concatenate([self.report_codes, new_reports])
+        self.dates = np.concatenate([self.dates, new_dates])
+        self.text_codes = {column: np.concatenate([self.text_codes[column], new_codes[column]])
+                           for column in self.columns}
+        self._refresh()
+
+    def match(self, words):
+        """Ids of the rows having, for every query word, an indexed word it is a prefix of."""
+        keys, word_starts, sorted_words, order, labels, *_ = self._state
+        matched = None
+        for word in words:
+            lo, hi = np.searchsorted(sorted_words, [word, word + LAST_CHAR]) if len(sorted_words) else (0, 0)
+            # The postings of every word with the prefix are marked in one mask, which avoids sorting their union
+            found = np.zeros(len(labels), dtype=bool)
+            for i in order[lo:hi]:
+                found[keys[word_starts[i]:word_starts[i + 1]] & ROW_MASK] = True
+            matched = found if matched is None else matched & found
+        return EMPTY if matched is None else np.flatnonzero(matched)
+
+    def select(self, words, report=None, start=None, end=None):
+        """Ids of the rows matching ``words`` within the report and (inclusive) date filters."""
+        *_, report_codes, dates, _, _ = self._state
+        ids = self.match(words)
+        if report is not None:
+            ids = ids[report_codes[ids] == self.reports.get(str(report), -2)]
+        if self.date_col and start is not None:
+            ids = ids[dates[ids] >= pd.Timestamp(start).value]
+        if self.date_col and end is not None:
+            ids = ids[dates[ids] <= pd.Timestamp(end).value]
+        return ids
+
+    def latest(self, ids, n):
+        """The ``n`` newest of rows ``ids`` (by date, then most recently added), newest first."""
+        dates = self._state[6][ids]
+        if len(ids) > n:
+            # Rows dated on or after the n-th newest date, then ordered among themselves
+            newest = dates >= np.partition(dates, len(ids) - n)[len(ids) - n]
+            ids, dates = ids[newest], dates[newest]
+        return ids[np.lexsort((-ids, -dates))[:n]]
+
+    def rows(self, ids):
+        """Table, row label, direct report, date and text of rows ``ids``."""
+        _, _, _, _, labels, report_codes, dates, text_codes, names = self._state
+        text = names[self.columns[0]][text_codes[self.columns[0]][ids]]
+        for column in self.columns[1:]:
+            text = text + " — " + names[column][text_codes[column][ids]]
+        date = dates[ids].astype('datetime64[ns]') if self.date_col else np.full(len(ids), np.datetime64('NaT', 'ns'))
+        return pd.DataFrame({'table': self.name, 'row': labels[ids], 'direct_report': names['direct_report'][report_codes[ids]],
+                             'date': date, 'text': text})
+
+
+class SearchIndex:
+    """``TableSearch`` of every table with its text columns loaded."""
+
+    def __init__(self, tables=None):
+        self.tables = {}
+        for name, rows in (tables or {}).items():
+            self.tables[name] = TableSearch(name)
+            self.tables[name].update(rows, rows.index)
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        """Index over tables given as {name: iterable of frames} (e.g. ``store.chunks``).
+
+        Rows are labelled by their position in the frames, e.g. (report, date)
+        order for ``SqlStore.chunks``.
+        """
+        index = cls()
+        for name, frames in chunks.items():
+            index.tables[name] = TableSearch(name)
+            for rows in frames:
+                index.tables[name].update(rows)
+        return index
+
+    def update(self, name, rows, labels=None):
+        """Fold appended ``rows`` of table ``name`` into its index (when it has one)."""
+        if name in self.tables:
+            self.tables[name].update(rows, labels)
+
+    def search(self, query, report=None, start=None, end=None, limit=SEARCH_RESULTS):
+        """Rows of every table matching ``query`` in the selection, and the number of matches per table.
+
+        Every word of the query must start a word of the row's text. The
+        ``limit`` newest rows are returned, those without a date last.
+        """
+        words = tokens(query)
+        counts = pd.Series(0, index=pd.Index(list(self.tables), name='table'), dtype='int64')
+        if not words or not self.tables:
+            return pd.DataFrame(columns=RESULT_COLUMNS), counts
+        found = []
+        for name, table in self.tables.items():
+            ids = table.select(words, report, start, end)
+            counts[name] = len(ids)
+            found.append(table.rows(table.latest(ids, limit)))
+        results = pd.concat(found, ignore_index=True)
+        results = results.sort_values('date', ascending=False, na_position='last', kind='stable')
+        return results.head(limit).reset_index(drop=True), counts
@@ -0,0 +1,257 @@
+"""
+Lexicon-based meeting sentiment with an incremental on-disk cache
+Scores each 1:1 transcript offline on CPU with a weighted word lexicon
+(negation- and intensifier-aware), vectorized over batches of utterances,
+and fills ``sentiment_score`` of the matching meetings. Scores are cached by a hash
+of each transcript's content, so a nightly rerun over the whole archive
+only rescores new or changed transcripts
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+import storage
+import transcripts
+
+CACHE_FILE = "sentiment_cache.json"
+BATCH_UTTERANCES = 50_000     # utterances scored per vectorized batch
+ALPHA = 15.0                  # compound = s / sqrt(s^2 + ALPHA) squashes weight sums into (-1, 1)
+NEGATION_WINDOW = 3           # a negation flips sentiment words up to this many tokens later
+NEGATION_SCALAR = 0.74        # ...and dampens them
+
+# Word -> weight; workplace vocabulary, roughly on a -3 (very negative) to +3 scale
+LEXICON = {
+    # positive
+    "great": 2.5, "good": 1.5, "excellent": 3.0, "awesome": 3.0, "amazing": 3.0, "love": 2.5,
+    "happy": 2.5, "excited": 2.5, "glad": 2.0, "proud": 2.5, "confident": 2.0, "motivated": 2.0,
+    "enjoy": 2.0, "enjoying": 2.0, "progress": 1.5, "improved": 1.5, "improving": 1.5,
+    "shipped": 1.5, "launched": 1.5, "resolved": 1.5, "solved": 1.5, "win": 2.0, "wins": 2.0,
+    "smooth": 1.5, "smoothly": 1.5, "clear": 1.0, "helpful": 1.5, "thanks": 1.5, "thank": 1.5,
+    "appreciate": 2.0, "appreciated": 2.0, "ahead": 1.0, "on-track": 1.5, "productive": 2.0,
+    "energized": 2.0, "supportive": 1.5, "success": 2.0, "successful": 2.0, "nice": 1.5,
+    "fine": 0.5, "well": 1.0, "better": 1.5, "best": 2.0, "fun": 1.5, "growth": 1.0,
+    # negative
+    "bad": -2.5, "blocked": -2.0, "blocker": -1.5, "blockers": -1.5, "stuck": -2.0,
+    "frustrated": -2.5, "frustrating": -2.5, "worried": -2.0, "worry": -1.5, "concerned": -1.5,
+    "concern": -1.0, "behind": -1.5, "delay": -1.5, "delayed": -1.5, "slipping": -1.5,
+    "overwhelmed": -2.5, "stress": -2.0, "stressed": -2.5, "stressful": -2.5, "burnout": -3.0,
+    "burned": -2.0, "tired": -1.5, "exhausted": -2.5, "issue": -1.0, "issues": -1.0,
+    "problem": -1.5, "problems": -1.5, "bug": -1.0, "bugs": -1.0, "fail": -2.0, "failed": -2.0,
+    "failing": -2.0, "unclear": -1.5, "confused": -1.5, "confusing": -1.5, "difficult": -1.5,
+    "hard": -1.0, "late": -1.0, "risk": -1.0, "risky": -1.5, "conflict": -2.0, "tension": -1.5,
+    "unhappy": -2.5, "disappointed": -2.5, "disappointing": -2.5, "upset": -2.5, "angry": -3.0,
+    "quit": -2.5, "leaving": -1.5, "struggling": -2.0, "struggle": -2.0, "worse": -2.0,
+    "worst": -3.0, "annoyed": -2.0, "pressure": -1.5, "overloaded": -2.5, "unfair": -2.5,
+}
+NEGATIONS = frozenset({
+    "not", "no", "never", "nothing", "hardly", "without", "don't", "doesn't", "didn't", "isn't",
+    "wasn't", "aren't", "weren't", "can't", "cannot", "won't", "couldn't", "shouldn't", "wouldn't",
+})
+# Degree words -> how much they strengthen (or, negative, soften) the sentiment word right after them
+INTENSIFIERS = {
+    "very": 0.3, "really": 0.3, "so": 0.2, "super": 0.3, "extremely": 0.5, "incredibly": 0.5,
+    "totally": 0.3, "absolutely": 0.4, "highly": 0.3, "quite": 0.1,
+    "slightly": -0.4, "somewhat": -0.3, "barely": -0.5, "kinda": -0.2,
+}
+# Words, plus the newlines that separate the utterances of a batch
+TOKEN_PATTERN = re.compile(r"[a-z][a-z'\-]*|\n")
+
+
+def scorer_version(lexicon=LEXICON):
+    """Fingerprint of the lexicon and scoring constants; cached scores from other versions are ignored."""
+    spec = json.dumps([sorted(lexicon.items()), sorted(NEGATIONS), sorted(INTENSIFIERS.items()), ALPHA,
+                       NEGATION_WINDOW, NEGATION_SCALAR])
+    return hashlib.sha256(spec.encode()).hexdigest()[:16]
+
+
+def score_utterances(texts, lexicon=LEXICON):
+    """Compound sentiment in (-1, 1) per utterance, computed for the whole batch at once."""
+    # One regex pass over the joined batch; a word's utterance is the number of newlines before it
+    batch = "\n".join(text.replace("\n", " ") for text in texts).replace("’", "'").lower()
+    tokens = np.array(TOKEN_PATTERN.findall(batch), dtype=object)
+    breaks = tokens == "\n"
+    utterance = np.cumsum(breaks)[~breaks]
+    # Lexicon lookups once per distinct word rather than per token
+    codes, vocabulary = pd.factorize(tokens[~breaks])
+    weights = np.array([lexicon.get(word, 0.0) for word in vocabulary], dtype='float64')[codes]
+
+    # Scale words right after an intensifier of the same utterance
+    boost = np.array([INTENSIFIERS.get(word, 0.0) for word in vocabulary], dtype='float64')[codes]
+    same = utterance[1:] == utterance[:-1]
+    weights[1:] *= 1 + np.where(same, boost[:-1], 0.0)
+
+    # Flip words preceded by a negation within the same utterance
+    negation = np.array([word in NEGATIONS for word in vocabulary], dtype=bool)[codes]
+    flipped = np.zeros(len(codes), dtype=bool)
+    for k in range(1, NEGATION_WINDOW + 1):
+        flipped[k:] |= negation[:-k] & (utterance[k:] == utterance[:-k])
+    weights = np.where(flipped, -NEGATION_SCALAR * weights, weights)
+
+    sums = np.bincount(utterance, weights=weights, minlength=len(texts))
+    return sums / np.sqrt(sums ** 2 + ALPHA)
+
+
+def score_meetings(meetings, lexicon=LEXICON):
+    """``sentiment_score`` (0 = negative, 1 = positive) per meeting, from lists of utterance texts.
+
+    A meeting's score is the mean compound of its utterances that carry
+    any sentiment, mapped onto [0, 1]; meetings without any are neutral (0.5).
+    """
+    counts = [len(texts) for texts in meetings]
+    compound = score_utterances([text for texts in meetings for text in texts], lexicon)
+    meeting = np.repeat(np.arange(len(meetings)), counts)
+    bearing = compound != 0
+    totals = np.bincount(meeting[bearing], weights=compound[bearing], minlength=len(meetings))
+    n = np.bincount(meeting[bearing], minlength=len(meetings))
+    mean = np.divide(totals, n, out=np.zeros(len(meetings)), where=n > 0)
+    return np.round((mean + 1) / 2, 2)
+
+
+def file_key(path):
+    """Content hash of a transcript (with its file name, which can carry the metadata)."""
+    digest = hashlib.sha256(os.path.basename(path).encode() + b"\0")
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_meeting(path):
+    """(metadata, utterance texts) of one transcript; continuation lines join their utterance."""
+    meta = transcripts.name_metadata(path)
+    texts = []
+    for event in transcripts.read_transcript(path):
+        if event[0] == "meta":
+            meta[event[1]] = event[2]
+        elif event[1] is None and event[2] is None and texts:
+            texts[-1] += " " + event[3]
+        else:
+            texts.append(event[3])
+    missing = [key for key in ("meeting_date", "direct_report") if not meta.get(key)]
+    if missing:
+        raise ValueError(f"no {' or '.join(missing)} in the header or file name")
+    return {"meeting_date": meta["meeting_date"], "direct_report": meta["direct_report"]}, texts
+
+
+class ScoreCache:
+    """Meeting scores on disk, keyed by transcript hash and valid for one scorer version."""
+
+    def __init__(self, path, version):
+        self.path = path
+        self.version = version
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                stored = json.load(f)
+            if stored.get("version") == version:
+                self.entries = stored["entries"]
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def put(self, key, entry):
+        self.entries[key] = entry
+
+    def save(self, keep=None):
+        """Write atomically; with ``keep``, entries of transcripts no longer seen are dropped."""
+        entries = self.entries if keep is None else {k: v for k, v in self.entries.items() if k in keep}
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"version": self.version, "entries": entries}, f)
+        os.replace(tmp, self.path)
+
+
+def score_transcripts(paths, cache, batch_utterances=BATCH_UTTERANCES, errors=None):
+    """Cache entries (meeting_date, direct_report, score) of ``paths``; returns (entries, rescored).
+
+    Cached transcripts are only hashed. The rest are read and scored in
+    vectorized batches of about ``batch_utterances`` utterances.
+    """
+    entries, pending, rescored = {}, [], 0
+    errors = {} if errors is None else errors
+
+    def flush():
+        scores = score_meetings([texts for _, _, texts in pending])
+        for (key, meta, _), score in zip(pending, scores):
+            entries[key] = {**meta, "sentiment_score": float(score)}
+            cache.put(key, entries[key])
+        pending.clear()
+
+    queued = 0
+    for path in paths:
+        try:
+            key = file_key(path)
+            if cache.get(key) is not None:
+                entries[key] = cache.get(key)
+                continue
+            meta, texts = read_meeting(path)
+        except (ValueError, OSError) as exc:
+            errors[path] = str(exc)
+            continue
+        pending.append((key, meta, texts))
+        rescored += 1
+        queued += len(texts)
+        if queued >= batch_utterances:
+            flush()
+            queued = 0
+    if pending:
+        flush()
+    return entries, rescored
+
+
+def apply_scores(meetings, entries):
+    """``meetings`` with ``sentiment_score`` replaced where a transcript matches; returns (frame, matched)."""
+    scores = pd.DataFrame(list(entries), columns=["meeting_date", "direct_report", "sentiment_score"])
+    scores["meeting_date"] = pd.to_datetime(scores["meeting_date"]).dt.normalize()
+    scores = scores.drop_duplicates(["meeting_date", "direct_report"], keep="last")
+    keys = pd.MultiIndex.from_arrays([meetings["date"].dt.normalize(), meetings["direct_report"].astype(str)])
+    found = pd.Series(scores["sentiment_score"].to_numpy(),
+                      index=pd.MultiIndex.from_frame(scores[["meeting_date", "direct_report"]])).reindex(keys)
+    matched = found.notna().to_numpy()
+    meetings = meetings.copy()
+    meetings.loc[matched, "sentiment_score"] = found.to_numpy()[matched]
+    return meetings, int(matched.sum())
+
+
+def write_meetings(meetings, data_dir):
+    """Replace the meetings table in ``data_dir`` in the format it is stored in."""
+    if storage.pq is not None and os.path.exists(storage.table_path(data_dir, "meetings")):
+        storage.write_table(meetings, "meetings", data_dir)
+        return storage.table_path(data_dir, "meetings")
+    path = storage.table_path(data_dir, "meetings", "csv")
+    tmp = f"{path}.tmp"
+    meetings.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score 1:1 transcripts and fill the meetings' sentiment")
+    parser.add_argument("transcript_dir")
+    parser.add_argument("--data-dir", default=".", help="directory holding the meetings table")
+    parser.add_argument("--cache", default=CACHE_FILE, help="score cache file")
+    parser.add_argument("--batch-utterances", type=int, default=BATCH_UTTERANCES)
+    args = parser.parse_args(argv)
+
+    cache = ScoreCache(args.cache, scorer_version())
+    errors = {}
+    entries, rescored = score_transcripts(transcripts.transcript_paths(args.transcript_dir), cache,
+                                          args.batch_utterances, errors)
+    cache.save(keep=entries)
+
+    meetings, matched = apply_scores(storage.read_table("meetings", args.data_dir), entries.values())
+    path = write_meetings(meetings, args.data_dir)
+    print(f"[SUCCESS] Scored {len(entries)} transcripts ({rescored} new or changed, "
+          f"{len(entries) - rescored} cached); updated {matched} meetings in {path}")
+    for filename, error in errors.items():
+        print(f"  - skipped {filename}: {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,527 @@
+"""
+Embedded SQL backend for the dashboard tables
+Keeps the seven tables in a local SQLite file (or a DuckDB one when the
+``duckdb`` package is installed), indexed on direct report and date, and
+answers the dashboard's queries with pushed-down filters and aggregates so
+only their small results are loaded into Python
+"""
+
+import argparse
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+import storage
+from aggregates import MEASURES
+from datastore import DATE_COLUMNS, SEVERITY_RANK
+from lifecycles import AGE_EDGES_DAYS, LIFECYCLES, TEAM, LifecycleQueries, grouped_lifecycle
+from okr import READING_COLUMNS, OkrSnapshot
+from search import SEARCH_COLUMNS, SearchIndex, index_columns
+from topic_analytics import ROLLING_DAYS, SHIFT_THRESHOLD, STEP_DAYS, TopicCube
+
+try:
+    import duckdb
+except ImportError:  # DuckDB is optional; SQLite ships with Python
+    duckdb = None
+
+ENGINES = ("sqlite", "duckdb")
+DB_FILES = {"sqlite": "dashboard.sqlite", "duckdb": "dashboard.duckdb"}
+CHUNK_ROWS = 100_000                      # rows read and inserted at a time when building
+INGESTED_TABLE = "ingested_files"         # names of the incoming files already appended
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"    # SQLite keeps dates as text, which sorts correctly
+SQL_TYPES = {
+    "datetime": "TIMESTAMP", "category": "VARCHAR", "string": "VARCHAR",
+    "int8": "SMALLINT", "int16": "SMALLINT", "int32": "INTEGER", "int64": "BIGINT",
+    "float64": "DOUBLE",
+}
+
+# KPI cube measures as SQL aggregates over the table they come from
+KPI_AGGREGATES = {
+    "meetings": {
+        "meetings": "COUNT(*)",
+        "sentiment_sum": 'COALESCE(SUM("sentiment_score"), 0)',
+    },
+    "action_items": {
+        "actions": "COUNT(*)",
+        "actions_completed": """COALESCE(SUM(CASE WHEN "status" = 'Completed' THEN 1 ELSE 0 END), 0)""",
+    },
+    "blockers": {
+        "blockers": "COUNT(*)",
+        "blockers_active": """COALESCE(SUM(CASE WHEN "status" = 'Active' THEN 1 ELSE 0 END), 0)""",
+    },
+}
+
+
+def _q(identifier):
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def engine_for(path):
+    """Engine implied by a database file name (``.duckdb`` files use DuckDB)."""
+    return "duckdb" if path.endswith(".duckdb") else "sqlite"
+
+
+def connect(path, engine=None):
+    engine = engine or engine_for(path)
+    if engine == "duckdb":
+        if duckdb is None:
+            raise ImportError("the duckdb package is required for DuckDB databases")
+        return duckdb.connect(path)
+    # Sessions share one connection; SqlStore serializes access with its lock
+    return sqlite3.connect(path, check_same_thread=False)
+
+
+def _chunks(data_dir, name, chunk_rows=CHUNK_ROWS):
+    """Typed frames of table ``name``, ``chunk_rows`` at a time (Parquet preferred, CSV otherwise)."""
+    path = storage.table_path(data_dir, name)
+    if storage.pq is not None and os.path.exists(path):
+        for batch in storage.pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield storage.coerce(batch.to_pandas(), name)
+        return
+    dates = [column for column, kind in storage.TABLES[name].items() if kind == "datetime"]
+    for df in pd.read_csv(storage.table_path(data_dir, name, "csv"), parse_dates=dates,
+                          chunksize=chunk_rows):
+        yield storage.coerce(df, name)
+
+
+def _insert(con, engine, name, df):
+    """Append the rows of ``df`` to table ``name``, matching columns by name."""
+    df = df.astype({c: object for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)})
+    if engine == "duckdb":
+        columns = ", ".join(map(_q, df.columns))
+        con.register("incoming_rows", df)
+        try:
+            con.execute(f"INSERT INTO {_q(name)} ({columns}) SELECT {columns} FROM incoming_rows")
+        finally:
+            con.unregister("incoming_rows")
+        return
+    for column in df.columns:
+        if pd.api.types.is_datetime64_dtype(df[column].dtype):
+            df[column] = df[column].dt.strftime(TIMESTAMP_FORMAT)
+    df.to_sql(name, con, if_exists="append", index=False)
+
+
+def _create_table(con, name, columns):
+    kinds = storage.TABLES[name]
+    definition = ", ".join(f"{_q(column)} {SQL_TYPES[kinds[column]]}" for column in columns)
+    con.execute(f"CREATE TABLE {_q(name)} ({definition})")
+
+
+def _create_indexes(con, name):
+    """Index (direct_report, date) for per-report windows and the date alone for "All" windows."""
+    date_col = DATE_COLUMNS.get(name)
+    keys = [["direct_report"] + ([date_col] if date_col else [])]
+    keys += [[date_col]] if date_col else []
+    for columns in keys:
+        index = _q(f"{name}_by_{'_'.join(columns)}")
+        con.execute(f"CREATE INDEX {index} ON {_q(name)} ({', '.join(map(_q, columns))})")
+
+
+def build_database(data_dir, path, engine=None, chunk_rows=CHUNK_ROWS):
+    """Copy the seven tables of ``data_dir`` into a new database at ``path``; returns row counts.
+
+    Tables are streamed in chunks, so the data never has to fit in memory.
+    The file is built under a temporary name and moved into place when complete.
+    """
+    engine = engine or engine_for(path)
+    tmp = f"{path}.tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    con = connect(tmp, engine)
+    rows = {}
+    try:
+        for name in storage.TABLE_NAMES:
+            rows[name] = 0
+            for df in _chunks(data_dir, name, chunk_rows):
+                if rows[name] == 0:
+                    _create_table(con, name, [c for c in storage.TABLES[name] if c in df.columns])
+                _insert(con, engine, name, df)
+                rows[name] += len(df)
+            _create_indexes(con, name)
+        con.commit()
+    finally:
+        con.close()
+    os.replace(tmp, path)
+    return rows
+
+
+def open_store(data_dir=".", path=None, engine="sqlite"):
+    """SqlStore over ``path`` (default ``<data_dir>/dashboard.<engine>``), built on first use."""
+    path = path or os.path.join(data_dir, DB_FILES[engine])
+    if not os.path.exists(path):
+        build_database(data_dir, path, engine)
+    return SqlStore(path, engine)
+
+
+class SqlKpis:
+    """``KpiCube.query`` answered with one aggregate query per source table."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def query(self, report=None, start=None, end=None):
+        result = {}
+        for name, aggregates in KPI_AGGREGATES.items():
+            where, params = self.store.where(name, report, start, end)
+            select = ", ".join(f"{sql} AS {_q(measure)}" for measure, sql in aggregates.items())
+            values = self.store.query(f"SELECT {select} FROM {_q(name)}{where}", params).iloc[0]
+            result.update(values.to_dict())
+        return {measure: float(result[measure]) if measure == 'sentiment_sum' else int(result[measure])
+                for measure in MEASURES}
+
+
+class SqlLifecycles(LifecycleQueries):
+    """``LifecycleIndex`` queries answered from item counts grouped by start and end date in SQL.
+
+    Only the counts per distinct date come back into Python, and nothing is
+    kept between queries but the team's (first start, last event) span of
+    the current table version.
+    """
+
+    def __init__(self, store, name, start_col, end_col):
+        self.store, self.name = store, name
+        self.start, self.end = _q(start_col), _q(end_col)
+        # An end before the start closes the item the day it opened
+        self.closed_at = f"CASE WHEN {self.end} < {self.start} THEN {self.start} ELSE {self.end} END"
+        self._span = None
+
+    def _after(self, days):
+        if self.store.engine == "duckdb":
+            return f"{self.start} + INTERVAL {int(days)} DAY"
+        return f"datetime({self.start}, '+{int(days)} days')"
+
+    def _grouped(self, at, report, *conditions):
+        where, params = self.store.where(self.name, report, None, None, f"{self.start} IS NOT NULL", *conditions)
+        over = ", ".join(f"SUM(CASE WHEN {self.end} IS NULL OR {self.end} > {self._after(edge)} THEN 1 ELSE 0 END) "
+                         f"AS {_q(f'over_{edge}')}" for edge in AGE_EDGES_DAYS)
+        return self.store.query(f'SELECT {at} AS "at", COUNT(*) AS "items", {over} FROM {_q(self.name)}{where} '
+                                f"GROUP BY 1 ORDER BY 1", params)
+
+    def span(self):
+        """(first start, last start or end) of the whole team; NaT when there are no items."""
+        version = self.store.version_of(self.name)
+        if self._span is None or self._span[0] != version:
+            first, last_start, last_end = self.store.query(
+                f"SELECT MIN({self.start}), MAX({self.start}), MAX({self.closed_at}) FROM {_q(self.name)} "
+                f"WHERE {self.start} IS NOT NULL").iloc[0]
+            last = max(pd.Timestamp(last_start), pd.Timestamp(last_end)) if not pd.isna(last_end) else last_start
+            self._span = version, (pd.Timestamp(first), pd.Timestamp(last))
+        return self._span[1]
+
+    def _lifecycle(self, report):
+        # One lock for the three queries, so an append cannot land between them
+        with self.store.lock:
+            starts = self._grouped(self.start, report)
+            ends = self._grouped(self.closed_at, report, f"{self.end} IS NOT NULL")
+            span = self.span()
+        return grouped_lifecycle(starts, ends, *span)
+
+    def open_during(self, report=TEAM, start=None, end=None):
+        """Items open at any time in [``start``, ``end``], counted by one query."""
+        first, last = self.span()
+        start = start if start is not None else first
+        end = end if end is not None else last
+        if pd.isna(start) or pd.isna(end):
+            return 0
+        # Open then unless started after the window or ended by its start
+        where, params = self.store.where(self.name, report, None, None, f"{self.start} <= ?",
+                                         f"({self.end} IS NULL OR {self.closed_at} > ?)")
+        params = [self.store._timestamp(end), self.store._timestamp(start)] + params
+        count = self.store.query(f'SELECT COUNT(*) AS "count" FROM {_q(self.name)}{where}', params)
+        return int(count['count'].iloc[0])
+
+
+class SqlTopicTimes:
+    """``TopicCube`` queries answered from topic time and mentions grouped per day in SQL.
+
+    Each query groups the selected report's topics rows in the days it needs
+    by (day, topic), and answers from a ``TopicCube`` over just those totals,
+    which is dropped afterwards.
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    def _span(self, report):
+        """(first, last) day of ``report``'s topics; NaT when there are none."""
+        where, params = self.store.where('topics', report, None, None, '"topic" IS NOT NULL')
+        first, last = self.store.query(f'SELECT MIN("meeting_date"), MAX("meeting_date") FROM "topics"{where}',
+                                       params).iloc[0]
+        first, last = pd.DatetimeIndex([pd.Timestamp(first), pd.Timestamp(last)]).normalize()
+        return first, last
+
+    def _window(self, report, start, end):
+        """Days of the window ends, defaulting to the first and last day of ``report``'s topics."""
+        if start is None or end is None:
+            first, last = self._span(report)
+            if pd.isna(first):
+                # As in TopicCube, a report without topics defaults to the team's first day
+                first = last = self._span(TEAM)[0]
+            start = first if start is None else start
+            end = last if end is None else end
+        if pd.isna(start) or pd.isna(end):
+            return None, None
+        return pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+
+    def _cube(self, report, first=None, last=None):
+        """Cube over ``report``'s minutes and mentions per (day, topic) from day ``first`` to ``last``."""
+        conditions, params = ['"topic" IS NOT NULL'], []
+        if first is not None:
+            conditions.append('"meeting_date" >= ?')
+            params.append(self.store._timestamp(first))
+        if last is not None:
+            conditions.append('"meeting_date" < ?')
+            params.append(self.store._timestamp(last + pd.Timedelta(days=1)))
+        where, report_params = self.store.where('topics', report, None, None, *conditions)
+        day = 'CAST("meeting_date" AS DATE)' if self.store.engine == "duckdb" else 'date("meeting_date")'
+        daily = self.store.query(f'SELECT {day} AS "day", "topic", COALESCE(SUM("time_spent_mins"), 0) AS "minutes", '
+                                 f'COUNT(*) AS "mentions" FROM "topics"{where} GROUP BY 1, 2', params + report_params)
+        # The cube's team is the selection
+        daily = daily.assign(direct_report='selection', day=pd.to_datetime(daily['day']))
+        return TopicCube(daily.set_index(['direct_report', 'day', 'topic']))
+
+    def totals(self, report=TEAM, start=None, end=None):
+        """Minutes and mentions per topic in [``start``, ``end``], most discussed first."""
+        start, end = self._window(report, start, end)
+        return self._cube(report, start, end).totals(TEAM, start, end)
+
+    def rolling_share(self, report=TEAM, start=None, end=None, days=ROLLING_DAYS, step=STEP_DAYS):
+        """Share of discussion time per topic over the ``days`` before each point, every ``step`` days."""
+        start, end = self._window(report, start, end)
+        first = start - pd.Timedelta(days=days - 1) if start is not None else None
+        return self._cube(report, first, end).rolling_share(TEAM, start, end, days, step)
+
+    def shifts(self, report=TEAM, end=None, days=ROLLING_DAYS, threshold=SHIFT_THRESHOLD):
+        """Each topic's share of time in the last ``days`` up to ``end`` against the ``days`` before."""
+        _, end = self._window(report, None, end)
+        first = end - pd.Timedelta(days=2 * days - 1) if end is not None else None
+        return self._cube(report, first, end).shifts(TEAM, end, days, threshold)
+
+
+class SqlStore:
+    """The dashboard tables in an embedded database, queried through the DataStore interface.
+
+    Filters, groupings and top-n selections run in SQL, so only their
+    results become DataFrames. Rows come back in the same (report, date)
+    order as DataStore slices. Queries share one connection and are
+    serialized by ``lock``; ``append`` inserts rows and bumps the table's
+    version, as ``DataStore.append`` does, and records the incoming file
+    they came from so it is not appended again after a restart. The topic
+    times (``topic_times``) and the action item and blocker lifecycles
+    (``lifecycles``) are grouped in SQL per query. Two indexes are kept in
+    memory, built from their tables in chunks: the OKR status table
+    (``okrs``), which holds the last few readings of each OKR, and the
+    full-text index (``search``). The search index holds every indexed
+    row's postings, report, date and text codes, so its memory grows with
+    the number of rows (O(rows)), like the in-memory backend's. Its row
+    labels are positions in the (report, date) order of ``chunks``, with
+    appended rows numbered after them.
+    """
+
+    def __init__(self, path, engine=None):
+        self.engine = engine or engine_for(path)
+        self.con = connect(path, self.engine)
+        self.lock = threading.RLock()
+        self.con.execute(f'CREATE TABLE IF NOT EXISTS {_q(INGESTED_TABLE)} ("file" VARCHAR PRIMARY KEY)')
+        self.con.commit()
+        self.kpis = SqlKpis(self)
+        self.okrs = self._okr_snapshot()
+        self.topic_times = SqlTopicTimes(self)
+        self.lifecycles = {name: SqlLifecycles(self, name, start, end) for name, (start, end) in LIFECYCLES.items()}
+        self.search = SearchIndex.from_chunks({name: self.chunks(name, index_columns(name)) for name in SEARCH_COLUMNS})
+        self.versions = {name: 0 for name in storage.TABLE_NAMES}
+
+    @property
+    def version(self):
+        """Overall data version; increases with every append."""
+        return sum(self.versions.values())
+
+    def version_of(self, *names):
+        """Version stamp of the given tables, for use in cache keys."""
+        return tuple(self.versions[name] for name in names)
+
+    def query(self, sql, params=()):
+        """Run ``sql`` and return its result as a DataFrame."""
+        with self.lock:
+            cursor = self.con.execute(sql, list(params))
+            if self.engine == "duckdb":
+                return cursor.df()
+            columns = [description[0] for description in cursor.description]
+            return pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+
+    def _timestamp(self, value):
+        value = pd.Timestamp(value)
+        return value.to_pydatetime() if self.engine == "duckdb" else value.strftime(TIMESTAMP_FORMAT)
+
+    def where(self, name, report=None, start=None, end=None, *conditions):
+        """WHERE clause (with a leading space, or empty) and parameters for a selection."""
+        conditions, params = list(conditions), []
+        if report is not None:
+            conditions.append('"direct_report" = ?')
+            params.append(report)
+        date_col = DATE_COLUMNS.get(name)
+        if date_col and start is not None:
+            conditions.append(f"{_q(date_col)} >= ?")
+            params.append(self._timestamp(start))
+        if date_col and end is not None:
+            conditions.append(f"{_q(date_col)} <= ?")
+            params.append(self._timestamp(end))
+        return (" WHERE " + " AND ".join(conditions)) if conditions else "", params
+
+    def _order(self, name, descending=False):
+        # Rows by report then date; newest-first ties break like DataStore.latest (last report first)
+        date_col = DATE_COLUMNS.get(name)
+        keys = [date_col, "direct_report"] if descending else ["direct_report", date_col]
+        direction = " DESC" if descending else ""
+        return " ORDER BY " + ", ".join(f"{_q(key)}{direction}" for key in keys + ["rowid"] if key)
+
+    def reports(self):
+        """Sorted direct reports that have at least one meeting."""
+        return self.query('SELECT DISTINCT "direct_report" FROM "meetings" ORDER BY 1')['direct_report'].tolist()
+
+    def columns(self, name):
+        with self.lock:
+            cursor = self.con.execute(f"SELECT * FROM {_q(name)} LIMIT 0")
+            return [description[0] for description in cursor.description]
+
+    def date_range(self, name):
+        """(first, last) date of dated table ``name``; NaT when it is empty."""
+        date_col = _q(DATE_COLUMNS[name])
+        first, last = self.query(f"SELECT MIN({date_col}), MAX({date_col}) FROM {_q(name)}").iloc[0]
+        return pd.Timestamp(first), pd.Timestamp(last)
+
+    def table(self, name, report=None, start=None, end=None):
+        """Rows of table ``name`` for ``report`` dated within [``start``, ``end``]."""
+        where, params = self.where(name, report, start, end)
+        return storage.coerce(self.query(f"SELECT * FROM {_q(name)}{where}{self._order(name)}", params), name)
+
+    def latest(self, name, n, report=None, start=None, end=None):
+        """The ``n`` most recent rows of dated table ``name`` in the selection, oldest first."""
+        where, params = self.where(name, report, start, end)
+        sql = f"SELECT * FROM {_q(name)}{where}{self._order(name, descending=True)} LIMIT ?"
+        return storage.coerce(self.query(sql, params + [int(n)]).iloc[::-1], name)
+
+    def select(self, report=None, start=None, end=None):
+        """All tables restricted to ``report`` and the date window, keyed by table name."""
+        return {name: self.table(name, report, start, end) for name in storage.TABLE_NAMES}
+
+    def count(self, name, report=None, start=None, end=None):
+        """Number of rows of table ``name`` in the selection."""
+        where, params = self.where(name, report, start, end)
+        return int(self.query(f'SELECT COUNT(*) AS "count" FROM {_q(name)}{where}', params)['count'].iloc[0])
+
+    def page(self, name, first, last, report=None, start=None, end=None):
+        """Rows [``first``, ``last``) of the selection of table ``name``, in table order."""
+        where, params = self.where(name, report, start, end)
+        sql = f"SELECT * FROM {_q(name)}{where}{self._order(name)} LIMIT ? OFFSET ?"
+        return storage.coerce(self.query(sql, params + [int(last - first), int(first)]), name)
+
+    def active_blockers(self, first, last, report=None, start=None, end=None):
+        """Rows [``first``, ``last``) of the active blockers in the selection, by severity then most recent."""
+        where, params = self.where('blockers', report, start, end, """"status" = 'Active'""")
+        rank = " ".join(f"WHEN '{severity}' THEN {rank}" for severity, rank in SEVERITY_RANK.items())
+        params = params + [int(last - first), int(first)]
+        # Ties keep table order, as nlargest does in DataStore.active_blockers
+        sql = (f'SELECT * FROM "blockers"{where} ORDER BY CASE "severity" {rank} ELSE -1 END DESC, '
+               f'"first_mentioned" DESC NULLS LAST, "direct_report", rowid LIMIT ? OFFSET ?')
+        return storage.coerce(self.query(sql, params), 'blockers')
+
+    def chunks(self, name, columns=None, chunk_rows=CHUNK_ROWS):
+        """Every row of table ``name`` in (report, date) order, ``chunk_rows`` at a time.
+
+        The rows are read through a cursor of their own and the lock is only
+        held while a chunk is fetched, so the caller and other sessions can
+        query the store between chunks (rows appended meanwhile may or may not
+        be included).
+        """
+        columns = columns or self.columns(name)
+        with self.lock:
+            cursor = self.con.cursor()
+            cursor.execute(f"SELECT {', '.join(map(_q, columns))} FROM {_q(name)}{self._order(name)}")
+        try:
+            while True:
+                with self.lock:
+                    records = cursor.fetchmany(chunk_rows)
+                yield storage.coerce(pd.DataFrame.from_records(records, columns=columns), name)
+                if len(records) < chunk_rows:
+                    return
+        finally:
+            cursor.close()
+
+    def counts(self, name, column, report=None, start=None, end=None):
+        """Rows per value of ``column`` in the selection, indexed by value in sorted order."""
+        where, params = self.where(name, report, start, end, f"{_q(column)} IS NOT NULL")
+        counts = self.query(f'SELECT {_q(column)}, COUNT(*) AS "count" FROM {_q(name)}{where} '
+                            f'GROUP BY {_q(column)} ORDER BY {_q(column)}', params)
+        return pd.Series(counts['count'].to_numpy(), name='count',
+                         index=pd.Index(counts[column].astype(str), name=column))
+
+    def trend(self, name, column, report=None, start=None, end=None):
+        """Mean ``column`` per (direct_report, date) of dated table ``name``, by report then date."""
+        date_col = DATE_COLUMNS[name]
+        keys = f'"direct_report", {_q(date_col)}'
+        where, params = self.where(name, report, start, end)
+        trend = self.query(f"SELECT {keys}, AVG({_q(column)}) AS {_q(column)} FROM {_q(name)}{where} "
+                           f"GROUP BY {keys} ORDER BY {keys}", params)
+        trend[date_col] = pd.to_datetime(trend[date_col])
+        return trend
+
+    def _okr_snapshot(self):
+        # Only the last few readings per OKR are retained, so memory stays bounded
+        snapshot = None
+        for chunk in self.chunks('metrics', READING_COLUMNS):
+            if snapshot is None:
+                snapshot = OkrSnapshot(chunk)
+            else:
+                snapshot.update(chunk)
+        return snapshot
+
+    def okr_snapshot(self, report=None, start=None, end=None):
+        """OKR status of every (direct_report, metric) in the selection (see ``okr.COLUMNS``).
+
+        Read from the in-memory status table unless the date window cuts into
+        the readings it was computed from; then it is computed from the window.
+        """
+        snapshot = self.okrs.select(report, start, end)
+        if snapshot is None:
+            snapshot = OkrSnapshot(self.table('metrics', report, start, end), self.okrs.points).table
+        return snapshot
+
+    def ingested(self):
+        """Names of the incoming files whose rows are in the database."""
+        return set(self.query(f'SELECT "file" FROM {_q(INGESTED_TABLE)}')['file'])
+
+    def append(self, name, rows, source=None):
+        """Insert new ``rows`` into table ``name``; ``source`` is the incoming file they came from."""
+        with self.lock:
+            if source is not None:
+                self.con.execute(f'INSERT INTO {_q(INGESTED_TABLE)} ("file") VALUES (?)', [source])
+            if len(rows) == 0:
+                self.con.commit()
+                return
+            _insert(self.con, self.engine, name, rows)
+            self.con.commit()
+            if name == 'metrics':
+                self.okrs.update(rows)
+            self.search.update(name, rows)
+            self.versions[name] += 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load the dashboard tables into an embedded SQL database")
+    parser.add_argument("data_dir", nargs="?", default=".")
+    parser.add_argument("--engine", choices=ENGINES, default="sqlite")
+    parser.add_argument("--db", default=None, help="defaults to <data_dir>/dashboard.<engine>")
+    args = parser.parse_args(argv)
+
+    path = args.db or os.path.join(args.data_dir, DB_FILES[args.engine])
+    rows = build_database(args.data_dir, path, args.engine)
+    print(f"[SUCCESS] Loaded the tables into {path}:")
+    for name, count in rows.items():
+        print(f"  - {name} ({count} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Columnar storage layer for the 1:1 dashboard tables
+Keeps each table as a typed Parquet file (dates already parsed, categorical
+dtypes) and falls back to the original CSV files when no Parquet copy exists
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet support is optional; CSV still works without it
+    pa = None
+    pq = None
+
+# ===== TABLE SCHEMA =====
+# Column -> logical type. "datetime" columns are parsed once and stored as
+# timestamps, "category" columns (low-cardinality labels repeated on every
+# row) are dictionary encoded on read, and counts use the narrowest integer
+# type that fits their range. Measurements stay float64 so values and sums
+# match the source data exactly.
+TABLES = {
+    "meetings": {
+        "date": "datetime", "direct_report": "category", "role": "category",
+        "duration_mins": "int16", "sentiment_score": "float64",
+    },
+    "topics": {
+        "meeting_date": "datetime", "direct_report": "category", "topic": "category",
+        "time_spent_mins": "int16", "priority": "category",
+    },
+    "action_items": {
+        "created_date": "datetime", "direct_report": "category", "action": "string",
+        "owner": "category", "status": "category", "completed_date": "datetime",
+    },
+    "metrics": {
+        "date": "datetime", "direct_report": "category", "metric": "category",
+        "target": "float64", "actual": "float64", "unit": "category",
+    },
+    "blockers": {
+        "first_mentioned": "datetime", "direct_report": "category", "blocker": "string",
+        "severity": "category", "status": "category", "resolved_date": "datetime",
+    },
+    "growth_areas": {
+        "direct_report": "category", "area": "string", "progress_level": "int8",
+        "activities": "string",
+    },
+    "communication": {
+        "meeting_date": "datetime", "direct_report": "category", "manager_questions": "int16",
+        "dr_questions": "int16", "dr_hedge_words": "int16", "dr_avg_response_length": "int32",
+    },
+    # Reporting lines, one row per person; the top of the tree has no manager
+    "org": {"person": "string", "manager": "string"},
+}
+
+ORG_TABLE = "org"
+# The seven dashboard tables; the org chart is optional and read on its own
+TABLE_NAMES = [name for name in TABLES if name != ORG_TABLE]
+
+# Columns each dashboard section reads, so loaders can skip the rest
+SECTION_COLUMNS = {
+    "filters": {"meetings": ["date", "direct_report"]},
+    "kpi": {
+        "meetings": ["date", "direct_report", "sentiment_score"],
+        "action_items": ["created_date", "direct_report", "status"],
+        "blockers": ["first_mentioned", "direct_report", "status"],
+    },
+    "sentiment": {
+        "meetings": ["date", "direct_report", "sentiment_score"],
+        "communication": ["meeting_date", "direct_report", "dr_hedge_words"],
+    },
+    "okr": {"metrics": ["date", "direct_report", "metric", "target", "actual", "unit"]},
+    "topics": {"topics": ["meeting_date", "direct_report", "topic", "time_spent_mins", "priority"]},
+    "actions": {"action_items": ["created_date", "direct_report", "action", "owner", "status", "completed_date"]},
+    "blockers": {"blockers": ["first_mentioned", "direct_report", "blocker", "severity", "status", "resolved_date"]},
+    "growth": {"growth_areas": ["direct_report", "area", "progress_level", "activities"]},
+}
+
+
+def columns_for(*sections):
+    """Union of the columns needed by ``sections``, in schema order, per table."""
+    wanted = {}
+    for section in sections:
+        for name, columns in SECTION_COLUMNS[section].items():
+            wanted.setdefault(name, set()).update(columns)
+    return {name: [c for c in TABLES[name] if c in cols] for name, cols in wanted.items()}
+
+
+def _columns_of(name, kind, columns=None):
+    return [c for c, t in TABLES[name].items() if t == kind and (columns is None or c in columns)]
+
+
+def table_path(data_dir, name, fmt="parquet"):
+    return os.path.join(data_dir, f"data_{name}.{fmt}")
+
+
+def table_exists(data_dir, name):
+    """Whether ``data_dir`` holds table ``name`` in a format ``read_table`` can read."""
+    parquet = pq is not None and os.path.exists(table_path(data_dir, name))
+    return parquet or os.path.exists(table_path(data_dir, name, "csv"))
+
+
+def _has_kind(dtype, kind):
+    if kind == "datetime":
+        return pd.api.types.is_datetime64_dtype(dtype)
+    if kind == "category":
+        return isinstance(dtype, pd.CategoricalDtype)
+    if kind == "string":
+        return pd.api.types.is_string_dtype(dtype) and not isinstance(dtype, pd.CategoricalDtype)
+    return dtype == kind
+
+
+def _downcast(values, kind, column):
+    """Cast to integer type ``kind``, refusing values that would wrap around."""
+    if pd.api.types.is_integer_dtype(values.dtype) and len(values):
+        info = np.iinfo(kind)
+        if values.min() < info.min or values.max() > info.max:
+            raise ValueError(f"{column} has values outside the {kind} range")
+    return values.astype(kind)
+
+
+def coerce(df, name):
+    """Cast a raw frame to the schema dtypes of table ``name``.
+
+    Columns that already have their schema dtype are left as they are, and
+    the input frame is never modified.
+    """
+    df = df.copy(deep=False)
+    for column, kind in TABLES[name].items():
+        if column not in df.columns or _has_kind(df[column].dtype, kind):
+            continue
+        if kind == "datetime":
+            df[column] = pd.to_datetime(df[column])
+        elif kind == "category":
+            df[column] = df[column].astype("category")
+        elif kind == "string":
+            df[column] = df[column].astype(object)
+        elif kind.startswith("int"):
+            df[column] = _downcast(df[column], kind, column)
+        else:
+            df[column] = df[column].astype(kind)
+    return df
+
+
+def arrow_schema(name):
+    """Arrow schema used on disk; categoricals are stored as plain strings."""
+    types = {
+        "datetime": pa.timestamp("ns"), "category": pa.string(), "string": pa.string(),
+        "int8": pa.int8(), "int16": pa.int16(), "int32": pa.int32(), "int64": pa.int64(),
+        "float64": pa.float64(),
+    }
+    return pa.schema([(column, types[kind]) for column, kind in TABLES[name].items()])
+
+
+def read_table(name, data_dir=".", columns=None):
+    """Read one table with its schema dtypes, preferring Parquet and projecting to ``columns``."""
+    path = table_path(data_dir, name)
+    if pq is not None and os.path.exists(path):
+        table = pq.read_table(path, columns=columns,
+                              read_dictionary=_columns_of(name, "category", columns))
+        # Files written before a column was narrowed are cast on read
+        return coerce(table.to_pandas(), name)
+
+    categories = _columns_of(name, "category", columns)
+    df = pd.read_csv(table_path(data_dir, name, "csv"), usecols=columns,
+                     parse_dates=_columns_of(name, "datetime", columns),
+                     dtype={column: "category" for column in categories})
+    return coerce(df if columns is None else df[columns], name)
+
+
+def load_tables(data_dir=".", columns=None):
+    """Load all seven tables; ``columns`` maps table name -> columns to read."""
+    columns = columns or {}
+    return {name: read_table(name, data_dir, columns.get(name)) for name in TABLE_NAMES}
+
+
+def to_arrow(df, name):
+    """Convert a frame of table ``name`` to an Arrow table with the on-disk schema."""
+    df = coerce(df, name).astype({c: object for c in _columns_of(name, "category")})
+    return pa.Table.from_pandas(df, schema=arrow_schema(name), preserve_index=False)
+
+
+def write_table(df, name, out_dir="."):
+    """Write a full table to ``data_<name>.parquet``."""
+    pq.write_table(to_arrow(df, name), table_path(out_dir, name))
+
+
+class ParquetChunkWriter:
+    """Append generated chunks as row groups of the ``data_<table>.parquet`` files."""
+
+    def __init__(self, out_dir):
+        if pq is None:
+            raise ImportError("pyarrow is required to write Parquet files")
+        self.out_dir = out_dir
+        self.rows = {}
+        self._writers = {}
+        os.makedirs(out_dir, exist_ok=True)
+
+    def write(self, name, df):
+        if name not in self._writers:
+            self._writers[name] = pq.ParquetWriter(table_path(self.out_dir, name), arrow_schema(name))
+        self._writers[name].write_table(to_arrow(df, name))
+        self.rows[name] = self.rows.get(name, 0) + len(df)
+
+    def close(self):
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+        return self.rows
+
+
+def convert_csv_to_parquet(src_dir=".", dst_dir=None):
+    """Convert the seven ``data_*.csv`` files (and the org chart, if any) in ``src_dir`` to typed Parquet."""
+    dst_dir = dst_dir or src_dir
+    os.makedirs(dst_dir, exist_ok=True)
+    rows = {}
+    optional = [ORG_TABLE] if os.path.exists(table_path(src_dir, ORG_TABLE, "csv")) else []
+    for name in TABLE_NAMES + optional:
+        df = pd.read_csv(table_path(src_dir, name, "csv"))
+        write_table(df, name, dst_dir)
+        rows[name] = len(df)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert dashboard CSVs to typed Parquet files")
+    parser.add_argument("src_dir", nargs="?", default=".")
+    parser.add_argument("--out-dir", default=None, help="defaults to the source directory")
+    args = parser.parse_args(argv)
+
+    rows = convert_csv_to_parquet(args.src_dir, args.out_dir)
+    print("[SUCCESS] Converted CSV tables to Parquet:")
+    for name, count in rows.items():
+        print(f"  - data_{name}.parquet ({count} rows)")
+
+
+if __name__ == "__main__":
+    main()
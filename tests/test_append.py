@@ -0,0 +1,165 @@
+"""
+Appending rows to the indexes must give what building them from all rows gives
+Each table is split by date into batches, with some reports only appearing in
+later batches, and the first batch's index has the rest appended to it
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import generate_synthetic_data
+import storage
+from aggregates import KpiCube
+from datastore import DATE_COLUMNS, DataStore, TableIndex, _bound
+from okr import OkrSnapshot
+from topic_analytics import TopicCube
+
+BATCHES = 4
+
+
+@pytest.fixture(scope="module")
+def tables(tmp_path_factory):
+    out_dir = tmp_path_factory.mktemp("data")
+    generate_synthetic_data.generate_scaled_dataset(out_dir, managers=2, reports_per_manager=4, weeks=12,
+                                                    fmt="parquet")
+    return storage.load_tables(out_dir, columns=storage.columns_for(*storage.SECTION_COLUMNS))
+
+
+def split(tables, batches=BATCHES):
+    """(first, later): the tables before the first date cutoff, and later batches of them.
+
+    Two reports are held back from the first batch so appends also bring new reports;
+    undated tables only have a second batch, those reports' rows.
+    """
+    reports = sorted(tables['meetings']['direct_report'].astype(str).unique())
+    held_back = set(reports[-2:])
+    dates = tables['meetings']['date']
+    cutoffs = pd.date_range(dates.min(), dates.max(), periods=batches + 1)[1:-1]
+    first, later = {}, [{} for _ in cutoffs]
+    for name, df in tables.items():
+        date_col = DATE_COLUMNS.get(name)
+        held = df['direct_report'].astype(str).isin(held_back).to_numpy()
+        if date_col is None:
+            first[name] = df[~held]
+            later[0][name] = df[held]
+            continue
+        batch = np.searchsorted(cutoffs.to_numpy(), df[date_col].to_numpy(), side='right')
+        # Held-back reports start in the second batch
+        batch = np.where(held, np.maximum(batch, 1), batch)
+        first[name] = df[batch == 0]
+        for i in range(len(cutoffs)):
+            later[i][name] = df[batch == i + 1]
+    return first, later
+
+
+def _plain(df):
+    # Categories of appended rows are added in arrival order, so compare the values
+    categorical = [c for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)]
+    return df.reset_index(drop=True).astype(dict.fromkeys(categorical, str))
+
+
+def _sorted(df):
+    # The "All" view's row order among reports depends on where new reports were placed
+    return _plain(df).sort_values(list(df.columns), kind='stable', ignore_index=True)
+
+
+def windows(tables):
+    dates = tables['meetings']['date']
+    middle = dates.min() + (dates.max() - dates.min()) / 2
+    return [(None, None), (dates.min(), middle), (middle, None), (middle, middle + pd.Timedelta(days=10))]
+
+
+def selections(tables):
+    return [None] + sorted(tables['meetings']['direct_report'].astype(str).unique())
+
+
+def test_table_index_append_matches_build(tables):
+    first, later = split(tables)
+    for name, df in tables.items():
+        date_col = DATE_COLUMNS.get(name)
+        built = TableIndex.build(df, date_col)
+        appended = TableIndex.build(first[name], date_col)
+        for batch in later:
+            if name in batch:
+                appended = appended.appended(batch[name])
+
+        # Reports new to the index are placed after the known ones, so compare slice by slice
+        assert appended.partitions.keys() == built.partitions.keys()
+        for report, (lo, hi) in built.partitions.items():
+            new_lo, new_hi = appended.partitions[report]
+            pd.testing.assert_frame_equal(_plain(appended.df.iloc[new_lo:new_hi]), _plain(built.df.iloc[lo:hi]))
+        if date_col:
+            np.testing.assert_array_equal(appended.sorted_dates, built.sorted_dates)
+            np.testing.assert_array_equal(appended.df[date_col].to_numpy()[appended.date_order],
+                                          appended.sorted_dates)
+        for report in selections(tables):
+            for start, end in windows(tables):
+                start, end = _bound(start), _bound(end)
+                pd.testing.assert_frame_equal(_sorted(appended.select(report, start, end)),
+                                              _sorted(built.select(report, start, end)))
+
+
+def test_kpi_cube_update_matches_build(tables):
+    first, later = split(tables)
+    built = KpiCube(tables)
+    updated = KpiCube(first)
+    for batch in later:
+        for name, rows in batch.items():
+            updated.update(name, rows)
+
+    for report in selections(tables):
+        for start, end in windows(tables):
+            assert updated.query(report, start, end) == pytest.approx(built.query(report, start, end))
+
+
+def test_okr_snapshot_update_matches_build(tables):
+    first, later = split(tables)
+    built = OkrSnapshot(tables['metrics'])
+    updated = OkrSnapshot(first['metrics'])
+    for batch in later:
+        updated.update(batch['metrics'])
+
+    keys = ['direct_report', 'metric']
+    pd.testing.assert_frame_equal(_plain(updated.table).sort_values(keys, ignore_index=True),
+                                  _plain(built.table).sort_values(keys, ignore_index=True))
+
+
+def test_topic_cube_update_matches_build(tables):
+    first, later = split(tables)
+    built = TopicCube.from_rows([tables['topics']])
+    # Newest batch first, so appends also bring days before the cube's first day
+    batches = [batch['topics'] for batch in reversed(later)] + [first['topics']]
+    updated = TopicCube.from_rows([batches[0]])
+    for rows in batches[1:]:
+        updated.update(rows)
+
+    for report in selections(tables):
+        for start, end in windows(tables):
+            pd.testing.assert_frame_equal(updated.totals(report, start, end), built.totals(report, start, end))
+            pd.testing.assert_frame_equal(updated.rolling_share(report, start, end),
+                                          built.rolling_share(report, start, end))
+            pd.testing.assert_frame_equal(updated.shifts(report, end), built.shifts(report, end))
+
+
+def test_data_store_append_matches_build(tables):
+    first, later = split(tables)
+    built = DataStore(tables)
+    appended = DataStore(first)
+    for batch in later:
+        for name, rows in batch.items():
+            appended.append(name, rows)
+
+    for report in selections(tables):
+        for start, end in windows(tables):
+            assert appended.kpis.query(report, start, end) == pytest.approx(built.kpis.query(report, start, end))
+            pd.testing.assert_frame_equal(appended.topic_times.totals(report, start, end),
+                                          built.topic_times.totals(report, start, end))
+            for name in appended.lifecycles:
+                pd.testing.assert_frame_equal(appended.lifecycles[name].burndown(report, start, end),
+                                              built.lifecycles[name].burndown(report, start, end))
+                pd.testing.assert_frame_equal(appended.lifecycles[name].aging(report, start, end),
+                                              built.lifecycles[name].aging(report, start, end))
+            for query in ("fo", "review", "pub sp"):
+                appended_counts = appended.search.search(query, report, start, end)[1]
+                pd.testing.assert_series_equal(appended_counts, built.search.search(query, report, start, end)[1])
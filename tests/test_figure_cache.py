@@ -0,0 +1,82 @@
+"""
+The figure cache evicts least recently used entries, survives a restart
+through its disk store, and stops serving entries once a data file changes
+"""
+
+import os
+
+import plotly.graph_objects as go
+
+import figure_cache
+from instrumentation import Registry
+
+
+def _cache(**kwargs):
+    return figure_cache.FigureCache(registry=Registry(), **kwargs)
+
+
+def test_lru_evicts_the_least_recently_used_entry():
+    cache = _cache(max_bytes=30)
+    for key in "abc":
+        cache.put(key, key * 10)
+    assert cache.get("a") == "a" * 10     # "a" is now the most recently used
+    cache.put("d", "d" * 10)
+
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in "acd"] == ["a" * 10, "c" * 10, "d" * 10]
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] == 30
+    # A document larger than the whole cache is not kept
+    cache.put("e", "e" * 31)
+    assert cache.get("e") is None and cache.stats()["entries"] == 3
+
+
+def test_disk_store_round_trip(tmp_path):
+    builds = []
+
+    def figure(report):
+        builds.append(report)
+        return go.Figure(go.Bar(x=["a", "b"], y=[1, 2], name=report)), report.upper(), 3
+
+    cache = _cache(directory=str(tmp_path))
+    built = cache.cached(figure)("alex")
+    assert len(os.listdir(tmp_path)) == 1
+
+    # A new process starts with an empty memory cache and reads the file instead of rebuilding
+    restarted = _cache(directory=str(tmp_path))
+    fig, label, count = restarted.cached(figure)("alex")
+    assert builds == ["alex"]
+    assert restarted.stats()["disk_hits"] == 1
+    assert (fig, label, count) == built
+    assert fig["data"][0]["y"] == [1, 2] and label == "ALEX" and count == 3
+
+
+def test_disk_store_is_trimmed_oldest_first(tmp_path):
+    cache = _cache(directory=str(tmp_path), max_disk_bytes=25)
+    for key in "abc":
+        cache.put(key, key * 10)
+    assert sorted(os.listdir(tmp_path)) == ["b.json", "c.json"]
+
+
+def test_changed_data_file_invalidates_entries(tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    table = data / "data_meetings.csv"
+    table.write_text("date,direct_report\n2025-09-14,Alex Rodriguez\n")
+    store = tmp_path / "figures"
+    builds = []
+
+    def section(report):
+        builds.append(report)
+        return report
+
+    def cache():
+        return _cache(directory=str(store), namespace=figure_cache.data_identity(str(data), [str(table)]))
+
+    cache().cached(section)("alex")
+    cache().cached(section)("alex")
+    assert builds == ["alex"]
+
+    table.write_text("date,direct_report\n2025-09-14,Alex Rodriguez\n2025-09-21,Alex Rodriguez\n")
+    assert cache().cached(section)("alex") == "alex"
+    assert builds == ["alex", "alex"]
@@ -0,0 +1,75 @@
+"""
+Org roll-ups give every node the sum of its own rows and everyone's below it
+Rolled-up totals of a three-level tree are checked against a brute-force sum
+over each node's descendants
+"""
+
+import numpy as np
+import pandas as pd
+
+from orgchart import OrgTree
+
+EDGES = pd.DataFrame({
+    'person': ["Dana CEO", "Victor VP", "Wendy VP", "Alice", "Bob", "Carol"],
+    'manager': [None, "Dana CEO", "Dana CEO", "Victor VP", "Victor VP", "Wendy VP"],
+})
+# Erin has rows but no line in the org file; Zed is not even a known report
+REPORTS = ["Alice", "Bob", "Carol", "Erin"]
+
+
+def _descendants(tree, person):
+    people, stack = [], [person]
+    while stack:
+        people.append(stack.pop())
+        stack.extend(tree.children[people[-1]])
+    return people
+
+
+def _leaf_rows(tree):
+    rng = np.random.default_rng(7)
+    # Victor manages a team and has rows of his own too
+    people = np.array(["Alice", "Bob", "Carol", "Erin", "Victor VP", "Zed"])[rng.integers(0, 6, 200)]
+    days = pd.Timestamp("2025-09-01") + pd.to_timedelta(rng.integers(0, 5, 200), unit='D')
+    rows = pd.DataFrame({'person': people, 'day': days, 'meetings': rng.integers(1, 4, 200),
+                         'sentiment_sum': rng.random(200)})
+    leaf = rows.assign(node=tree.node_ids(rows['person'])).groupby(['node', 'day'])[['meetings', 'sentiment_sum']].sum()
+    return rows, leaf
+
+
+def test_tree_places_people_missing_from_the_org_file_under_the_top():
+    tree = OrgTree(EDGES, REPORTS)
+    assert tree.root == "Dana CEO"
+    assert tree.parent["Erin"] == "Dana CEO"
+    assert tree.depth["Alice"] == 2
+    assert tree.size["Dana CEO"] == 6
+    # Rows of people the tree does not know count towards the top
+    assert list(tree.node_ids(pd.Series(["Zed", "Alice"]))) == [0, tree.ids["Alice"]]
+
+
+def test_roll_up_matches_brute_force_sums():
+    tree = OrgTree(EDGES, REPORTS)
+    rows, leaf = _leaf_rows(tree)
+    rolled = tree.roll_up(leaf)
+
+    nodes = tree.node_ids(rows['person'])
+    assert set(rolled.index.get_level_values(0)) == set(tree.ids.values())
+    for person in tree.order:
+        below = rows[np.isin(nodes, [tree.ids[member] for member in _descendants(tree, person)])]
+        expected = below.groupby('day')[['meetings', 'sentiment_sum']].sum()
+        got = rolled.loc[tree.ids[person]]
+        pd.testing.assert_frame_equal(got, expected, check_names=False)
+
+    # A leaf keeps exactly its own rows, and integer measures stay integers
+    alice = tree.ids["Alice"]
+    pd.testing.assert_frame_equal(rolled.loc[[alice]], leaf.loc[[alice]].astype({'meetings': 'int64'}))
+    assert rolled['meetings'].dtype == np.int64
+
+
+def test_roll_up_of_a_series_sums_counts():
+    tree = OrgTree(EDGES, REPORTS)
+    rows, leaf = _leaf_rows(tree)
+    rolled = tree.roll_up(leaf['meetings'])
+    assert isinstance(rolled, pd.Series)
+    assert rolled.groupby(level=0).sum()[tree.ids["Victor VP"]] == \
+        rows.loc[rows['person'].isin(["Victor VP", "Alice", "Bob"]), 'meetings'].sum()
+    assert rolled.groupby(level=0).sum()[0] == rows['meetings'].sum()
@@ -0,0 +1,93 @@
+"""
+Lexicon scoring handles negations and intensifiers, and the score cache
+only rescores transcripts whose content changed
+"""
+
+import pytest
+
+import sentiment
+
+
+def test_negation_flips_and_dampens():
+    good, not_good, never_bad = sentiment.score_utterances(["good", "not good", "never bad"])
+    assert good > 0 > not_good
+    assert abs(not_good) < good
+    assert never_bad > 0
+
+
+def test_negation_stays_within_its_window_and_utterance():
+    far, split = sentiment.score_utterances(["not that we said much about it good", "not"])
+    assert far > 0
+    # "not" ends the first utterance, so it cannot flip the second
+    _, good = sentiment.score_utterances(["not", "good"])
+    assert good == pytest.approx(sentiment.score_utterances(["good"])[0])
+    assert split == 0
+
+
+def test_intensifiers_strengthen_and_soften():
+    good, very_good, slightly_good, very_bad, bad = sentiment.score_utterances(
+        ["good", "very good", "slightly good", "very bad", "bad"])
+    assert slightly_good < good < very_good
+    assert slightly_good > 0
+    assert very_bad < bad < 0
+    # An intensifier on its own carries no sentiment
+    assert sentiment.score_utterances(["very"])[0] == 0
+
+
+def test_negated_intensified_word_is_negative():
+    not_very_happy, not_happy = sentiment.score_utterances(["not very happy", "not happy"])
+    assert not_very_happy < not_happy < 0
+
+
+def test_score_meetings_is_neutral_without_sentiment():
+    scores = sentiment.score_meetings([["Hello", "See you"], ["This is great"], ["I am stuck and frustrated"]])
+    assert scores[0] == 0.5
+    assert scores[1] > 0.5 > scores[2]
+
+
+def _write(path, *lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_score_cache_rescores_only_changed_transcripts(tmp_path):
+    transcripts = tmp_path / "transcripts"
+    transcripts.mkdir()
+    first = _write(transcripts / "2025-09-14_Alex_Rodriguez.txt", "Sarah Chen: How are things?",
+                   "Alex Rodriguez: Really great, the launch went smoothly.")
+    second = _write(transcripts / "2025-09-15_Javier_Morales.txt", "Sarah Chen: Anything blocking you?",
+                    "Javier Morales: I am stuck on the vendor API.")
+    cache_path = str(tmp_path / "cache.json")
+    version = sentiment.scorer_version()
+
+    cache = sentiment.ScoreCache(cache_path, version)
+    entries, rescored = sentiment.score_transcripts([first, second], cache)
+    assert rescored == 2
+    cache.save(keep=entries)
+
+    cache = sentiment.ScoreCache(cache_path, version)
+    again, rescored = sentiment.score_transcripts([first, second], cache)
+    assert rescored == 0
+    assert again == entries
+
+    # Only the edited transcript is read and scored again
+    old_key = sentiment.file_key(second)
+    _write(transcripts / "2025-09-15_Javier_Morales.txt", "Sarah Chen: Anything blocking you?",
+           "Javier Morales: Resolved, and I am excited about the next project.")
+    cache = sentiment.ScoreCache(cache_path, version)
+    changed, rescored = sentiment.score_transcripts([first, second], cache)
+    assert rescored == 1
+    assert changed[sentiment.file_key(first)] == entries[sentiment.file_key(first)]
+    assert sentiment.file_key(second) != old_key
+    assert entries[old_key]['sentiment_score'] < 0.5 < changed[sentiment.file_key(second)]['sentiment_score']
+
+
+def test_score_cache_ignores_other_scorer_versions(tmp_path):
+    path = _write(tmp_path / "2025-09-14_Alex_Rodriguez.txt", "Alex Rodriguez: Good week.")
+    cache_path = str(tmp_path / "cache.json")
+    cache = sentiment.ScoreCache(cache_path, "old")
+    entries, _ = sentiment.score_transcripts([path], cache)
+    cache.save(keep=entries)
+
+    _, rescored = sentiment.score_transcripts([path], sentiment.ScoreCache(cache_path, sentiment.scorer_version()))
+    assert rescored == 1
@@ -0,0 +1,155 @@
+"""
+The SQL backends answer like the in-memory DataStore on the POC data
+"""
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import lifecycles
+import sql_backend
+import storage
+from datastore import DataStore
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+ENGINES = ["sqlite", pytest.param("duckdb", marks=pytest.mark.skipif(
+    sql_backend.duckdb is None, reason="the duckdb package is not installed"))]
+
+
+@pytest.fixture(scope="module", params=ENGINES)
+def sql_store(request, tmp_path_factory):
+    path = tmp_path_factory.mktemp(request.param) / sql_backend.DB_FILES[request.param]
+    sql_backend.build_database(DATA_DIR, str(path), request.param)
+    store = sql_backend.SqlStore(str(path), request.param)
+    yield store
+    store.con.close()
+
+
+def _query_from_another_thread(store):
+    done = threading.Event()
+    thread = threading.Thread(target=lambda: (store.reports(), done.set()), daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+    return done.is_set()
+
+
+def test_chunks_release_the_lock_between_chunks(sql_store):
+    chunks = sql_store.chunks('topics', chunk_rows=2)
+    first = next(chunks)
+    assert len(first) == 2
+    # Mid-iteration, other sessions (and the caller) can still query
+    assert _query_from_another_thread(sql_store)
+    assert sql_store.date_range('topics')[0] <= first['meeting_date'].min()
+    rest = list(chunks)
+    assert len(first) + sum(len(chunk) for chunk in rest) == len(storage.read_table('topics', DATA_DIR))
+
+    # An abandoned iteration does not keep the store locked
+    next(sql_store.chunks('meetings', chunk_rows=1))
+    assert _query_from_another_thread(sql_store)
+
+
+@pytest.fixture(scope="module")
+def data_store():
+    return DataStore(storage.load_tables(DATA_DIR))
+
+
+def _plain(df):
+    # Categories and string types come from the rows each store read and date units from its driver,
+    # so compare values
+    df = df.reset_index(drop=True)
+    dates = [column for column in df.columns if pd.api.types.is_datetime64_dtype(df[column])]
+    labels = [column for column in df.columns
+              if column not in dates and not pd.api.types.is_numeric_dtype(df[column])]
+    return df.astype({**dict.fromkeys(dates, 'datetime64[ns]'), **dict.fromkeys(labels, object)})
+
+
+def selections(data_store):
+    """("All" or one report, start, end) to compare, each over the full dates and a window."""
+    first, last = data_store.date_range('meetings')
+    middle = first + (last - first) / 2
+    return [(report, start, end) for report in [None, data_store.reports()[0]]
+            for start, end in [(None, None), (first + pd.Timedelta(days=10), middle)]]
+
+
+def test_queries_match_the_data_store(sql_store, data_store):
+    for name in ('meetings', 'topics', 'action_items', 'blockers', 'metrics', 'communication'):
+        assert sql_store.date_range(name) == data_store.date_range(name)
+    for report, start, end in selections(data_store):
+        assert sql_store.kpis.query(report, start, end) == pytest.approx(data_store.kpis.query(report, start, end))
+        for name, column in [('topics', 'topic'), ('topics', 'priority'), ('action_items', 'status'),
+                             ('blockers', 'status')]:
+            pd.testing.assert_series_equal(sql_store.counts(name, column, report, start, end),
+                                           data_store.counts(name, column, report, start, end))
+        for name, column in [('meetings', 'sentiment_score'), ('communication', 'dr_hedge_words')]:
+            pd.testing.assert_frame_equal(_plain(sql_store.trend(name, column, report, start, end)),
+                                          _plain(data_store.trend(name, column, report, start, end)))
+        pd.testing.assert_frame_equal(_plain(sql_store.okr_snapshot(report, start, end)),
+                                      _plain(data_store.okr_snapshot(report, start, end)))
+        pd.testing.assert_frame_equal(_plain(sql_store.latest('action_items', 5, report, start, end)),
+                                      _plain(data_store.latest('action_items', 5, report, start, end)))
+        for first, last in [(0, 3), (3, 100)]:
+            pd.testing.assert_frame_equal(_plain(sql_store.active_blockers(first, last, report, start, end)),
+                                          _plain(data_store.active_blockers(first, last, report, start, end)))
+            for name in ('action_items', 'growth_areas'):
+                pd.testing.assert_frame_equal(_plain(sql_store.page(name, first, last, report, start, end)),
+                                              _plain(data_store.page(name, first, last, report, start, end)))
+        assert sql_store.count('growth_areas', report, start, end) == data_store.count('growth_areas', report,
+                                                                                       start, end)
+
+
+def _assert_same_lifecycles(sql_store, data_store):
+    dates = data_store.date_range('meetings')
+    for name, lifecycle in data_store.lifecycles.items():
+        for report in [None, data_store.reports()[0], "Nobody"]:
+            for start, end in [(None, None), (dates[0] + pd.Timedelta(days=20), dates[1])]:
+                pd.testing.assert_frame_equal(sql_store.lifecycles[name].burndown(report, start, end),
+                                              lifecycle.burndown(report, start, end))
+                pd.testing.assert_frame_equal(sql_store.lifecycles[name].aging(report, start, end),
+                                              lifecycle.aging(report, start, end))
+                assert sql_store.lifecycles[name].open_during(report, start, end) == \
+                    lifecycle.open_during(report, start, end)
+            days = pd.date_range(dates[0], dates[1] + pd.Timedelta(days=30), freq='D').to_numpy()
+            np.testing.assert_array_equal(sql_store.lifecycles[name].open_at(report, days),
+                                          lifecycle.open_at(report, days))
+            np.testing.assert_array_equal(sql_store.lifecycles[name].ages(report, days), lifecycle.ages(report, days))
+
+
+def test_lifecycles_match_the_in_memory_index(sql_store, data_store):
+    _assert_same_lifecycles(sql_store, data_store)
+
+
+def test_topic_times_match_the_in_memory_cube(sql_store, data_store):
+    first, last = data_store.date_range('topics')
+    middle = first + (last - first) / 2
+    for report in [None, data_store.reports()[0], "Nobody"]:
+        for start, end in [(None, None), (first, middle), (middle, None), (middle, middle + pd.Timedelta(days=10))]:
+            pd.testing.assert_frame_equal(sql_store.topic_times.totals(report, start, end),
+                                          data_store.topic_times.totals(report, start, end))
+            pd.testing.assert_frame_equal(sql_store.topic_times.rolling_share(report, start, end),
+                                          data_store.topic_times.rolling_share(report, start, end))
+            pd.testing.assert_frame_equal(sql_store.topic_times.shifts(report, end),
+                                          data_store.topic_times.shifts(report, end))
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_lifecycles_follow_appends(engine, tmp_path):
+    path = tmp_path / sql_backend.DB_FILES[engine]
+    sql_backend.build_database(DATA_DIR, str(path), engine)
+    sql_store = sql_backend.SqlStore(str(path), engine)
+    data_store = DataStore(storage.load_tables(DATA_DIR))
+    rows = storage.read_table('blockers', DATA_DIR).iloc[:4].copy()
+    opened = data_store.date_range('blockers')[1]
+    rows['first_mentioned'] = opened
+    # Closed exactly on an age bucket edge, before it opened, still open, and never opened
+    rows['resolved_date'] = [opened + pd.Timedelta(days=lifecycles.AGE_EDGES_DAYS[0]),
+                             opened - pd.Timedelta(days=3), pd.NaT, opened]
+    rows.loc[rows.index[3], 'first_mentioned'] = pd.NaT
+    for store in (sql_store, data_store):
+        store.append('blockers', rows)
+    try:
+        _assert_same_lifecycles(sql_store, data_store)
+    finally:
+        sql_store.con.close()
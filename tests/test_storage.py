@@ -0,0 +1,47 @@
+"""
+Tables are loaded with the compact schema dtypes
+Labels repeated on every row are categoricals and counts use narrow integer
+types, which must take less memory than pandas' default dtypes for the same
+CSV files
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import generate_synthetic_data
+import storage
+
+
+@pytest.fixture(scope="module")
+def data_dir(tmp_path_factory):
+    out_dir = tmp_path_factory.mktemp("data")
+    generate_synthetic_data.generate_scaled_dataset(out_dir, managers=2, reports_per_manager=4, weeks=12, fmt="csv")
+    return out_dir
+
+
+def test_load_tables_uses_schema_dtypes(data_dir):
+    tables = storage.load_tables(data_dir)
+    for name in ('meetings', 'topics', 'action_items', 'blockers'):
+        assert isinstance(tables[name]['direct_report'].dtype, pd.CategoricalDtype)
+    assert isinstance(tables['topics']['topic'].dtype, pd.CategoricalDtype)
+    assert isinstance(tables['action_items']['status'].dtype, pd.CategoricalDtype)
+    assert isinstance(tables['blockers']['status'].dtype, pd.CategoricalDtype)
+
+    assert tables['meetings']['duration_mins'].dtype == np.int16
+    assert tables['topics']['time_spent_mins'].dtype == np.int16
+    assert tables['growth_areas']['progress_level'].dtype == np.int8
+    assert tables['communication']['dr_avg_response_length'].dtype == np.int32
+    # Measurements keep float64 so values and sums match the source data
+    assert tables['meetings']['sentiment_score'].dtype == np.float64
+    for name, df in tables.items():
+        for column, kind in storage.TABLES[name].items():
+            assert storage._has_kind(df[column].dtype, kind), (name, column, df[column].dtype)
+
+
+def test_load_tables_uses_less_memory_than_default_dtypes(data_dir):
+    compact = storage.load_tables(data_dir)
+    for name, df in compact.items():
+        baseline = pd.read_csv(storage.table_path(data_dir, name, "csv"))
+        assert len(baseline) == len(df)
+        assert df.memory_usage(deep=True).sum() < baseline.memory_usage(deep=True).sum(), name
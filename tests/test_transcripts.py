@@ -0,0 +1,77 @@
+"""
+Transcripts become communication rows
+Utterances are assigned to the direct report or the manager by role or by
+name, even when a JSONL file gives its metadata after the utterances, and
+hedge words and questions are counted per side
+"""
+
+import json
+
+import pandas as pd
+
+import transcripts
+
+
+def _write(path, *lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def _jsonl(tmp_path):
+    records = [
+        {"speaker": "Sarah Chen", "text": "How did the launch go? Any blockers?"},
+        # Named after the direct report, who is only known from the last line
+        {"speaker": "Alex Rodriguez", "text": "I think it went well, maybe a few rough edges."},
+        {"speaker": "A. R.", "role": "direct_report", "text": "I’m not sure about vendor. Kind of stuck?"},
+        {"speaker": "Sarah", "role": "manager", "text": "Could you sort it out?"},
+        {"meeting_date": "2025-09-14", "direct_report": "Alex Rodriguez"},
+    ]
+    return _write(tmp_path / "weekly.jsonl", *(json.dumps(record) for record in records))
+
+
+def _txt(tmp_path):
+    return _write(tmp_path / "2025-09-15_Javier_Morales.txt",
+                  "# meeting_date: 2025-09-16",
+                  "Sarah Chen: Anything blocking you? What do you need?",
+                  "Javier Morales: Perhaps the API keys, I guess.",
+                  "and I suppose the docs could be better?",
+                  "Sarah Chen: Okay.")
+
+
+def test_jsonl_metadata_after_the_utterances(tmp_path):
+    assert transcripts.communication_row(_jsonl(tmp_path)) == {
+        "meeting_date": "2025-09-14",
+        "direct_report": "Alex Rodriguez",
+        "manager_questions": 3,
+        "dr_questions": 1,
+        # "i think", "maybe", then "i'm not sure" (one phrase, not "not sure" again) and "kind of"
+        "dr_hedge_words": 4,
+        "dr_avg_response_length": 9,
+    }
+
+
+def test_txt_header_overrides_the_file_name(tmp_path):
+    assert transcripts.communication_row(_txt(tmp_path)) == {
+        "meeting_date": "2025-09-16",
+        "direct_report": "Javier Morales",
+        "manager_questions": 2,
+        # The line without a speaker continues Javier's utterance
+        "dr_questions": 1,
+        "dr_hedge_words": 4,
+        "dr_avg_response_length": 14,
+    }
+
+
+def test_rows_are_typed_and_bad_files_reported(tmp_path):
+    paths = [_jsonl(tmp_path), _write(tmp_path / "notes.txt", "Sarah Chen: Hello?"), _txt(tmp_path)]
+    errors = {}
+    batches = list(transcripts.row_batches(transcripts.process_files(paths, workers=1), errors, chunk_rows=1))
+
+    assert [len(batch) for batch in batches] == [1, 1]
+    rows = pd.concat(batches, ignore_index=True)
+    assert list(rows.columns) == transcripts.COLUMNS
+    assert rows['meeting_date'].tolist() == [pd.Timestamp("2025-09-14"), pd.Timestamp("2025-09-16")]
+    assert rows['direct_report'].astype(str).tolist() == ["Alex Rodriguez", "Javier Morales"]
+    assert rows['dr_hedge_words'].tolist() == [4, 4]
+    assert list(errors) == [paths[1]]
+    assert "meeting_date" in errors[paths[1]]
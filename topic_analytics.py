@@ -0,0 +1,195 @@
+"""
+Rolling-window topic analytics
+Keeps the discussion time (``time_spent_mins``) and mentions of every
+topic, per direct report and for the whole team, as running totals over
+the days it was discussed. Window totals, rolling four-week time shares
+and emerging/fading topics are then differences of two running totals
+instead of regroupings of the topics table. Appended rows are merged into
+the running totals by binary search
+"""
+
+import numpy as np
+import pandas as pd
+
+from derived import DerivedIndex, concat_chunks
+
+TOPIC_COLUMNS = ['meeting_date', 'direct_report', 'topic', 'time_spent_mins']
+MEASURES = ['minutes', 'mentions']
+ROLLING_DAYS = 28          # window of the rolling time shares
+STEP_DAYS = 7              # spacing of the rolling share points
+SHIFT_THRESHOLD = 0.05     # share change (of all time) that makes a topic emerging or fading
+TEAM = None                # key of the whole team's series
+EMPTY = np.empty(0, dtype='int64')
+
+
+def daily_topics(rows):
+    """Minutes and mentions per (direct_report, day, topic) of topics ``rows``."""
+    keep = rows['topic'].notna().to_numpy()
+    frame = pd.DataFrame({
+        'direct_report': rows['direct_report'].array[keep],
+        'day': rows['meeting_date'].dt.normalize().to_numpy()[keep],
+        'topic': rows['topic'].array[keep],
+        'minutes': rows['time_spent_mins'].to_numpy(dtype='float64', na_value=0)[keep],
+        'mentions': 1,
+    })
+    return frame.groupby(['direct_report', 'day', 'topic'], observed=True)[MEASURES].sum()
+
+
+def _day_numbers(values):
+    return np.asarray(values, dtype='datetime64[D]').astype('int64')
+
+
+# (partitions, segment topics, segment of (block, topic), entry keys, sums, running sums, first day, width)
+EMPTY_CUBE = ({}, np.empty(0, dtype=object), {}, EMPTY, np.empty((0, len(MEASURES))), np.zeros((1, len(MEASURES))),
+              0, 1)
+
+
+def _merged(state, daily):
+    """Cube ``state`` with the per-day totals ``daily`` (see ``daily_topics``) added."""
+    partitions, segment_topics, segment_of, entry_keys, sums, running, first_day, width = state
+    if len(daily) == 0:
+        return state
+    report_codes, reports = pd.factorize(daily.index.get_level_values('direct_report'))
+    topic_codes, topics = pd.factorize(daily.index.get_level_values('topic'))
+    blocks = [str(name) for name in reports] + [TEAM]
+    topics = np.asarray(topics.astype(str), dtype=object)
+    days = _day_numbers(daily.index.get_level_values('day'))
+    values = daily[MEASURES].to_numpy(dtype='float64')
+
+    # The team is one more block of segments, holding every row again
+    pairs, pair_of = np.unique(np.concatenate([report_codes, np.full(len(days), len(reports))]) * len(topics)
+                               + np.concatenate([topic_codes, topic_codes]), return_inverse=True)
+    partitions, segment_of, new_topics, new_segments = dict(partitions), dict(segment_of), [], {}
+    segment_ids = np.empty(len(pairs), dtype='int64')
+    for i, pair in enumerate(pairs):
+        block, topic = blocks[pair // len(topics)], topics[pair % len(topics)]
+        if (block, topic) not in segment_of:
+            segment_of[block, topic] = len(segment_topics) + len(new_topics)
+            new_topics.append(topic)
+            new_segments.setdefault(block, []).append(segment_of[block, topic])
+        segment_ids[i] = segment_of[block, topic]
+    segment_topics = np.concatenate([segment_topics, np.asarray(new_topics, dtype=object)])
+    for block, ids in new_segments.items():
+        # Each block lists its segments in topic order
+        ids = np.concatenate([partitions.get(block, EMPTY), ids])
+        partitions[block] = ids[np.argsort(segment_topics[ids], kind='stable')]
+
+    entry_days = np.concatenate([days, days])
+    lo, hi = int(entry_days.min()), int(entry_days.max())
+    if len(entry_keys):
+        lo, hi = min(lo, first_day), max(hi, first_day + width - 1)
+    if (lo, hi - lo + 1) != (first_day, width):
+        # Entries are keyed by segment and day within the day range; re-keying keeps their order
+        entry_keys = entry_keys // width * (hi - lo + 1) + entry_keys % width + first_day - lo
+        first_day, width = lo, hi - lo + 1
+    keys, inverse = np.unique(segment_ids[pair_of] * width + entry_days - first_day, return_inverse=True)
+    added = np.column_stack([np.bincount(inverse, weights=np.concatenate([column, column]), minlength=len(keys))
+                             for column in values.T])
+    at = np.searchsorted(entry_keys, keys)
+    known = at < len(entry_keys)
+    known[known] = entry_keys[at[known]] == keys[known]
+    sums = sums.copy()
+    sums[at[known]] += added[known]
+    entry_keys = np.insert(entry_keys, at[~known], keys[~known])
+    sums = np.insert(sums, at[~known], added[~known], axis=0)
+    # Running totals before the first changed entry stay as they are
+    first = int(at.min())
+    running = np.vstack([running[:first], np.cumsum(np.vstack([running[first:first + 1], sums[first:]]), axis=0)])
+    return partitions, segment_topics, segment_of, entry_keys, sums, running, first_day, width
+
+
+class TopicCube(DerivedIndex):
+    """Running totals of ``MEASURES`` per (direct report, topic) and per topic for the team.
+
+    Every (report, topic) keeps only the days it was discussed, as one
+    segment of a flat array sorted by (segment, day); segments are numbered
+    as they first appear and each report lists its own in topic order. A
+    query looks up both ends of the window in each of the report's
+    segments. Appended days are inserted by binary search (or added to the
+    day already there), and the running totals are recomputed from the
+    first entry that changed.
+    """
+
+    def __init__(self, daily):
+        self._state = _merged(EMPTY_CUBE, daily)
+
+    @classmethod
+    def from_rows(cls, chunks):
+        """Cube over topics rows given as an iterable of frames (e.g. ``store.chunks``)."""
+        return cls(concat_chunks([daily_topics(chunk) for chunk in chunks]))
+
+    def update(self, rows):
+        """Merge newly appended topics ``rows`` into the cube."""
+        if len(rows) == 0:
+            return
+        # The merged arrays are published with one assignment, as DerivedIndex._refresh does
+        self._state = _merged(self._state, daily_topics(rows))
+
+    @staticmethod
+    def _window_sums(state, report, lows, highs):
+        """(topics, sums) of ``report``'s segments over day windows (lows, highs], shaped (points, topics, measures)."""
+        partitions, segment_topics, _, entry_keys, _, running, first_day, width = state
+        segments = partitions.get(report, EMPTY)
+        base = segments * width
+        lows = np.clip(np.asarray(lows) - first_day, -1, width - 1)[:, None]
+        highs = np.clip(np.asarray(highs) - first_day, -1, width - 1)[:, None]
+        first = np.searchsorted(entry_keys, base + lows, 'right')
+        last = np.maximum(np.searchsorted(entry_keys, base + highs, 'right'), first)
+        return segment_topics[segments], running[last] - running[first]
+
+    @staticmethod
+    def _span(state, report, start, end):
+        """Day numbers of the window ends, defaulting to the first and last day of ``report``'s rows."""
+        partitions, _, _, entry_keys, _, _, first_day, width = state
+        segments = partitions.get(report, EMPTY)
+        firsts = entry_keys[np.searchsorted(entry_keys, segments * width)] % width
+        lasts = entry_keys[np.searchsorted(entry_keys, (segments + 1) * width) - 1] % width
+        start = _day_numbers(pd.Timestamp(start).normalize().to_datetime64()) if start is not None \
+            else first_day + (int(firsts.min()) if len(firsts) else 0)
+        end = _day_numbers(pd.Timestamp(end).normalize().to_datetime64()) if end is not None \
+            else first_day + (int(lasts.max()) if len(lasts) else 0)
+        return int(start), int(end)
+
+    def totals(self, report=TEAM, start=None, end=None):
+        """Minutes and mentions per topic in [``start``, ``end``], most discussed first."""
+        state = self._state
+        start, end = self._span(state, report, start, end)
+        topics, sums = self._window_sums(state, report, [start - 1], [end])
+        totals = pd.DataFrame(sums[0], index=pd.Index(topics, name='topic'), columns=MEASURES)
+        totals = totals[totals['mentions'].to_numpy() > 0].astype({'mentions': 'int64'})
+        return totals.sort_values('minutes', ascending=False, kind='stable')
+
+    def rolling_share(self, report=TEAM, start=None, end=None, days=ROLLING_DAYS, step=STEP_DAYS):
+        """Share of discussion time per topic over the ``days`` before each point, every ``step`` days.
+
+        Points run back from ``end`` to ``start``; rows are dates, columns topics.
+        """
+        state = self._state
+        start, end = self._span(state, report, start, end)
+        points = np.arange(end, start - 1, -step)[::-1]
+        topics, sums = self._window_sums(state, report, points - days, points)
+        minutes = sums[:, :, 0]
+        total = minutes.sum(axis=1, keepdims=True)
+        shares = np.divide(minutes, total, out=np.zeros_like(minutes), where=total > 0)
+        index = pd.Index(points.astype('datetime64[D]').astype('datetime64[ns]'), name='date')
+        shares = pd.DataFrame(shares, index=index, columns=pd.Index(topics, name='topic'))
+        return shares.loc[:, (shares > 0).any(axis=0).to_numpy()]
+
+    def shifts(self, report=TEAM, end=None, days=ROLLING_DAYS, threshold=SHIFT_THRESHOLD):
+        """Each topic's share of time in the last ``days`` up to ``end`` against the ``days`` before.
+
+        ``trend`` is "emerging" or "fading" when the share moved by at least
+        ``threshold``, "steady" otherwise; the biggest movers come first.
+        """
+        state = self._state
+        _, end = self._span(state, report, None, end)
+        topics, sums = self._window_sums(state, report, [end - 2 * days, end - days], [end - days, end])
+        minutes = sums[:, :, 0]
+        total = minutes.sum(axis=1, keepdims=True)
+        prior, recent = np.divide(minutes, total, out=np.zeros_like(minutes), where=total > 0)
+        change = recent - prior
+        shifts = pd.DataFrame({'prior_share': prior, 'recent_share': recent, 'change': change,
+                               'recent_minutes': minutes[1]}, index=pd.Index(topics, name='topic'))
+        shifts['trend'] = np.where(change >= threshold, 'emerging', np.where(change <= -threshold, 'fading', 'steady'))
+        shifts = shifts[(minutes.sum(axis=0) > 0)]
+        return shifts.iloc[np.argsort(-np.abs(shifts['change'].to_numpy()), kind='stable')]
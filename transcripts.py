@@ -0,0 +1,247 @@
+"""
+Streaming transcript-to-table pipeline
+Reads raw 1:1 transcripts (plain text or JSONL, one utterance per line)
+lazily, derives the communication fields of each meeting in a single pass
+with precompiled matchers, and writes them as ``communication`` rows in
+chunks, so thousands of transcripts are processed in bounded memory by a
+pool of worker processes
+
+Plain-text transcripts look like::
+
+    # meeting_date: 2025-09-14
+    # direct_report: Alex Rodriguez
+    Sarah Chen: How did the launch go?
+    Alex Rodriguez: I think it went well, maybe a few rough edges.
+
+JSONL transcripts have one ``{"speaker": ..., "text": ...}`` object per
+line (optionally with ``"role": "manager"`` or ``"direct_report"``) and put
+the metadata keys on any line, usually the first. Without metadata, the
+file name is used: ``2025-09-14_Alex_Rodriguez.txt``.
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import storage
+from ingest import INCOMING_DIR
+
+EXTENSIONS = (".txt", ".jsonl")
+CHUNK_ROWS = 10_000       # rows buffered before they are written out
+TASKS_PER_WORKER = 8      # transcripts queued per worker; bounds memory of pending results
+COLUMNS = list(storage.TABLES["communication"])
+DR_ROLES = {"dr", "direct report", "direct_report"}
+
+HEDGE_WORDS = (
+    "i think", "i guess", "i suppose", "i feel like", "i believe", "i'm not sure", "not sure",
+    "maybe", "perhaps", "probably", "possibly", "might", "could be", "sort of", "kind of",
+    "somewhat", "hopefully", "it seems", "i assume", "more or less",
+)
+# One alternation, longest phrases first, so "i'm not sure" is a single match rather than two
+HEDGE_PATTERN = re.compile(
+    r"\b(?:" + "|".join(re.escape(word) for word in sorted(HEDGE_WORDS, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE)
+QUESTION_PATTERN = re.compile(r"\?+")
+SPEAKER_PATTERN = re.compile(r"^([^:#][^:]{0,79}):\s*(.*)$")
+HEADER_PATTERN = re.compile(r"^#\s*(\w+)\s*:\s*(.*?)\s*$")
+NAME_PATTERN = re.compile(r"^(\d{4}-\d{2}-\d{2})[_ -](.+)$")
+
+
+def transcript_paths(directory):
+    """Transcript files under ``directory``, walked lazily in sorted order."""
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(EXTENSIONS) and not name.startswith("."):
+                yield os.path.join(root, name)
+
+
+def name_metadata(path):
+    """Meeting date and direct report from a ``<date>_<First>_<Last>`` file name (empty if absent)."""
+    match = NAME_PATTERN.match(os.path.splitext(os.path.basename(path))[0])
+    if match is None:
+        return {}
+    return {"meeting_date": match.group(1), "direct_report": match.group(2).replace("_", " ")}
+
+
+def read_transcript(path):
+    """Yield ``("meta", key, value)`` and ``("utterance", speaker, role, text)`` events lazily."""
+    jsonl = path.endswith(".jsonl")
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if jsonl:
+                record = json.loads(line)
+                for key in ("meeting_date", "direct_report"):
+                    if key in record:
+                        yield "meta", key, record[key]
+                if "text" in record:
+                    yield "utterance", record.get("speaker", ""), record.get("role"), record["text"]
+                continue
+            header = HEADER_PATTERN.match(line)
+            if header:
+                yield "meta", header.group(1).lower(), header.group(2)
+                continue
+            speaker = SPEAKER_PATTERN.match(line)
+            if speaker:
+                yield "utterance", speaker.group(1).strip(), None, speaker.group(2)
+            else:
+                # No "Speaker:" prefix: the previous speaker keeps talking
+                yield "utterance", None, None, line
+
+
+def communication_row(path):
+    """The communication fields of one transcript, computed in a single pass over it.
+
+    Counts are kept per speaker and only split into direct report and
+    manager at the end, since JSONL metadata may come after the utterances.
+    """
+    meta = name_metadata(path)
+    # Speaker (or role) -> [questions, hedge words, words, utterances]
+    counts = {}
+    speaker_counts = counts.setdefault(None, [0, 0, 0, 0])
+    for event in read_transcript(path):
+        if event[0] == "meta":
+            meta[event[1]] = event[2]
+            continue
+        _, speaker, role, text = event
+        if speaker is not None or role is not None:
+            speaker_counts = counts.setdefault((role or speaker).strip().lower(), [0, 0, 0, 0])
+            speaker_counts[3] += 1
+        text = text.replace("’", "'")
+        speaker_counts[0] += len(QUESTION_PATTERN.findall(text))
+        speaker_counts[1] += len(HEDGE_PATTERN.findall(text))
+        speaker_counts[2] += len(text.split())
+
+    missing = [key for key in ("meeting_date", "direct_report") if not meta.get(key)]
+    if missing:
+        raise ValueError(f"no {' or '.join(missing)} in the header or file name")
+    direct_report = str(meta["direct_report"]).strip().lower()
+    manager_questions = dr_questions = dr_hedge_words = dr_words = dr_utterances = 0
+    for speaker, (questions, hedge_words, words, utterances) in counts.items():
+        if speaker in DR_ROLES or speaker == direct_report:
+            dr_questions += questions
+            dr_hedge_words += hedge_words
+            dr_words += words
+            dr_utterances += utterances
+        else:
+            manager_questions += questions
+    return {
+        "meeting_date": meta["meeting_date"],
+        "direct_report": meta["direct_report"],
+        "manager_questions": manager_questions,
+        "dr_questions": dr_questions,
+        "dr_hedge_words": dr_hedge_words,
+        "dr_avg_response_length": round(dr_words / dr_utterances) if dr_utterances else 0,
+    }
+
+
+def process_file(path):
+    """``(path, row, error)`` for one transcript; bad files are reported, not raised."""
+    try:
+        return path, communication_row(path), None
+    except (ValueError, OSError) as exc:
+        return path, None, str(exc)
+
+
+def _bounded_map(pool, fn, items, window):
+    """``pool.map`` that keeps at most ``window`` tasks in flight, yielding results in order."""
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def process_files(paths, workers=None):
+    """``(path, row, error)`` per transcript, in input order; ``workers=1`` stays in-process."""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        yield from map(process_file, paths)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from _bounded_map(pool, process_file, paths, workers * TASKS_PER_WORKER)
+
+
+def row_batches(results, errors, chunk_rows=CHUNK_ROWS):
+    """Typed ``communication`` frames of up to ``chunk_rows`` rows; failures go to ``errors``."""
+    batch = []
+    for path, row, error in results:
+        if error is not None:
+            errors[path] = error
+            continue
+        batch.append(row)
+        if len(batch) >= chunk_rows:
+            yield storage.coerce(pd.DataFrame(batch, columns=COLUMNS), "communication")
+            batch = []
+    if batch:
+        yield storage.coerce(pd.DataFrame(batch, columns=COLUMNS), "communication")
+
+
+def write_csv(batches, path):
+    """Write the batches to ``path`` through a temporary file; returns the row count."""
+    directory, name = os.path.split(path)
+    tmp = os.path.join(directory, f".{name}.tmp")
+    rows = 0
+    pd.DataFrame(columns=COLUMNS).to_csv(tmp, index=False)
+    for df in batches:
+        df.to_csv(tmp, mode="a", header=False, index=False)
+        rows += len(df)
+    os.replace(tmp, path)
+    return rows
+
+
+def write_table(batches, out_dir, fmt="csv"):
+    """Replace the ``communication`` table in ``out_dir``; returns (path, rows)."""
+    os.makedirs(out_dir, exist_ok=True)
+    if fmt == "parquet":
+        writer = storage.ParquetChunkWriter(out_dir)
+        for df in batches:
+            writer.write("communication", df)
+        return storage.table_path(out_dir, "communication"), writer.close().get("communication", 0)
+    path = storage.table_path(out_dir, "communication", "csv")
+    return path, write_csv(batches, path)
+
+
+def write_incoming(batches, data_dir):
+    """Drop the rows into ``<data_dir>/incoming/`` for a running dashboard; returns (path, rows)."""
+    directory = os.path.join(data_dir, INCOMING_DIR)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"communication_{time.strftime('%Y%m%d-%H%M%S')}.csv")
+    return path, write_csv(batches, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Derive communication rows from 1:1 transcripts")
+    parser.add_argument("transcript_dir")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--out-dir", default=".", help="write data_communication.<format> here")
+    target.add_argument("--incoming", metavar="DATA_DIR", default=None,
+                        help="hand the rows to a running dashboard reading DATA_DIR instead")
+    parser.add_argument("--format", choices=("csv", "parquet"), default="csv")
+    parser.add_argument("--workers", type=int, default=None, help="defaults to the number of CPUs")
+    args = parser.parse_args(argv)
+
+    errors = {}
+    batches = row_batches(process_files(transcript_paths(args.transcript_dir), args.workers), errors)
+    if args.incoming:
+        path, rows = write_incoming(batches, args.incoming)
+    else:
+        path, rows = write_table(batches, args.out_dir, args.format)
+    print(f"[SUCCESS] Wrote {rows} communication rows to {path}")
+    for filename, error in errors.items():
+        print(f"  - skipped {filename}: {error}")
+
+
+if __name__ == "__main__":
+    main()